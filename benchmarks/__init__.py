@@ -0,0 +1,4 @@
+"""
+Benchmarks for the Sysco scraper
+A local stand-in for shop.sysco.com and a runner that measures the scraper against it
+"""
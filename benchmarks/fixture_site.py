@@ -0,0 +1,335 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for shop.sysco.com
+Serves the pages and selectors the scraper relies on (guest login, ZIP modal,
+Products hover menu, paginated listings with lazy-loaded cards, product pages
+with "Read More") from a deterministic generated catalog, with configurable latency
+"""
+
+import argparse
+import html
+import random
+import re
+import threading
+import time
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+from urllib.parse import parse_qs, urlsplit
+
+
+CATEGORIES = ["Meat & Seafood", "Dairy & Eggs", "Canned & Dry"]
+
+BRANDS = ["Sysco Classic", "Sysco Imperial", "Block & Barrel", "Wholesome Farms", "Arrezzio", "Casa Solana"]
+ITEMS = {
+    "Meat & Seafood": ["Beef Ribeye Steak", "Chicken Breast Boneless", "Atlantic Salmon Fillet", "Pork Loin Roast",
+                       "Shrimp 16/20 Peeled", "Ground Beef 80/20"],
+    "Dairy & Eggs": ["Cheddar Cheese Shredded", "Whole Milk", "Large Eggs Grade AA", "Butter Unsalted",
+                     "Heavy Cream 40%", "Mozzarella Cheese Block"],
+    "Canned & Dry": ["Diced Tomatoes", "Black Beans", "Long Grain Rice", "Spaghetti Pasta", "Chicken Broth",
+                     "All Purpose Flour"],
+}
+PACKS = ["6/5 LB", "4/1 GAL", "12/32 OZ", "2/5#", "6/#10 CAN", "15 DZ", "1/50 LB", "24/12 FL OZ"]
+
+# Image bytes served for product images (so unblocked runs pay a realistic transfer)
+IMAGE_BYTES = 30_000
+
+PAGE_STYLE = """
+body { font-family: sans-serif; margin: 0; }
+.sidebar { padding: 8px; border-bottom: 1px solid #ccc; }
+.nav-link { display: inline-block; position: relative; padding: 6px 12px; cursor: pointer; }
+.products-menu { display: none; position: absolute; top: 100%; left: 0; background: #fff; border: 1px solid #ccc; z-index: 10; }
+.nav-link.open .products-menu { display: block; }
+.products-menu-item { padding: 6px 12px; white-space: nowrap; }
+.modal { position: fixed; inset: 0; background: rgba(0,0,0,.4); display: flex; align-items: center; justify-content: center; }
+.modal-body { background: #fff; padding: 24px; }
+#grid { min-height: 150vh; }  /* Always scrollable, so lazy cards load on every page */
+.product-card { height: 220px; margin: 8px; border: 1px solid #eee; }
+"""
+
+
+def slugify(text: str) -> str:
+    return re.sub(r'[^a-z0-9]+', '-', text.lower()).strip('-')
+
+
+@dataclass
+class FixtureProduct:
+    sku: str
+    category: str
+    brand: str
+    product_name: str
+    packaging: str
+    price: str
+    description: str
+
+    @property
+    def path(self) -> str:
+        return f"/app/catalog/product/{self.sku}"
+
+
+def build_catalog(products_per_category: int = 36, seed: int = 7) -> Dict[str, List[FixtureProduct]]:
+    """Deterministic catalog: category -> products"""
+    rng = random.Random(seed)
+    catalog: Dict[str, List[FixtureProduct]] = {}
+    sku = 1000000
+    for category in CATEGORIES:
+        products = []
+        for index in range(products_per_category):
+            sku += 1
+            item = ITEMS[category][index % len(ITEMS[category])]
+            brand = BRANDS[rng.randrange(len(BRANDS))]
+            sentences = rng.randint(1, 6)
+            description = " ".join(
+                f"{item} from {brand} is packed for foodservice kitchens and holds up to high-volume prep ({n + 1})."
+                for n in range(sentences)
+            )
+            products.append(FixtureProduct(
+                sku=str(sku),
+                category=category,
+                brand=brand,
+                product_name=f"{item} {index // len(ITEMS[category]) + 1}",
+                packaging=PACKS[rng.randrange(len(PACKS))],
+                price=f"${rng.randint(800, 25000) / 100:,.2f}",
+                description=description,
+            ))
+        catalog[category] = products
+    return catalog
+
+
+class FixtureSite:
+    """
+    Threaded HTTP server for the stand-in site
+
+    Every response is delayed by latency_ms +/- jitter_ms; listing cards beyond the
+    first half of a page only appear after the page is scrolled (plus lazy_ms).
+    """
+
+    def __init__(self, host: str = '127.0.0.1', port: int = 0, latency_ms: float = 50.0,
+                 jitter_ms: float = 20.0, lazy_ms: float = 300.0, products_per_category: int = 36,
+                 page_size: int = 12, seed: int = 7):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.lazy_ms = lazy_ms
+        self.page_size = page_size
+        self.catalog = build_catalog(products_per_category, seed)
+        self.products = {product.sku: product for products in self.catalog.values() for product in products}
+        self.requests = 0
+        self._lock = threading.Lock()
+
+        site = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                site._handle(self)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer((host, port), Handler)
+        self.server.daemon_threads = True
+        self.thread = threading.Thread(target=self.server.serve_forever, name="fixture-site", daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> 'FixtureSite':
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    # --- Request handling -------------------------------------------------
+
+    def _handle(self, request: BaseHTTPRequestHandler):
+        with self._lock:
+            self.requests += 1
+        delay = self.latency_ms + random.uniform(-self.jitter_ms, self.jitter_ms)
+        if delay > 0:
+            time.sleep(delay / 1000)
+
+        parts = urlsplit(request.path)
+        query = {key: values[0] for key, values in parse_qs(parts.query).items()}
+        cookies = request.headers.get('Cookie', '')
+        path = parts.path.rstrip('/') or '/'
+
+        if path == '/':
+            if 'guest=1' in cookies:
+                return self._redirect(request, '/app/dashboard')
+            return self._send(request, self._login_page())
+        if path == '/app/dashboard':
+            return self._send(request, self._dashboard_page(show_zip_modal='zip=' not in cookies))
+        if path == '/app/catalog':
+            category = self._category_for_slug(query.get('category', ''))
+            if category is None:
+                return request.send_error(404)
+            return self._send(request, self._listing_page(category, int(query.get('page', '1') or 1)))
+        if path.startswith('/app/catalog/product/'):
+            product = self.products.get(path.rsplit('/', 1)[-1])
+            if product is None:
+                return request.send_error(404)
+            return self._send(request, self._product_page(product))
+        if path.startswith('/static/img/'):
+            return self._send(request, b'\xff\xd8\xff' + b'\0' * IMAGE_BYTES, 'image/jpeg')
+        request.send_error(404)
+
+    @staticmethod
+    def _send(request: BaseHTTPRequestHandler, body, content_type: str = 'text/html; charset=utf-8'):
+        if isinstance(body, str):
+            body = body.encode('utf-8')
+        request.send_response(200)
+        request.send_header('Content-Type', content_type)
+        request.send_header('Content-Length', str(len(body)))
+        request.end_headers()
+        request.wfile.write(body)
+
+    @staticmethod
+    def _redirect(request: BaseHTTPRequestHandler, location: str):
+        request.send_response(302)
+        request.send_header('Location', location)
+        request.send_header('Content-Length', '0')
+        request.end_headers()
+
+    def _category_for_slug(self, slug: str) -> Optional[str]:
+        for category in self.catalog:
+            if slugify(category) == slug:
+                return category
+        return None
+
+    # --- Pages ----------------------------------------------------------------
+
+    @staticmethod
+    def _page(title: str, body: str, script: str = '') -> str:
+        return (f"<!DOCTYPE html><html><head><meta charset='utf-8'><title>{html.escape(title)}</title>"
+                f"<style>{PAGE_STYLE}</style></head><body>{body}<script>{script}</script></body></html>")
+
+    def _nav(self) -> str:
+        items = ''.join(
+            f'<div class="products-menu-item" data-href="/app/catalog?category={slugify(category)}">'
+            f'{html.escape(category)}</div>'
+            for category in self.catalog
+        )
+        return (f'<div class="sidebar"><div class="nav-link active" id="products-nav">Products'
+                f'<span class="expand-indicator">&#9662;</span><div class="products-menu">{items}</div></div></div>')
+
+    NAV_SCRIPT = """
+    const nav = document.getElementById('products-nav');
+    nav.addEventListener('mouseenter', () => nav.classList.add('open'));
+    document.querySelectorAll('.products-menu-item').forEach(item =>
+        item.addEventListener('click', () => { window.location.href = item.dataset.href; }));
+    """
+
+    def _login_page(self) -> str:
+        body = ('<div class="login"><h2>Sign in</h2>'
+                '<button class="btn-secondary" data-id="btn_login_continue_as_guest">Continue as Guest</button></div>')
+        script = """
+        document.querySelector('[data-id="btn_login_continue_as_guest"]').addEventListener('click', () => {
+            document.cookie = 'guest=1; path=/';
+            window.location.href = '/app/dashboard';
+        });
+        """
+        return self._page("Sysco Shop - Login", body, script)
+
+    def _dashboard_page(self, show_zip_modal: bool) -> str:
+        modal = ''
+        if show_zip_modal:
+            modal = ('<div class="modal" id="zip-modal"><div class="modal-body">'
+                     '<p>Enter your ZIP code</p>'
+                     '<div class="initial-zipcode-modal-input input-lg">'
+                     '<input type="text" data-id="initial_zipcode_modal_input" maxlength="5"></div>'
+                     '<button class="btn-primary initial-zipcode-modal-button" type="primary" disabled '
+                     'data-id="initial_zipcode_modal_start_shopping_button">Start Shopping</button>'
+                     '</div></div>')
+        script = self.NAV_SCRIPT + """
+        const zip = document.querySelector('[data-id="initial_zipcode_modal_input"]');
+        if (zip) {
+            const start = document.querySelector('[data-id="initial_zipcode_modal_start_shopping_button"]');
+            zip.addEventListener('input', () => { start.disabled = !/^\\d{5}$/.test(zip.value); });
+            start.addEventListener('click', () => {
+                document.cookie = 'zip=' + zip.value + '; path=/';
+                document.getElementById('zip-modal').remove();
+            });
+        }
+        """
+        return self._page("Sysco Shop", self._nav() + '<h1>Welcome</h1>' + modal, script)
+
+    def _listing_page(self, category: str, page: int) -> str:
+        products = self.catalog[category]
+        start = (page - 1) * self.page_size
+        cards = [
+            f'<div class="product-card"><a class="product-card-link" href="{product.path}">'
+            f'{html.escape(product.product_name)}</a></div>'
+            for product in products[start:start + self.page_size]
+        ]
+        eager, lazy = cards[:len(cards) // 2 or len(cards)], cards[len(cards) // 2 or len(cards):]
+        next_link = ''
+        if start + self.page_size < len(products):
+            next_link = (f'<div class="pagination"><a class="next" aria-label="Next" '
+                         f'href="/app/catalog?category={slugify(category)}&page={page + 1}">Next</a></div>')
+        body = (self._nav() + f'<h1>{html.escape(category)}</h1><div id="grid">{"".join(eager)}</div>'
+                f'<template id="lazy">{"".join(lazy)}</template>{next_link}')
+        script = self.NAV_SCRIPT + f"""
+        let loaded = false;
+        window.addEventListener('scroll', () => {{
+            if (loaded) return;
+            loaded = true;
+            setTimeout(() => {{
+                document.getElementById('grid').append(document.getElementById('lazy').content.cloneNode(true));
+            }}, {int(self.lazy_ms)});
+        }});
+        """
+        return self._page(f"{category} - Sysco Shop", body, script)
+
+    def _product_page(self, product: FixtureProduct) -> str:
+        # Long descriptions are collapsed behind "Read More" like on the real site
+        collapsed = len(product.description) > 160
+        description = html.escape(product.description[:160] + ('...' if collapsed else ''))
+        read_more = ''
+        if collapsed:
+            read_more = ('<button data-id="ellipsis-read-more-button">Read More</button>'
+                         f'<div class="description-detail-wrapper" hidden>{html.escape(product.description)}</div>')
+        body = (self._nav() +
+                '<div class="row product-image"><div class="product-card-image-v2">'
+                f'<img src="/static/img/{product.sku}.jpg" alt="product image"></div></div>'
+                f'<div class="brand">{html.escape(product.brand)}</div>'
+                f'<div class="product-name">{html.escape(product.product_name)}</div>'
+                f'<div data-id="pack_size">{html.escape(product.packaging)}</div>'
+                f'<div class="selectable-supc-label">SUPC <span>{product.sku}</span></div>'
+                f'<div class="price-current">{html.escape(product.price)}</div>'
+                f'<div data-id="product_description_text">{description}</div>{read_more}')
+        script = self.NAV_SCRIPT + """
+        const more = document.querySelector('[data-id="ellipsis-read-more-button"]');
+        if (more) more.addEventListener('click', () => {
+            document.querySelector('.description-detail-wrapper').hidden = false;
+            document.querySelector('[data-id="product_description_text"]').remove();
+            more.remove();
+        });
+        """
+        return self._page(f"{product.product_name} - Sysco Shop", body, script)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve the local Sysco stand-in site")
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--latency-ms', type=float, default=50.0, help="Delay added to every response")
+    parser.add_argument('--jitter-ms', type=float, default=20.0, help="Random +/- variation of the delay")
+    parser.add_argument('--products-per-category', type=int, default=36)
+    parser.add_argument('--page-size', type=int, default=12, help="Product cards per listing page")
+    parser.add_argument('--lazy-ms', type=float, default=300.0, help="Delay before lazy cards appear after scrolling")
+    args = parser.parse_args()
+
+    site = FixtureSite(port=args.port, latency_ms=args.latency_ms, jitter_ms=args.jitter_ms, lazy_ms=args.lazy_ms,
+                       products_per_category=args.products_per_category, page_size=args.page_size).start()
+    print(f"🧪 Fixture site at {site.url} ({len(site.products)} products); "
+          f"run the scraper with BASE_URL={site.url}", flush=True)
+    try:
+        site.thread.join()
+    except KeyboardInterrupt:
+        site.stop()
+
+
+if __name__ == "__main__":
+    main()
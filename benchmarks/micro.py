@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+"""
+Offline micro-benchmarks for the scraper's CPU-bound stages
+Synthetic records through the pure-Python hot paths (formatting, cleaning, records,
+CSV export, URL handling) at several sizes, reporting time and allocations
+
+    python -m benchmarks.micro                                # 1k, 100k and 1M records
+    python -m benchmarks.micro --sizes 1000,100000 --save before.json
+    python -m benchmarks.micro --sizes 1000,100000 --compare before.json
+"""
+
+import argparse
+import gc
+import json
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Optional
+
+from scraper.csv_exporter import CSVExporter
+from scraper.data_formatter import DataFormatter
+from scraper.models import ProductData, ScrapingConfig
+from scraper.urls import canonicalize_url, filter_product_links
+
+DEFAULT_SIZES = [1_000, 100_000, 1_000_000]
+
+# Distinct synthetic inputs; larger runs cycle through them (record contents, not counts, repeat)
+POOL_SIZE = 10_000
+
+WORDS = ("fresh frozen premium boneless skinless grade whole sliced diced natural organic beef chicken pork "
+         "salmon cheddar mozzarella tomato rice flour broth kitchen prep bulk case pack serving").split()
+
+
+def make_descriptions(rng: random.Random) -> List[str]:
+    descriptions = []
+    for index in range(POOL_SIZE):
+        sentences = [" ".join(rng.choices(WORDS, k=rng.randint(6, 14))).capitalize() for _ in range(rng.randint(2, 8))]
+        text = ".  ".join(sentences) + f". Ingredients: {', '.join(rng.choices(WORDS, k=6))}. Item {index}."
+        if index % 3 == 0:
+            text = "• " + text.replace(".  ", "\n• ")
+        descriptions.append(text)
+    return descriptions
+
+
+def make_products(rng: random.Random) -> List[ProductData]:
+    products = []
+    for index in range(POOL_SIZE):
+        products.append(ProductData(
+            url=f"https://shop.sysco.com/app/catalog/product/{1000000 + index}",
+            brand=rng.choice(["Sysco Classic", "Sysco Imperial", "Block & Barrel", "Wholesome Farms"]),
+            product_name=" ".join(rng.choices(WORDS, k=4)).title(),
+            packaging=rng.choice(["6/5 LB", "4/1 GAL", "12/32 OZ", "2/5#", "6/#10 CAN"]),
+            sku=str(1000000 + index),
+            image_url=f"https://img.sysco.com/{index}.jpg",
+            description=" ".join(rng.choices(WORDS, k=40)),
+            price=f"${rng.randint(800, 25000) / 100:,.2f}",
+            category=rng.choice(["Meat & Seafood", "Dairy & Eggs", "Canned & Dry"]),
+        ))
+    return products
+
+
+def make_hrefs(rng: random.Random) -> List[str]:
+    hrefs = []
+    for index in range(POOL_SIZE):
+        kind = index % 5
+        if kind == 0:
+            hrefs.append(f"/app/catalog/product/{1000000 + index}")
+        elif kind == 1:
+            hrefs.append(f"https://SHOP.sysco.com/app/product/{1000000 + index}#reviews")
+        elif kind == 2:
+            hrefs.append(f"/app/catalog/product/{1000000 + index % 50}?tab=details")
+        elif kind == 3:
+            hrefs.append(f"/help/{rng.choice(WORDS)}")
+        else:
+            hrefs.append("javascript:void(0)")
+    return hrefs
+
+
+def build_benchmarks(rng: random.Random, workdir: str) -> Dict[str, Callable[[int], object]]:
+    """Name -> function(n) running the stage over n records"""
+    descriptions = make_descriptions(rng)
+    products = make_products(rng)
+    hrefs = make_hrefs(rng)
+    raw_fields = [f"  {product.product_name}\t\n ({product.packaging}) ™ " for product in products]
+    raw_prices = [f"\n  {product.price} / CS  " for product in products]
+    base = "https://shop.sysco.com/app/catalog?category=meat-seafood&page=2"
+    exporter = CSVExporter(ScrapingConfig(output_dir=workdir, output_file="micro.csv"))
+
+    def cycle(pool: list, n: int):
+        size = len(pool)
+        return (pool[index % size] for index in range(n))
+
+    def format_uncached(n):
+        formatter = DataFormatter(cache_size=0)
+        for text in cycle(descriptions, n):
+            formatter.format_description(text)
+
+    def format_cached(n):
+        # Catalog descriptions repeat heavily; 1k distinct texts fit the default cache
+        formatter = DataFormatter()
+        for text in cycle(descriptions[:1000], n):
+            formatter.format_description(text)
+
+    def clean_text_field(n):
+        clean = DataFormatter(cache_size=0).clean_text_field
+        for text in cycle(raw_fields, n):
+            clean(text)
+
+    def clean_price(n):
+        clean = DataFormatter(cache_size=0).clean_price
+        for text in cycle(raw_prices, n):
+            clean(text)
+
+    def to_dict(n):
+        for product in cycle(products, n):
+            product.to_dict()
+
+    def is_valid(n):
+        for product in cycle(products, n):
+            product.is_valid()
+
+    def export_products(n):
+        exporter.export_products(cycle(products, n))
+
+    def canonicalize(n):
+        for href in cycle(hrefs, n):
+            canonicalize_url(href, base)
+
+    def filter_links(n):
+        # One listing page at a time, like the category extractor
+        page = 48
+        for start in range(0, n, page):
+            filter_product_links(hrefs[start % POOL_SIZE:start % POOL_SIZE + min(page, n - start)], base)
+
+    return {
+        'format_description': format_uncached,
+        'format_description_cached': format_cached,
+        'clean_text_field': clean_text_field,
+        'clean_price': clean_price,
+        'to_dict': to_dict,
+        'is_valid': is_valid,
+        'export_products': export_products,
+        'canonicalize_url': canonicalize,
+        'filter_product_links': filter_links,
+    }
+
+
+def measure(function: Callable[[int], object], n: int, allocations: bool) -> dict:
+    """Wall time of one run, then (optionally) a traced run for allocated/peak bytes"""
+    gc.collect()
+    started = time.perf_counter()
+    function(n)
+    seconds = time.perf_counter() - started
+    result = {'seconds': round(seconds, 4), 'us_per_record': round(seconds / n * 1e6, 3)}
+
+    if allocations:
+        gc.collect()
+        tracemalloc.start()
+        function(n)
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        result['peak_kb'] = round(peak / 1024, 1)
+        result['retained_kb'] = round(current / 1024, 1)
+    return result
+
+
+def print_results(results: Dict[str, dict], previous: Optional[Dict[str, dict]] = None):
+    header = f"{'benchmark':<28}{'records':>10}{'seconds':>10}{'us/rec':>10}{'peak KB':>12}"
+    if previous:
+        header += f"{'before us/rec':>15}{'change':>9}"
+    print(header)
+    for key, result in results.items():
+        name, size = key.rsplit('@', 1)
+        line = (f"{name:<28}{int(size):>10,}{result['seconds']:>10.3f}{result['us_per_record']:>10.2f}"
+                f"{result.get('peak_kb', float('nan')):>12.1f}")
+        before = (previous or {}).get(key)
+        if before:
+            change = result['us_per_record'] / before['us_per_record'] - 1 if before['us_per_record'] else 0.0
+            line += f"{before['us_per_record']:>15.2f}{change:>+9.0%}"
+        print(line)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Micro-benchmarks for the scraper's CPU-bound stages")
+    parser.add_argument('--sizes', default=','.join(str(size) for size in DEFAULT_SIZES),
+                        help="Comma-separated record counts (default 1000,100000,1000000)")
+    parser.add_argument('--only', help="Comma-separated benchmark names to run")
+    parser.add_argument('--no-alloc', action='store_true', help="Skip the tracemalloc pass (halves the run time)")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--save', help="Write results as JSON (e.g. before.json)")
+    parser.add_argument('--compare', help="Earlier --save output to show before/after numbers against")
+    args = parser.parse_args(argv)
+
+    sizes = [int(size) for size in args.sizes.split(',') if size.strip()]
+    with tempfile.TemporaryDirectory(prefix="micro-") as workdir:
+        benchmarks = build_benchmarks(random.Random(args.seed), workdir)
+        names = [name.strip() for name in args.only.split(',')] if args.only else list(benchmarks)
+        unknown = [name for name in names if name not in benchmarks]
+        if unknown:
+            print(f"❌ Unknown benchmark(s): {', '.join(unknown)}; available: {', '.join(benchmarks)}")
+            return 2
+
+        results: Dict[str, dict] = {}
+        for name in names:
+            for size in sizes:
+                results[f"{name}@{size}"] = measure(benchmarks[name], size, not args.no_alloc)
+                print(f"  {name} @ {size:,}: {results[f'{name}@{size}']['seconds']:.3f}s", file=sys.stderr)
+
+    previous = None
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            previous = json.load(f).get('results', {})
+    print()
+    print_results(results, previous)
+
+    if args.save:
+        with open(args.save, 'w', encoding='utf-8') as f:
+            json.dump({'python': sys.version.split()[0], 'sizes': sizes, 'results': results}, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,330 @@
+#!/usr/bin/env python3
+"""
+End-to-end benchmark runner for the Sysco scraper
+Drives SyscoScraperOrchestrator against the local fixture site in each run mode and
+compares products/sec, p50/p95 product latency and peak RSS against a stored baseline
+
+    python -m benchmarks.run                      # all modes, compare with baseline.json
+    python -m benchmarks.run --modes sequential   # one mode
+    python -m benchmarks.run --update-baseline    # record the current numbers as the baseline
+"""
+
+import argparse
+import asyncio
+import csv
+import json
+import logging
+import math
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from typing import Dict, List, Optional
+
+from benchmarks.fixture_site import CATEGORIES, FixtureSite
+
+MODES = ['sequential', 'async', 'queue']
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+
+# Metric -> True if higher is better
+METRICS = {
+    'products_per_sec': True,
+    'p50_seconds': False,
+    'p95_seconds': False,
+    'peak_rss_mb': False,
+    'field_accuracy': True,
+    'rpc_calls_per_product': False,
+}
+
+# Fields compared against the fixture catalog (descriptions are reformatted by the scraper)
+CHECKED_FIELDS = ['brand', 'product_name', 'packaging', 'sku', 'price']
+
+
+def percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    position = (len(ordered) - 1) * pct / 100
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+class _ProductTimings(logging.Handler):
+    """Collects the per-product success records the orchestrator logs (extra: url, seconds)"""
+
+    def __init__(self):
+        super().__init__(logging.INFO)
+        self.records: List[logging.LogRecord] = []
+
+    def emit(self, record: logging.LogRecord):
+        if hasattr(record, 'seconds') and hasattr(record, 'url'):
+            self.records.append(record)
+
+
+class _PeakRSS:
+    """Samples RSS of this process plus the browser processes in the background"""
+
+    def __init__(self, interval: float = 0.5):
+        from scraper.resource_usage import process_rss_bytes, browser_rss_bytes
+        self._sample = lambda: process_rss_bytes() + browser_rss_bytes()
+        self.interval = interval
+        self.peak = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="rss-sampler", daemon=True)
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.peak = max(self.peak, self._sample())
+            self._stop.wait(self.interval)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+
+
+def run_mode(mode: str, base_url: str, products: int, workdir: str) -> dict:
+    """
+    Run one mode in this process and return its measurements
+
+    The fixture catalog holds exactly `products` products, so every mode scrapes all of
+    them (the queue worker only exports once the queue is drained).
+    """
+    from scraper.main import SyscoScraperOrchestrator
+    from scraper.models import ScrapingConfig
+
+    config = ScrapingConfig(
+        headless=True,
+        base_url=base_url,
+        max_products=products,
+        output_dir=workdir,
+        throttle_seconds=0.0,
+        metrics_file=None,
+        rpc_accounting=True,
+    )
+    if mode == 'async':
+        config.enable_async_scraping = True
+        config.async_batch_size = products
+    elif mode == 'queue':
+        config.work_queue_path = os.path.join(workdir, 'work_queue.db')
+        config.worker_id = 'bench'
+        config.max_products = None  # Drain the queue
+
+    timings = _ProductTimings()
+    scraper_logger = logging.getLogger('scraper')
+    scraper_logger.setLevel(logging.INFO)
+    scraper_logger.addHandler(timings)
+    errors = logging.StreamHandler(sys.stderr)  # Warnings/errors reach the parent if the mode fails
+    errors.setLevel(logging.WARNING)
+    scraper_logger.addHandler(errors)
+
+    orchestrator = SyscoScraperOrchestrator(config)
+    started = time.monotonic()
+    with _PeakRSS() as rss:
+        if mode == 'queue':
+            success = asyncio.run(orchestrator.run_queue_worker())
+        else:
+            success = asyncio.run(orchestrator.run_scraper())
+    wall_seconds = time.monotonic() - started
+
+    rpc = orchestrator.rpc.summary()
+    latencies = [record.seconds for record in timings.records]
+    # Throughput over the product phase: first product start to last product finish
+    if timings.records:
+        first = min(record.created - record.seconds for record in timings.records)
+        last = max(record.created for record in timings.records)
+        products_per_sec = len(timings.records) / max(last - first, 1e-9)
+    else:
+        products_per_sec = 0.0
+
+    return {
+        'mode': mode,
+        'success': bool(success),
+        'products': orchestrator.get_scraped_count(),
+        'wall_seconds': round(wall_seconds, 2),
+        'products_per_sec': round(products_per_sec, 4),
+        'p50_seconds': round(percentile(latencies, 50), 3),
+        'p95_seconds': round(percentile(latencies, 95), 3),
+        'peak_rss_mb': round(rss.peak / 1024 / 1024, 1),
+        'rpc_calls_per_product': rpc['mean_calls_per_product'],
+        'rpc_chattiest_sites': rpc['chattiest_sites'][:5],
+        'output': orchestrator.get_output_path(),
+    }
+
+
+def field_accuracy(csv_paths: str, site: FixtureSite) -> float:
+    """Share of checked fields that match the fixture catalog exactly"""
+    matched = total = 0
+    for path in filter(None, (part.strip() for part in csv_paths.split(','))):
+        if not os.path.exists(path):
+            continue
+        with open(path, newline='', encoding='utf-8') as f:
+            for row in csv.DictReader(f):
+                expected = site.products.get(row.get('sku', ''))
+                for field in CHECKED_FIELDS:
+                    total += 1
+                    matched += bool(expected) and row.get(field, '') == getattr(expected, field)
+    return round(matched / total, 4) if total else 0.0
+
+
+def run_child(mode: str, base_url: str, products: int, workdir: str) -> dict:
+    """Run a mode in a fresh interpreter so peak RSS and imports don't leak between modes"""
+    command = [sys.executable, '-m', 'benchmarks.run', '--child', mode, '--base-url', base_url,
+               '--products', str(products), '--workdir', workdir]
+    completed = subprocess.run(command, capture_output=True, text=True,
+                               cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    lines = completed.stdout.strip().splitlines()
+    if completed.returncode != 0 or not lines:
+        sys.stderr.write(completed.stderr[-4000:])
+        return {'mode': mode, 'success': False, 'error': f"exit code {completed.returncode}"}
+    result = json.loads(lines[-1])
+    if not result.get('success'):
+        sys.stderr.write(completed.stderr[-4000:])
+    return result
+
+
+def compare(results: Dict[str, dict], baseline: Dict[str, dict], tolerance: float) -> List[str]:
+    """Regression messages for metrics worse than the baseline by more than tolerance"""
+    regressions = []
+    for mode, result in results.items():
+        reference = baseline.get(mode)
+        if not reference:
+            continue
+        for metric, higher_is_better in METRICS.items():
+            if metric not in reference or metric not in result:
+                continue
+            old, new = reference[metric], result[metric]
+            if not old:
+                continue
+            change = (new - old) / old
+            worse = -change if higher_is_better else change
+            if worse > tolerance:
+                regressions.append(f"{mode}: {metric} {old} -> {new} ({change:+.0%})")
+    return regressions
+
+
+def print_table(results: Dict[str, dict], baseline: Dict[str, dict]):
+    print(f"{'mode':<12}{'products':>9}{'prod/s':>9}{'p50 s':>8}{'p95 s':>8}{'RSS MB':>9}{'RPC/prod':>9}{'accuracy':>10}"
+          "  vs baseline")
+    for mode, result in results.items():
+        if not result.get('success'):
+            print(f"{mode:<12}  FAILED ({result.get('error', 'run reported failure')})")
+            continue
+        reference = baseline.get(mode, {})
+        delta = ''
+        if reference.get('products_per_sec'):
+            delta = f"{(result['products_per_sec'] / reference['products_per_sec'] - 1):+.0%} prod/s"
+        print(f"{mode:<12}{result['products']:>9}{result['products_per_sec']:>9.3f}{result['p50_seconds']:>8.2f}"
+              f"{result['p95_seconds']:>8.2f}{result['peak_rss_mb']:>9.1f}{result['rpc_calls_per_product']:>9.1f}"
+              f"{result['field_accuracy']:>10.1%}  {delta}")
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark the scraper against the local fixture site")
+    parser.add_argument('--modes', default=','.join(MODES), help=f"Comma-separated subset of {', '.join(MODES)}")
+    parser.add_argument('--products', type=int, default=24,
+                        help="Products scraped per mode (rounded up to a multiple of the category count)")
+    parser.add_argument('--latency-ms', type=float, default=50.0, help="Fixture site response delay")
+    parser.add_argument('--jitter-ms', type=float, default=20.0, help="Fixture site delay variation")
+    parser.add_argument('--baseline', default=BASELINE_PATH, help="Baseline file to compare against")
+    parser.add_argument('--update-baseline', action='store_true', help="Store this run as the new baseline")
+    parser.add_argument('--allow-missing-baseline', action='store_true',
+                        help="Report modes without a baseline instead of failing")
+    parser.add_argument('--tolerance', type=float, default=0.2,
+                        help="Allowed relative regression per metric before failing (default 0.2 = 20%%)")
+    parser.add_argument('--output', help="Also write the results as JSON to this file")
+    # Internal: run a single mode and print its result as JSON
+    parser.add_argument('--child', choices=MODES, help=argparse.SUPPRESS)
+    parser.add_argument('--base-url', help=argparse.SUPPRESS)
+    parser.add_argument('--workdir', help=argparse.SUPPRESS)
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = parse_args(argv)
+    if args.child:
+        result = run_mode(args.child, args.base_url, args.products, args.workdir)
+        print(json.dumps(result))
+        return 0
+
+    modes = [mode.strip() for mode in args.modes.split(',') if mode.strip()]
+    unknown = set(modes) - set(MODES)
+    if unknown:
+        print(f"❌ Unknown mode(s): {', '.join(sorted(unknown))}")
+        return 2
+
+    baseline_data = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline_data = json.load(f)
+    baseline = baseline_data.get('modes', {})
+    missing = [mode for mode in modes if mode not in baseline]
+    if missing and not (args.update_baseline or args.allow_missing_baseline):
+        # Without a baseline nothing can regress, so a bare run would always pass
+        print(f"❌ No baseline for {', '.join(missing)} in {args.baseline}; record one with --update-baseline "
+              f"(or pass --allow-missing-baseline)")
+        return 1
+
+    # Small pages so the listing pagination and lazy loading are exercised
+    per_category = max(1, math.ceil(args.products / len(CATEGORIES)))
+    site = FixtureSite(latency_ms=args.latency_ms, jitter_ms=args.jitter_ms,
+                       products_per_category=per_category, page_size=6).start()
+    products = len(site.products)
+    print(f"🧪 Fixture site at {site.url}, {products} products per mode")
+    results: Dict[str, dict] = {}
+    try:
+        for mode in modes:
+            print(f"⏱️ Running {mode}...")
+            with tempfile.TemporaryDirectory(prefix=f"bench-{mode}-") as workdir:
+                result = run_child(mode, site.url, products, workdir)
+                if result.get('success'):
+                    result['field_accuracy'] = field_accuracy(result.pop('output', ''), site)
+                results[mode] = result
+    finally:
+        site.stop()
+
+    print()
+    print_table(results, baseline)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump({'settings': vars(args), 'modes': results}, f, indent=2)
+
+    failed = [mode for mode, result in results.items() if not result.get('success')]
+    if args.update_baseline:
+        if failed:
+            print(f"❌ Not updating the baseline, failed mode(s): {', '.join(failed)}")
+            return 1
+        baseline_data = {
+            'settings': {'products': products, 'latency_ms': args.latency_ms, 'jitter_ms': args.jitter_ms},
+            'modes': {**baseline, **{mode: {metric: result[metric] for metric in METRICS}
+                                     for mode, result in results.items()}},
+        }
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(baseline_data, f, indent=2)
+            f.write('\n')
+        print(f"💾 Baseline updated: {args.baseline}")
+        return 0
+
+    if missing:
+        print(f"ℹ️ No baseline for {', '.join(missing)} (record one with --update-baseline)")
+    regressions = compare(results, baseline, args.tolerance)
+    for regression in regressions:
+        print(f"❌ REGRESSION {regression}")
+    if failed:
+        print(f"❌ Failed mode(s): {', '.join(failed)}")
+    if regressions or failed:
+        return 1
+    print("✅ No regressions")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
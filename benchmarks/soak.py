@@ -0,0 +1,270 @@
+#!/usr/bin/env python3
+"""
+Soak test for the Sysco scraper
+Drives SyscoScraperOrchestrator over a large synthetic catalog on the local stand-in site,
+samples Python heap, process/browser RSS, open handles and component sizes at intervals,
+and fails when memory grows faster than a threshold per 1k products
+
+    python -m benchmarks.soak                                  # 100k products
+    python -m benchmarks.soak --products 5000 --interval 10    # shorter run
+    python -m benchmarks.soak --series soak.csv --summary soak.json
+"""
+
+import argparse
+import asyncio
+import contextlib
+import csv
+import json
+import math
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from benchmarks.fixture_site import CATEGORIES
+
+# Memory series (MB) checked against the growth thresholds
+MEMORY_SERIES = ['heap_mb', 'python_rss_mb', 'browser_rss_mb']
+
+# Count series per component; any sustained growth in these points at a leak
+COMPONENT_SERIES = {
+    'pages': "open pages across browser contexts",
+    'contexts': "browser contexts",
+    'records': "products held in memory (ProductBatch)",
+    'queue_depth': "sink and work-queue backlog",
+    'tasks': "asyncio tasks",
+    'open_fds': "open file descriptors/handles",
+}
+
+# Share of the run ignored before fitting growth (caches, JIT-ish warmup, first context)
+WARMUP_FRACTION = 0.1
+
+# Heap allocation sites reported in the summary
+TOP_ALLOCATIONS = 10
+
+
+def slope_per_1k(xs: List[float], ys: List[float]) -> float:
+    """Least-squares slope of ys against xs, scaled to per-1000 xs"""
+    if len(xs) < 2:
+        return 0.0
+    mean_x, mean_y = sum(xs) / len(xs), sum(ys) / len(ys)
+    variance = sum((x - mean_x) ** 2 for x in xs)
+    if not variance:
+        return 0.0
+    covariance = sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys))
+    return covariance / variance * 1000
+
+
+class SoakSampler:
+    """Periodic snapshot of memory, handles and component sizes for one orchestrator"""
+
+    def __init__(self, orchestrator, interval: float):
+        self.orchestrator = orchestrator
+        self.interval = interval
+        self.samples: List[dict] = []
+        self.started = time.monotonic()
+        self.baseline_snapshot: Optional[tracemalloc.Snapshot] = None
+
+    def sample(self) -> dict:
+        from scraper.resource_usage import browser_rss_bytes, open_fd_count, process_rss_bytes
+
+        orchestrator = self.orchestrator
+        browser = orchestrator.browser_manager.browser
+        contexts = list(browser.contexts) if browser else []
+        progress = orchestrator.progress
+        heap, _ = tracemalloc.get_traced_memory() if tracemalloc.is_tracing() else (0, 0)
+        row = {
+            'elapsed_s': round(time.monotonic() - self.started, 1),
+            'products': orchestrator.products_scraped,
+            'failed': progress.failed if progress else 0,
+            'heap_mb': round(heap / 1024 / 1024, 2),
+            'python_rss_mb': round(process_rss_bytes() / 1024 / 1024, 1),
+            'browser_rss_mb': round(browser_rss_bytes() / 1024 / 1024, 1),
+            'open_fds': open_fd_count(),
+            'contexts': len(contexts),
+            'pages': sum(len(context.pages) for context in contexts),
+            'records': len(orchestrator.products),
+            'records_mb': round(orchestrator.products.nbytes() / 1024 / 1024, 2),
+            'queue_depth': sum(orchestrator._queue_depths().values()),
+            'tasks': len(asyncio.all_tasks()),
+        }
+        self.samples.append(row)
+        return row
+
+    async def run(self, total: int):
+        """Sample until cancelled; snapshot the heap once warmup is over"""
+        while True:
+            self.sample()
+            if (self.baseline_snapshot is None and tracemalloc.is_tracing()
+                    and self.orchestrator.products_scraped >= total * WARMUP_FRACTION):
+                self.baseline_snapshot = tracemalloc.take_snapshot()
+            await asyncio.sleep(self.interval)
+
+    def top_growth(self) -> List[dict]:
+        """Allocation sites that grew most since the warmup snapshot"""
+        if self.baseline_snapshot is None or not tracemalloc.is_tracing():
+            return []
+        stats = tracemalloc.take_snapshot().compare_to(self.baseline_snapshot, 'lineno')
+        return [
+            {'site': str(stat.traceback), 'growth_kb': round(stat.size_diff / 1024, 1), 'count_diff': stat.count_diff}
+            for stat in stats[:TOP_ALLOCATIONS] if stat.size_diff > 0
+        ]
+
+
+def analyze(samples: List[dict], max_mb_per_1k: Dict[str, Optional[float]], max_count_per_1k: float,
+            expected_growth: Iterable[str] = ()) -> dict:
+    """Growth per 1k products for every series after warmup, plus which of them breach a limit"""
+    total = samples[-1]['products'] if samples else 0
+    steady = [row for row in samples if row['products'] >= total * WARMUP_FRACTION]
+    xs = [row['products'] for row in steady]
+    growth = {series: round(slope_per_1k(xs, [row[series] for row in steady]), 3)
+              for series in MEMORY_SERIES + list(COMPONENT_SERIES) + ['records_mb']}
+
+    breaches = []
+    for series, limit in max_mb_per_1k.items():
+        if limit is not None and growth[series] > limit:
+            breaches.append(f"{series} grows {growth[series]:.2f} MB per 1k products (limit {limit})")
+    for series, description in COMPONENT_SERIES.items():
+        if series not in expected_growth and growth[series] > max_count_per_1k:
+            breaches.append(f"{series} ({description}) grows {growth[series]:.2f} per 1k products "
+                            f"(limit {max_count_per_1k})")
+    return {'products': total, 'steady_samples': len(steady), 'growth_per_1k': growth, 'breaches': breaches}
+
+
+def start_site(products: int, latency_ms: float, page_size: int) -> Tuple[subprocess.Popen, str]:
+    """Serve the fixture site from a child process so its memory and sockets stay out of the samples"""
+    per_category = max(1, math.ceil(products / len(CATEGORIES)))
+    command = [sys.executable, '-m', 'benchmarks.fixture_site', '--port', '0', '--latency-ms', str(latency_ms),
+               '--jitter-ms', '0', '--lazy-ms', '50', '--page-size', str(page_size),
+               '--products-per-category', str(per_category)]
+    site = subprocess.Popen(command, stdout=subprocess.PIPE, text=True,
+                            cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    line = site.stdout.readline()
+    if 'http://' not in line:
+        site.kill()
+        raise RuntimeError(f"Fixture site did not start: {line!r}")
+    url = line.split('at ', 1)[1].split()[0]
+    return site, url
+
+
+async def soak(args, base_url: str, workdir: str) -> Tuple[bool, SoakSampler]:
+    from scraper.main import SyscoScraperOrchestrator
+    from scraper.models import ScrapingConfig
+
+    config = ScrapingConfig(
+        headless=True,
+        base_url=base_url,
+        max_products=args.products,
+        output_dir=workdir,
+        throttle_seconds=0.0,
+        metrics_file=None,
+        enable_streaming_export=not args.in_memory,
+    )
+    orchestrator = SyscoScraperOrchestrator(config)
+    sampler = SoakSampler(orchestrator, args.interval)
+    sampling = asyncio.create_task(sampler.run(args.products))
+    try:
+        success = await orchestrator.run_scraper()
+    finally:
+        sampling.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await sampling
+    return success, sampler
+
+
+def write_series(path: str, samples: List[dict]):
+    if path.endswith('.json'):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(samples, f, indent=1)
+        return
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=list(samples[0]))
+        writer.writeheader()
+        writer.writerows(samples)
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Soak the scraper against the local fixture site and check for leaks")
+    parser.add_argument('--products', type=int, default=100_000, help="Products in the synthetic catalog")
+    parser.add_argument('--interval', type=float, default=30.0, help="Seconds between samples")
+    parser.add_argument('--latency-ms', type=float, default=5.0, help="Fixture site response delay")
+    parser.add_argument('--page-size', type=int, default=48, help="Product cards per listing page")
+    parser.add_argument('--max-heap-mb-per-1k', type=float, default=1.0,
+                        help="Allowed Python heap growth per 1k products (default 1.0)")
+    parser.add_argument('--max-rss-mb-per-1k', type=float, default=5.0,
+                        help="Allowed scraper process RSS growth per 1k products (default 5.0)")
+    parser.add_argument('--max-browser-mb-per-1k', type=float, default=None,
+                        help="Allowed browser RSS growth per 1k products (default: not checked, "
+                             "context recycling makes it saw-toothed)")
+    parser.add_argument('--max-count-per-1k', type=float, default=1.0,
+                        help="Allowed growth of pages/contexts/records/queues/tasks/handles per 1k products")
+    parser.add_argument('--in-memory', action='store_true',
+                        help="Keep records in memory instead of streaming them (records then grow by design)")
+    parser.add_argument('--no-tracemalloc', action='store_true', help="Skip heap tracing (faster, no heap series)")
+    parser.add_argument('--series', default='soak_series.csv', help="Time series output (.csv or .json)")
+    parser.add_argument('--summary', help="Also write the growth summary as JSON")
+    parser.add_argument('--log-level', choices=['quiet', 'info', 'debug'], default='quiet')
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    from scraper.log import setup_logging, shutdown_logging
+
+    args = parse_args(argv)
+    setup_logging(args.log_level)
+    if not args.no_tracemalloc:
+        tracemalloc.start(1)
+
+    site, base_url = start_site(args.products, args.latency_ms, args.page_size)
+    print(f"🧪 Fixture site at {base_url}, soaking {args.products:,} products (sample every {args.interval:.0f}s)")
+    try:
+        with tempfile.TemporaryDirectory(prefix="soak-") as workdir:
+            success, sampler = asyncio.run(soak(args, base_url, workdir))
+    finally:
+        site.terminate()
+        site.wait()
+        shutdown_logging()
+
+    if not sampler.samples:
+        print("❌ No samples collected")
+        return 1
+    write_series(args.series, sampler.samples)
+
+    limits = {
+        'heap_mb': None if args.no_tracemalloc else args.max_heap_mb_per_1k,
+        'python_rss_mb': args.max_rss_mb_per_1k,
+        'browser_rss_mb': args.max_browser_mb_per_1k,
+    }
+    result = analyze(sampler.samples, limits, args.max_count_per_1k,
+                     expected_growth=['records'] if args.in_memory else [])
+    result['success'] = bool(success)
+    result['heap_top_growth'] = sampler.top_growth()
+
+    print()
+    print(f"{'series':<16}{'per 1k products':>18}{'first':>10}{'last':>10}")
+    first, last = sampler.samples[0], sampler.samples[-1]
+    for series, value in result['growth_per_1k'].items():
+        print(f"{series:<16}{value:>18.3f}{first[series]:>10}{last[series]:>10}")
+    for site_growth in result['heap_top_growth'][:5]:
+        print(f"  📈 {site_growth['growth_kb']:>10.1f} KB  {site_growth['site']}")
+    print(f"📄 Time series: {args.series} ({len(sampler.samples)} samples)")
+
+    if args.summary:
+        with open(args.summary, 'w', encoding='utf-8') as f:
+            json.dump(result, f, indent=2)
+
+    if not success:
+        print("❌ Scraper run reported failure")
+    for breach in result['breaches']:
+        print(f"❌ LEAK {breach}")
+    if result['breaches'] or not success:
+        return 1
+    print(f"✅ No growth over the limits across {result['products']:,} products")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+CLI startup check for the scraper
+Runs `python -m scraper <command> --help` for the offline commands in fresh interpreters and
+fails when one of them imports a heavy optional dependency or starts slowly
+
+    python -m benchmarks.startup
+    python -m benchmarks.startup --commands diff,report --max-ms 150
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import time
+from typing import List, Optional, Set
+
+# Commands that never touch a browser or write columnar output, so they must not pay for these
+DEFAULT_COMMANDS = ['diff', 'report']
+FORBIDDEN_MODULES = ['pyarrow', 'numpy', 'playwright']
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def imported_modules(command: str) -> Set[str]:
+    """Top-level packages imported by `python -m scraper <command> --help` (from -X importtime)"""
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-m', 'scraper', command, '--help'],
+        cwd=ROOT, capture_output=True, text=True, check=True
+    )
+    modules = set()
+    for line in result.stderr.splitlines():
+        if line.startswith('import time:') and '|' in line:
+            name = line.rsplit('|', 1)[1].strip()
+            modules.add(name.split('.')[0])
+    return modules
+
+
+def startup_ms(command: str, repeat: int) -> float:
+    """Best wall time of `python -m scraper <command> --help` in ms"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, '-m', 'scraper', command, '--help'],
+                       cwd=ROOT, capture_output=True, check=True)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Check that the offline CLI commands start without heavy imports")
+    parser.add_argument('--commands', default=','.join(DEFAULT_COMMANDS), help="Comma-separated commands to check")
+    parser.add_argument('--max-ms', type=float, default=None,
+                        help="Also fail when a command's --help takes longer (default: imports only)")
+    parser.add_argument('--repeat', type=int, default=3, help="Timed runs per command (best one counts)")
+    args = parser.parse_args(argv)
+
+    failed = False
+    for command in [c.strip() for c in args.commands.split(',') if c.strip()]:
+        heavy = sorted(set(FORBIDDEN_MODULES) & imported_modules(command))
+        elapsed = startup_ms(command, args.repeat)
+        problems = []
+        if heavy:
+            problems.append(f"imports {', '.join(heavy)}")
+        if args.max_ms is not None and elapsed > args.max_ms:
+            problems.append(f"slower than {args.max_ms:.0f} ms")
+        status = f"❌ {'; '.join(problems)}" if problems else "✅"
+        print(f"{command + ' --help':<16} {elapsed:7.0f} ms  {status}")
+        failed = failed or bool(problems)
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -6,6 +6,27 @@ A professional web scraper for shop.sysco.com with clean, maintainable code stru
 __version__ = "2.0.0"
 __author__ = "Sysco Scraper Team"
 
-# Main exports
-from .main import SyscoScraperOrchestrator, run_scraper
-from .models import ProductData, ScrapingConfig
+# Main exports, imported on first access so that offline tools (diff, export, reports)
+# don't load Playwright and the extractors
+_EXPORTS = {
+    'SyscoScraperOrchestrator': '.main',
+    'run_scraper': '.main',
+    'ProductData': '.models',
+    'ScrapingConfig': '.models',
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    from importlib import import_module
+    value = getattr(import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
@@ -0,0 +1,8 @@
+"""
+python -m scraper: see scraper/cli.py for the commands
+"""
+
+import sys
+from .cli import main
+
+sys.exit(main())
@@ -4,9 +4,15 @@ Handles browser lifecycle, navigation, and Sysco-specific interactions
 """
 
 import asyncio
+import logging
 import time
-from playwright.async_api import async_playwright, Browser, Page, Playwright
+from typing import Optional
+from playwright.async_api import async_playwright, Browser, BrowserContext, Page, Playwright
 from .models import ScrapingConfig
+from .network_accounting import NetworkAccounting, ALLOWED, BLOCKED
+from .trace_sampler import TraceSampler
+
+logger = logging.getLogger(__name__)
 
 
 class BrowserManager:
@@ -16,90 +22,200 @@ class BrowserManager:
         self.config = config
         self.playwright: Playwright = None
         self.browser: Browser = None
+        self.context: BrowserContext = None
         self.page: Page = None
+        
+        # Cookies/local storage captured after session setup, re-applied to new contexts
+        self.session_state: Optional[dict] = None
+        self.crashed = False
+        
+        # Transfer sizes per resource type/host and the optional bandwidth budget
+        budget_bytes = int(config.bandwidth_budget_mb * 1024 * 1024) if config.bandwidth_budget_mb else None
+        self.network = NetworkAccounting(budget_bytes, demote_fraction=config.bandwidth_demote_fraction)
+        
+        # Rolling Playwright trace of the working context (persisted only for slow/failed products)
+        self.trace_sampler = TraceSampler(config)
     
     async def start_browser(self) -> Page:
         """Initialize browser with performance optimizations"""
         try:
-            print("🌐 Starting Firefox browser with performance optimizations...")
+            logger.info("🌐 Starting Firefox browser with performance optimizations...")
             self.playwright = await async_playwright().start()
             
-            # Launch browser with optimized settings
-            self.browser = await self.playwright.firefox.launch(
-                headless=self.config.headless,
-                args=[
-                    '--disable-blink-features=AutomationControlled',
-                    '--disable-dev-shm-usage',
-                    '--no-sandbox'
-                ]
-            )
-            
-            # Create context with realistic settings
-            self.context = await self.browser.new_context(
-                viewport={'width': 1280, 'height': 720},
-                user_agent='Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
-            )
-            
-            # Create page
-            self.page = await self.context.new_page()
+            await self._launch_browser()
+            await self._create_context()
+            await self._create_page()
             
-            # 🚀 PERFORMANCE OPTIMIZATION: Block unnecessary resources (if enabled)
-            if self.config.enable_resource_blocking:
-                await self.page.route("**/*", self._handle_route)
-                print("🚫 Resource blocking enabled")
-            else:
-                print("📥 Resource blocking disabled")
-            
-            print("✅ Browser started with resource blocking enabled")
+            logger.info("✅ Browser started with resource blocking enabled")
             return self.page
             
         except Exception as e:
-            print(f"❌ Error starting browser: {e}")
+            logger.error(f"❌ Error starting browser: {e}")
             await self.close_browser()
             raise
     
+    async def _launch_browser(self):
+        """Launch Firefox and watch for crashes"""
+        # Launch browser with optimized settings
+        self.browser = await self.playwright.firefox.launch(
+            headless=self.config.headless,
+            args=[
+                '--disable-blink-features=AutomationControlled',
+                '--disable-dev-shm-usage',
+                '--no-sandbox'
+            ]
+        )
+        self.crashed = False
+        self.browser.on("disconnected", self._on_disconnected)
+    
+    def _on_disconnected(self, browser: Browser):
+        """Browser process went away (crash, OOM kill or close)"""
+        if browser is self.browser:
+            self.crashed = True
+    
+    async def _create_context(self):
+        """Create a browser context, re-applying the saved session if there is one"""
+        # Create context with realistic settings
+        self.context = await self.browser.new_context(
+            viewport={'width': 1280, 'height': 720},
+            user_agent='Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+            storage_state=self.session_state
+        )
+        await self.trace_sampler.attach(self.context)
+    
+    async def _create_page(self):
+        """Create the working page with resource blocking"""
+        self.page = await self.context.new_page()
+        self.page.on("requestfinished", self._on_request_finished)
+        
+        # 🚀 PERFORMANCE OPTIMIZATION: Block unnecessary resources (if enabled)
+        if self.config.enable_resource_blocking:
+            await self.page.route("**/*", self._handle_route)
+            logger.info("🚫 Resource blocking enabled")
+        elif self.network.budget_bytes:
+            # Still intercept, so heavy resources can be dropped once the budget runs low
+            await self.page.route("**/*", self._handle_route)
+            logger.info("📥 Resource blocking disabled (bandwidth budget active)")
+        else:
+            logger.info("📥 Resource blocking disabled")
+    
+    async def _on_request_finished(self, request):
+        """Account the transfer size (headers + encoded body) of every completed request"""
+        try:
+            sizes = await request.sizes()
+            nbytes = sizes['responseHeadersSize'] + sizes['responseBodySize']
+        except Exception:
+            nbytes = 0  # Page or context closed before the sizes could be read
+        self.network.record(request.resource_type, request.url, ALLOWED, max(nbytes, 0))
+    
+    async def save_session_state(self) -> bool:
+        """Capture cookies and local storage (guest login, ZIP code) for re-use after recycling"""
+        try:
+            self.session_state = await self.context.storage_state()
+            logger.info(f"💾 Saved session state ({len(self.session_state.get('cookies', []))} cookies)")
+            return True
+        except Exception as e:
+            logger.warning(f"⚠️ Could not save session state: {e}")
+            return False
+    
+    async def ensure_on_site(self) -> bool:
+        """Bring a fresh (blank) page back to the site so menu navigation works again"""
+        if self.page and self.page.url.startswith(self.config.base_url):
+            return True
+        try:
+            await self.page.goto(self.config.base_url, wait_until="domcontentloaded", timeout=self.config.page_load_timeout)
+            await self.page.wait_for_timeout(2000)
+            return True
+        except Exception as e:
+            logger.error(f"❌ Error returning to {self.config.base_url}: {e}")
+            return False
+    
+    def is_connected(self) -> bool:
+        """True while the browser process is alive"""
+        return bool(self.browser) and not self.crashed and self.browser.is_connected()
+    
+    async def recycle_page(self) -> Page:
+        """Replace the working page, e.g. after it got stuck"""
+        logger.info("♻️ Recycling page...")
+        try:
+            if self.page:
+                await self.page.close()
+        except Exception as e:
+            logger.warning(f"⚠️ Error closing old page: {e}")
+        await self._create_page()
+        return self.page
+    
+    async def recycle_context(self) -> Page:
+        """Replace the whole browser context to release memory held by the old one"""
+        logger.info("♻️ Recycling browser context...")
+        await self.trace_sampler.detach()
+        try:
+            if self.context:
+                await self.context.close()
+        except Exception as e:
+            logger.warning(f"⚠️ Error closing old context: {e}")
+        await self._create_context()
+        await self._create_page()
+        return self.page
+    
+    async def restart_browser(self) -> Page:
+        """Respawn the browser process (after a crash) with the saved session"""
+        logger.info("🔁 Restarting browser...")
+        await self.trace_sampler.detach()
+        try:
+            if self.browser and self.browser.is_connected():
+                await self.browser.close()
+        except Exception as e:
+            logger.warning(f"⚠️ Error closing old browser: {e}")
+        await self._launch_browser()
+        await self._create_context()
+        await self._create_page()
+        logger.info("✅ Browser restarted")
+        return self.page
+    
     async def close_browser(self):
         """Clean up browser resources"""
         try:
+            await self.trace_sampler.detach(keep=False)
             if self.page:
                 await self.page.close()
             if self.browser:
                 await self.browser.close()
             if self.playwright:
                 await self.playwright.stop()
-            print("🔒 Browser closed successfully")
+            logger.info("🔒 Browser closed successfully")
         except Exception as e:
-            print(f"⚠️ Error closing browser: {e}")
+            logger.warning(f"⚠️ Error closing browser: {e}")
     
     async def navigate_to_sysco(self) -> bool:
         """Navigate to Sysco and handle guest login"""
         try:
-            print("🏪 Navigating to shop.sysco.com...")
+            logger.info(f"🏪 Navigating to {self.config.base_url}...")
             # 🚀 PERFORMANCE OPTIMIZATION: Use faster wait strategy
             start_time = time.time()
-            await self.page.goto("https://shop.sysco.com", wait_until="domcontentloaded", timeout=self.config.page_load_timeout)
+            await self.page.goto(self.config.base_url, wait_until="domcontentloaded", timeout=self.config.page_load_timeout)
             await self.page.wait_for_timeout(2000)  # Reduced wait time
             load_time = time.time() - start_time
             if self.config.enable_performance_monitoring:
-                print(f"⚡ Page loaded in {load_time:.2f}s")
-            print("✅ Successfully navigated to shop.sysco.com")
+                logger.info(f"⚡ Page loaded in {load_time:.2f}s")
+            logger.info(f"✅ Successfully navigated to {self.config.base_url}")
             
             # Handle guest login
             if await self._handle_guest_login():
-                print("✅ Successfully handled guest login")
+                logger.info("✅ Successfully handled guest login")
                 return True
             else:
-                print("❌ Failed to handle guest login")
+                logger.error("❌ Failed to handle guest login")
                 return False
                 
         except Exception as e:
-            print(f"❌ Error navigating to Sysco: {e}")
+            logger.error(f"❌ Error navigating to Sysco: {e}")
             return False
     
     async def _handle_guest_login(self) -> bool:
         """Handle the guest login process with multiple fallback selectors"""
         try:
-            print("👤 Looking for 'Continue as Guest' button...")
+            logger.info("👤 Looking for 'Continue as Guest' button...")
             
             # Use same selectors as original scraper
             guest_button_selectors = [
@@ -115,27 +231,27 @@ class BrowserManager:
                     guest_button = await self.page.wait_for_selector(selector, timeout=5000)
                     if guest_button:
                         await guest_button.click()
-                        print(f"✅ Clicked 'Continue as Guest' button with selector: {selector}")
+                        logger.info(f"✅ Clicked 'Continue as Guest' button with selector: {selector}")
                         guest_clicked = True
                         break
                 except:
                     continue
                     
             if not guest_clicked:
-                print("⚠️ Could not find 'Continue as Guest' button with any selector")
+                logger.warning("⚠️ Could not find 'Continue as Guest' button with any selector")
                 return False
                 
             await self.page.wait_for_timeout(3000)  # Wait for navigation
             return True
                 
         except Exception as e:
-            print(f"❌ Error during guest login: {e}")
+            logger.error(f"❌ Error during guest login: {e}")
             return False
     
     async def handle_zip_code_modal(self) -> bool:
         """Handle zip code modal with robust fallback strategies from original scraper"""
         try:
-            print("📍 Looking for zip code modal...")
+            logger.info("📍 Looking for zip code modal...")
             await self.page.wait_for_timeout(5000)  # Wait longer for modal to appear
             
             # Look for the specific zip code input in the modal (from original scraper)
@@ -151,13 +267,13 @@ class BrowserManager:
                 try:
                     zip_input = await self.page.wait_for_selector(selector, timeout=5000)
                     if zip_input:
-                        print(f"📍 Found zip input with selector: {selector}")
+                        logger.info(f"📍 Found zip input with selector: {selector}")
                         break
                 except:
                     continue
                     
             if zip_input:
-                print(f"📍 Entering zip code: {self.config.zip_code}")
+                logger.info(f"📍 Entering zip code: {self.config.zip_code}")
                 # Clear the input field properly using correct Playwright methods
                 await zip_input.click()
                 await zip_input.press('Control+a')  # Select all
@@ -179,7 +295,7 @@ class BrowserManager:
                         # Wait for button to exist and become enabled
                         shopping_btn = await self.page.wait_for_selector(selector, timeout=5000)
                         if shopping_btn:
-                            print(f"📍 Found button with selector: {selector}, checking if enabled...")
+                            logger.info(f"📍 Found button with selector: {selector}, checking if enabled...")
                             
                             # Wait up to 10 seconds for button to become enabled
                             for attempt in range(10):
@@ -187,32 +303,32 @@ class BrowserManager:
                                 if is_disabled is None:  # Button is enabled
                                     break
                                 await self.page.wait_for_timeout(1000)
-                                print(f"📍 Button still disabled, waiting... (attempt {attempt + 1}/10)")
+                                logger.info(f"📍 Button still disabled, waiting... (attempt {attempt + 1}/10)")
                             
                             # Try to click the button
                             await shopping_btn.scroll_into_view_if_needed()
                             await shopping_btn.click()
-                            print(f"✅ Clicked 'Start Shopping' button with selector: {selector}")
+                            logger.info(f"✅ Clicked 'Start Shopping' button with selector: {selector}")
                             shopping_clicked = True
                             break
                     except Exception as e:
-                        print(f"⚠️ Failed to click with selector '{selector}': {e}")
+                        logger.warning(f"⚠️ Failed to click with selector '{selector}': {e}")
                         continue
                         
                 if not shopping_clicked:
-                    print("⚠️ Could not find 'Start Shopping' button")
+                    logger.warning("⚠️ Could not find 'Start Shopping' button")
                     return False
                     
                 await self.page.wait_for_timeout(8000)  # Wait longer for page to load after modal
-                print("✅ Successfully handled zip code modal")
+                logger.info("✅ Successfully handled zip code modal")
                 return True
                 
             else:
-                print("ℹ️ No zip code input found in modal")
+                logger.info("ℹ️ No zip code input found in modal")
                 return False
                 
         except Exception as e:
-            print(f"❌ Error handling zip code modal: {e}")
+            logger.error(f"❌ Error handling zip code modal: {e}")
             return False
     
     async def _handle_route(self, route):
@@ -232,11 +348,14 @@ class BrowserManager:
         
         # Check if we should block this resource
         should_block = (
-            resource_type in blocked_types or
-            any(domain in url for domain in blocked_domains)
-        )
+            self.config.enable_resource_blocking and (
+                resource_type in blocked_types or
+                any(domain in url for domain in blocked_domains)
+            )
+        ) or self.network.should_block(resource_type)
         
         if should_block:
+            self.network.record(resource_type, url, BLOCKED)
             await route.abort()
         else:
             await route.continue_()
@@ -251,7 +370,7 @@ class BrowserManager:
         try:
             await self.page.wait_for_load_state("networkidle", timeout=timeout)
         except Exception as e:
-            print(f"⚠️ Page load timeout: {e}")
+            logger.warning(f"⚠️ Page load timeout: {e}")
     
     async def scroll_to_bottom(self):
         """Scroll to bottom of page to trigger lazy loading"""
@@ -259,7 +378,7 @@ class BrowserManager:
             await self.page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
             await asyncio.sleep(1)  # Wait for content to load
         except Exception as e:
-            print(f"⚠️ Error scrolling: {e}")
+            logger.warning(f"⚠️ Error scrolling: {e}")
     
     def get_current_url(self) -> str:
         """Get current page URL"""
@@ -271,5 +390,5 @@ class BrowserManager:
             await self.page.goto(url, wait_until="networkidle")
             return True
         except Exception as e:
-            print(f"❌ Error navigating to {url}: {e}")
+            logger.error(f"❌ Error navigating to {url}: {e}")
             return False
@@ -0,0 +1,338 @@
+"""
+Persistent SQLite catalog store for the Sysco scraper
+Keeps one row per SKU across runs, upserted in batches from a dedicated writer thread
+"""
+
+import hashlib
+import logging
+import os
+import queue
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Set
+from .models import ProductData
+from .sinks.base import ProductSink
+
+logger = logging.getLogger(__name__)
+
+
+PRODUCT_FIELDS = [
+    'sku', 'url', 'brand', 'product_name', 'packaging',
+    'image_url', 'description', 'price', 'category',
+    'price_cents', 'pack_count', 'pack_unit_quantity', 'pack_unit', 'unit_price_cents'
+]
+
+# Typed columns added after the first schema version -> SQL type (migrated with ALTER TABLE)
+TYPED_COLUMNS = {
+    'price_cents': 'INTEGER',
+    'pack_count': 'INTEGER',
+    'pack_unit_quantity': 'REAL',
+    'pack_unit': 'TEXT',
+    'unit_price_cents': 'REAL',
+}
+
+# Fields that count as a content change between runs
+CONTENT_FIELDS = ['brand', 'product_name', 'packaging', 'image_url', 'description', 'price', 'category']
+
+_STOP = object()
+
+
+def product_key(product: ProductData) -> str:
+    """Catalog key: the SKU/SUPC, falling back to the URL for products without one"""
+    return product.sku or f"url:{product.url}"
+
+
+def content_hash(values: Dict[str, str]) -> str:
+    """Stable hash of the content fields, used to detect changes cheaply"""
+    digest = hashlib.blake2b(digest_size=12)
+    for field in CONTENT_FIELDS:
+        digest.update((values.get(field) or '').encode('utf-8'))
+        digest.update(b'\x1f')
+    return digest.hexdigest()
+
+
+class CatalogStore(ProductSink):
+    """SQLite product catalog (WAL mode) with batched upserts from a writer thread"""
+
+    name = "sqlite"
+
+    def __init__(self, db_path: str, batch_size: int = 500, flush_interval: float = 2.0,
+                 queue_size: int = 10000, use_writer_thread: bool = True):
+        super().__init__()
+        self.db_path = db_path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        # Without its own thread the store batches inline; used when a SinkManager
+        # already calls write() from a dedicated writer thread
+        self.use_writer_thread = use_writer_thread
+        self.pending: list = []
+        self.inline_conn: Optional[sqlite3.Connection] = None
+        self.last_commit = time.monotonic()
+        self.run_id = uuid.uuid4().hex[:12]
+        self.run_started = time.time()
+
+        self.queue: "queue.Queue" = queue.Queue(maxsize=queue_size)
+        self.writer_thread: Optional[threading.Thread] = None
+        self.writer_error: Optional[BaseException] = None
+
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._connection() as conn:
+            self._create_schema(conn)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, timeout=30.0, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    @contextmanager
+    def _connection(self) -> Iterator[sqlite3.Connection]:
+        """Short-lived connection that commits and closes"""
+        conn = self._connect()
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    @staticmethod
+    def _create_schema(conn: sqlite3.Connection):
+        conn.executescript("""
+            CREATE TABLE IF NOT EXISTS products (
+                product_key TEXT PRIMARY KEY,
+                sku TEXT,
+                url TEXT NOT NULL,
+                brand TEXT,
+                product_name TEXT,
+                packaging TEXT,
+                image_url TEXT,
+                description TEXT,
+                price TEXT,
+                category TEXT,
+                price_cents INTEGER,
+                pack_count INTEGER,
+                pack_unit_quantity REAL,
+                pack_unit TEXT,
+                unit_price_cents REAL,
+                content_hash TEXT NOT NULL,
+                first_seen REAL NOT NULL,
+                last_seen REAL NOT NULL,
+                last_changed REAL NOT NULL,
+                last_run_id TEXT NOT NULL,
+                times_seen INTEGER NOT NULL DEFAULT 1
+            );
+            CREATE INDEX IF NOT EXISTS idx_products_category ON products (category);
+            CREATE INDEX IF NOT EXISTS idx_products_brand ON products (brand);
+            CREATE INDEX IF NOT EXISTS idx_products_last_seen ON products (last_seen);
+            CREATE TABLE IF NOT EXISTS runs (
+                run_id TEXT PRIMARY KEY,
+                started_at REAL NOT NULL,
+                finished_at REAL,
+                products_written INTEGER NOT NULL DEFAULT 0,
+                status TEXT NOT NULL DEFAULT 'running'
+            );
+        """)
+        existing = {row[1] for row in conn.execute("PRAGMA table_info(products)")}
+        for column, sql_type in TYPED_COLUMNS.items():
+            if column not in existing:
+                conn.execute(f"ALTER TABLE products ADD COLUMN {column} {sql_type}")
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_products_unit_price ON products (pack_unit, unit_price_cents)")
+
+    def open(self):
+        """Register the run and start the writer thread"""
+        with self._connection() as conn:
+            conn.execute("INSERT INTO runs (run_id, started_at) VALUES (?, ?)", (self.run_id, self.run_started))
+        if self.use_writer_thread:
+            self.writer_thread = threading.Thread(target=self._writer_loop, name="catalog-writer", daemon=True)
+            self.writer_thread.start()
+        else:
+            self.inline_conn = self._connect()
+
+    def write(self, product: ProductData):
+        """Queue one product for upsert (blocks when the writer falls far behind)"""
+        if not product.is_valid():
+            return
+        if self.writer_error:
+            raise RuntimeError(f"Catalog writer failed: {self.writer_error}")
+        values = product.to_dict()
+        now = time.time()
+        row = (
+            product_key(product), *(values[field] for field in PRODUCT_FIELDS),
+            content_hash(values), now, now, now, self.run_id
+        )
+        if self.inline_conn is None:
+            self.queue.put(row)
+            return
+        self.pending.append(row)
+        if len(self.pending) >= self.batch_size or time.monotonic() - self.last_commit >= self.flush_interval:
+            self.flush()
+
+    def flush(self):
+        """Block until everything queued so far is committed"""
+        if self.inline_conn is not None:
+            self._commit(self.inline_conn, self.pending)
+            self.pending = []
+            self.last_commit = time.monotonic()
+        elif self.writer_thread and self.writer_thread.is_alive():
+            done = threading.Event()
+            self.queue.put(done)
+            done.wait()
+
+    def _writer_loop(self):
+        """Collect rows into batches and commit each batch in one transaction"""
+        conn = self._connect()
+        batch: list = []
+        waiters: List[threading.Event] = []
+        last_commit = time.monotonic()
+        try:
+            while True:
+                timeout = max(self.flush_interval - (time.monotonic() - last_commit), 0.05)
+                try:
+                    item = self.queue.get(timeout=timeout)
+                except queue.Empty:
+                    item = None
+
+                if item is _STOP:
+                    self._commit(conn, batch)
+                    break
+                if isinstance(item, threading.Event):
+                    waiters.append(item)
+                elif item is not None:
+                    batch.append(item)
+
+                if waiters or len(batch) >= self.batch_size or time.monotonic() - last_commit >= self.flush_interval:
+                    self._commit(conn, batch)
+                    batch = []
+                    last_commit = time.monotonic()
+                    for waiter in waiters:
+                        waiter.set()
+                    waiters = []
+        except BaseException as e:
+            self.writer_error = e
+            logger.error(f"❌ Catalog writer error: {e}")
+        finally:
+            for waiter in waiters:
+                waiter.set()
+            conn.close()
+
+    def _commit(self, conn: sqlite3.Connection, batch: list):
+        if not batch:
+            return
+        columns = ', '.join(PRODUCT_FIELDS)
+        updates = ', '.join(f"{field} = excluded.{field}" for field in PRODUCT_FIELDS)
+        with conn:
+            conn.executemany(
+                f"INSERT INTO products (product_key, {columns}, content_hash, first_seen, last_seen, "
+                f"last_changed, last_run_id) VALUES ({', '.join('?' for _ in range(len(PRODUCT_FIELDS) + 6))}) "
+                f"ON CONFLICT (product_key) DO UPDATE SET {updates}, "
+                f"last_changed = CASE WHEN products.content_hash != excluded.content_hash "
+                f"THEN excluded.last_seen ELSE products.last_changed END, "
+                f"content_hash = excluded.content_hash, last_seen = excluded.last_seen, "
+                f"last_run_id = excluded.last_run_id, "
+                f"times_seen = products.times_seen + CASE WHEN products.last_run_id != excluded.last_run_id "
+                f"THEN 1 ELSE 0 END",
+                batch
+            )
+            conn.execute(
+                "UPDATE runs SET products_written = products_written + ? WHERE run_id = ?",
+                (len(batch), self.run_id)
+            )
+        self.records_written += len(batch)
+
+    def close(self, success: bool = True) -> bool:
+        """Drain the queue, stop the writer and record the run outcome"""
+        if self.closed:
+            return success
+        self.closed = True
+        if self.writer_thread:
+            self.queue.put(_STOP)
+            self.writer_thread.join()
+        if self.inline_conn is not None:
+            try:
+                self.flush()
+            except Exception as e:
+                self.writer_error = e
+                logger.error(f"❌ Catalog writer error: {e}")
+            self.inline_conn.close()
+        with self._connection() as conn:
+            conn.execute(
+                "UPDATE runs SET finished_at = ?, status = ? WHERE run_id = ?",
+                (time.time(), 'complete' if success and not self.writer_error else 'aborted', self.run_id)
+            )
+        if self.writer_error:
+            return False
+        logger.info(f"Successfully upserted {self.records_written} products into {self.db_path}")
+        return success
+
+    def output_paths(self) -> List[str]:
+        return [self.db_path]
+
+    # Read side: used by delta runs, resume and cross-run comparison
+
+    def get(self, sku: str) -> Optional[Dict]:
+        """Look up one product by SKU/SUPC"""
+        with self._connection() as conn:
+            row = conn.execute("SELECT * FROM products WHERE product_key = ?", (sku,)).fetchone()
+        return dict(row) if row else None
+
+    def iter_products(self, category: Optional[str] = None, seen_since: Optional[float] = None) -> Iterator[ProductData]:
+        """Stream products from the catalog, optionally filtered by category / last-seen time"""
+        query = f"SELECT {', '.join(PRODUCT_FIELDS)} FROM products WHERE 1 = 1"
+        params: list = []
+        if category:
+            query += " AND category = ?"
+            params.append(category)
+        if seen_since is not None:
+            query += " AND last_seen >= ?"
+            params.append(seen_since)
+        with self._connection() as conn:
+            for row in conn.execute(query, params):
+                yield ProductData.from_record(dict(row))
+
+    def cheapest_per_unit(self, unit: str, category: Optional[str] = None, limit: int = 20) -> List[Dict]:
+        """Products with the lowest price per normalized unit ('lb', 'gal', 'ea')"""
+        query = ("SELECT product_key, sku, brand, product_name, packaging, price, unit_price_cents "
+                 "FROM products WHERE pack_unit = ? AND unit_price_cents IS NOT NULL")
+        params: list = [unit]
+        if category:
+            query += " AND category = ?"
+            params.append(category)
+        query += " ORDER BY unit_price_cents LIMIT ?"
+        params.append(limit)
+        with self._connection() as conn:
+            return [dict(row) for row in conn.execute(query, params)]
+
+    def known_urls(self, category: Optional[str] = None) -> Set[str]:
+        """URLs already in the catalog (e.g. to skip or prioritize them on resume)"""
+        query = "SELECT url FROM products"
+        params: list = []
+        if category:
+            query += " WHERE category = ?"
+            params.append(category)
+        with self._connection() as conn:
+            return {row['url'] for row in conn.execute(query, params)}
+
+    def not_seen_in_run(self, run_id: Optional[str] = None) -> List[Dict]:
+        """Products missing from a run (candidates for removal)"""
+        run_id = run_id or self.run_id
+        with self._connection() as conn:
+            rows = conn.execute(
+                "SELECT product_key, sku, url, category, last_seen FROM products WHERE last_run_id != ?",
+                (run_id,)
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def changed_since(self, timestamp: float) -> List[Dict]:
+        """Products whose content changed after the given time"""
+        with self._connection() as conn:
+            rows = conn.execute(
+                "SELECT product_key, sku, price, packaging, last_changed FROM products WHERE last_changed >= ?",
+                (timestamp,)
+            ).fetchall()
+        return [dict(row) for row in rows]
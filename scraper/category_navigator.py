@@ -4,9 +4,12 @@ Handles category selection and navigation with multiple strategies
 """
 
 import asyncio
+import logging
 from typing import List, Optional
 from playwright.async_api import Page
 
+logger = logging.getLogger(__name__)
+
 
 class CategoryNavigator:
     """Handles category selection and navigation"""
@@ -25,13 +28,13 @@ class CategoryNavigator:
             True if category was successfully selected
         """
         try:
-            print(f"📁 Selecting category via dropdown menu: {category_name}")
+            logger.info(f"📁 Selecting category via dropdown menu: {category_name}")
             
             # 🚀 NEW APPROACH: Use sidebar dropdown menu navigation
             return await self._select_via_dropdown_menu(category_name)
             
         except Exception as e:
-            print(f"❌ Error selecting category '{category_name}': {e}")
+            logger.error(f"❌ Error selecting category '{category_name}': {e}")
             return False
     
     async def _select_via_dropdown_menu(self, category_name: str) -> bool:
@@ -39,10 +42,10 @@ class CategoryNavigator:
         Select category using the sidebar dropdown menu after zip code entry
         """
         try:
-            print(f"🎯 Using dropdown menu navigation for: {category_name}")
+            logger.info(f"🎯 Using dropdown menu navigation for: {category_name}")
             
             # Step 1: Find and hover over the "Products" dropdown button
-            print("🔍 Looking for Products dropdown button...")
+            logger.info("🔍 Looking for Products dropdown button...")
             
             # Look for the Products dropdown with the specific structure
             products_button_selectors = [
@@ -57,22 +60,22 @@ class CategoryNavigator:
                 try:
                     products_button = await self.page.wait_for_selector(selector, timeout=5000)
                     if products_button:
-                        print(f"✅ Found Products button with selector: {selector}")
+                        logger.info(f"✅ Found Products button with selector: {selector}")
                         break
                 except:
                     continue
             
             if not products_button:
-                print("❌ Could not find Products dropdown button")
+                logger.error("❌ Could not find Products dropdown button")
                 return False
             
             # Step 2: Hover over the Products button to reveal the dropdown menu
-            print("🖱️ Hovering over Products button to reveal dropdown...")
+            logger.info("🖱️ Hovering over Products button to reveal dropdown...")
             await products_button.hover()
             await self.page.wait_for_timeout(1000)  # Wait for dropdown to appear
             
             # Step 3: Look for the category in the dropdown menu
-            print(f"🔍 Looking for '{category_name}' in dropdown menu...")
+            logger.info(f"🔍 Looking for '{category_name}' in dropdown menu...")
             
             # Wait for dropdown menu items to appear
             await self.page.wait_for_timeout(500)
@@ -94,7 +97,7 @@ class CategoryNavigator:
                         text = await element.inner_text()
                         if text and category_name.lower() in text.lower():
                             category_item = element
-                            print(f"✅ Found category item: '{text}' with selector: {selector}")
+                            logger.info(f"✅ Found category item: '{text}' with selector: {selector}")
                             break
                     if category_item:
                         break
@@ -102,27 +105,27 @@ class CategoryNavigator:
                     continue
             
             if not category_item:
-                print(f"❌ Could not find '{category_name}' in dropdown menu")
+                logger.error(f"❌ Could not find '{category_name}' in dropdown menu")
                 # Debug: Show what menu items are available
                 await self._debug_dropdown_menu()
                 return False
             
             # Step 4: Click on the category menu item
-            print(f"🎯 Clicking on category menu item: {category_name}")
+            logger.info(f"🎯 Clicking on category menu item: {category_name}")
             await category_item.click()
             await self.page.wait_for_timeout(3000)  # Wait for navigation
             
-            print(f"✅ Successfully selected category: {category_name}")
+            logger.info(f"✅ Successfully selected category: {category_name}")
             return True
             
         except Exception as e:
-            print(f"❌ Error in dropdown menu navigation: {e}")
+            logger.error(f"❌ Error in dropdown menu navigation: {e}")
             return False
     
     async def _debug_dropdown_menu(self):
         """Debug helper to show available dropdown menu items"""
         try:
-            print("🔍 DEBUG: Available dropdown menu items:")
+            logger.info("🔍 DEBUG: Available dropdown menu items:")
             
             # Look for various menu item selectors
             menu_selectors = [
@@ -137,12 +140,12 @@ class CategoryNavigator:
                 try:
                     elements = await self.page.query_selector_all(selector)
                     if elements:
-                        print(f"  📋 Found {len(elements)} items with selector '{selector}':")
+                        logger.info(f"  📋 Found {len(elements)} items with selector '{selector}':")
                         for i, element in enumerate(elements[:10]):  # Show first 10
                             try:
                                 text = await element.inner_text()
                                 if text.strip():
-                                    print(f"    {i+1}: '{text.strip()}'")
+                                    logger.info(f"    {i+1}: '{text.strip()}'")
                             except:
                                 pass
                         break
@@ -150,12 +153,12 @@ class CategoryNavigator:
                     continue
                     
         except Exception as e:
-            print(f"⚠️ Error debugging dropdown menu: {e}")
+            logger.warning(f"⚠️ Error debugging dropdown menu: {e}")
     
     async def _select_by_direct_link(self, category_name: str) -> bool:
         """Try to select category by direct link click"""
         try:
-            print(f"🔗 Trying direct link for: {category_name}")
+            logger.info(f"🔗 Trying direct link for: {category_name}")
             
             # Look for direct category links
             category_selectors = [
@@ -169,19 +172,19 @@ class CategoryNavigator:
                 if element:
                     await element.click()
                     await self.page.wait_for_load_state("networkidle")
-                    print(f"✅ Selected category via direct link: {category_name}")
+                    logger.info(f"✅ Selected category via direct link: {category_name}")
                     return True
             
             return False
             
         except Exception as e:
-            print(f"⚠️ Direct link selection failed: {e}")
+            logger.warning(f"⚠️ Direct link selection failed: {e}")
             return False
     
     async def _select_by_menu_navigation(self, category_name: str) -> bool:
         """Try to select category through menu navigation"""
         try:
-            print(f"📋 Trying menu navigation for: {category_name}")
+            logger.info(f"📋 Trying menu navigation for: {category_name}")
             
             # Look for menu button or dropdown
             menu_selectors = [
@@ -207,19 +210,19 @@ class CategoryNavigator:
                 if category_link:
                     await category_link.click()
                     await self.page.wait_for_load_state("networkidle")
-                    print(f"✅ Selected category via menu: {category_name}")
+                    logger.info(f"✅ Selected category via menu: {category_name}")
                     return True
             
             return False
             
         except Exception as e:
-            print(f"⚠️ Menu navigation failed: {e}")
+            logger.warning(f"⚠️ Menu navigation failed: {e}")
             return False
     
     async def _select_by_search(self, category_name: str) -> bool:
         """Try to select category using search functionality"""
         try:
-            print(f"🔍 Trying search-based selection for: {category_name}")
+            logger.info(f"🔍 Trying search-based selection for: {category_name}")
             
             # Look for search input
             search_selectors = [
@@ -246,13 +249,13 @@ class CategoryNavigator:
                 if category_result:
                     await category_result.click()
                     await self.page.wait_for_load_state("networkidle")
-                    print(f"✅ Selected category via search: {category_name}")
+                    logger.info(f"✅ Selected category via search: {category_name}")
                     return True
             
             return False
             
         except Exception as e:
-            print(f"⚠️ Search-based selection failed: {e}")
+            logger.warning(f"⚠️ Search-based selection failed: {e}")
             return False
     
     async def get_current_category_url(self) -> str:
@@ -262,14 +265,14 @@ class CategoryNavigator:
     async def return_to_dashboard(self) -> bool:
         """Return to the main dashboard - not needed with dropdown navigation"""
         try:
-            print("🏠 Returning to dashboard...")
+            logger.info("🏠 Returning to dashboard...")
             # With dropdown navigation, we don't need to return to dashboard
             # The dropdown menu should always be available
             await self.page.wait_for_timeout(1000)
-            print("✅ Ready for next category selection")
+            logger.info("✅ Ready for next category selection")
             return True
         except Exception as e:
-            print(f"❌ Error in dashboard return: {e}")
+            logger.error(f"❌ Error in dashboard return: {e}")
             return False
     
     async def get_available_categories(self) -> List[str]:
@@ -288,33 +291,33 @@ class CategoryNavigator:
             return list(set(categories))  # Remove duplicates
             
         except Exception as e:
-            print(f"⚠️ Error getting available categories: {e}")
+            logger.warning(f"⚠️ Error getting available categories: {e}")
             return []
     
     async def debug_page_structure(self):
         """Debug helper to understand page structure"""
         try:
-            print("🔍 DEBUG: Analyzing page structure...")
+            logger.info("🔍 DEBUG: Analyzing page structure...")
             
             # Get page title
             title = await self.page.title()
-            print(f"Page Title: {title}")
+            logger.info(f"Page Title: {title}")
             
             # Get current URL
             url = self.page.url
-            print(f"Current URL: {url}")
+            logger.info(f"Current URL: {url}")
             
             # Look for common navigation elements
             nav_elements = await self.page.query_selector_all('nav, .navigation, .menu, [role="navigation"]')
-            print(f"Navigation elements found: {len(nav_elements)}")
+            logger.info(f"Navigation elements found: {len(nav_elements)}")
             
             # Look for category-related elements
             category_elements = await self.page.query_selector_all('[class*="category"], [data-id*="category"], a[href*="category"]')
-            print(f"Category-related elements found: {len(category_elements)}")
+            logger.info(f"Category-related elements found: {len(category_elements)}")
             
             # Get all links for analysis
             all_links = await self.page.query_selector_all('a[href]')
-            print(f"Total links found: {len(all_links)}")
+            logger.info(f"Total links found: {len(all_links)}")
             
             # Sample some link texts
             link_texts = []
@@ -324,9 +327,9 @@ class CategoryNavigator:
                 if text and text.strip():
                     link_texts.append(f"{text.strip()} -> {href}")
             
-            print("Sample links:")
+            logger.info("Sample links:")
             for link_text in link_texts:
-                print(f"  {link_text}")
+                logger.info(f"  {link_text}")
                 
         except Exception as e:
-            print(f"⚠️ Debug analysis failed: {e}")
+            logger.warning(f"⚠️ Debug analysis failed: {e}")
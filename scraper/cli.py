@@ -0,0 +1,449 @@
+"""
+Command line interface for the Sysco scraper
+One entry point with subcommands. Commands import what they need when they run, so
+the ones that never start a browser (diff, export, re-extract, report) skip Playwright
+
+    python -m scraper scrape --max-products 50
+    python -m scraper resume --queue output/work_queue.db
+    python -m scraper diff old.csv new.jsonl.gz -o changes.jsonl
+    python -m scraper export output/sysco_products.csv output/sysco_products.jsonl.gz
+    python -m scraper re-extract output/sysco_products.csv output/reparsed.csv
+    python -m scraper bench micro --sizes 1000
+    python -m scraper report compare --last 5
+"""
+
+import argparse
+import contextlib
+import logging
+import os
+import sys
+from importlib import import_module
+from typing import TYPE_CHECKING, List, Optional
+
+if TYPE_CHECKING:
+    from .models import ScrapingConfig
+
+logger = logging.getLogger(__name__)
+
+# Commands handed to another module's main(argv) with the rest of the command line
+DELEGATED = {
+    'diff': ('scraper.snapshot_diff', "Compare two snapshots and write a JSONL change feed"),
+    'report': ('scraper.run_report', "Run report trends across runs ('report compare')"),
+}
+
+# bench <name> -> benchmark module (the first one is the default)
+BENCHMARKS = {
+    'run': 'benchmarks.run',
+    'micro': 'benchmarks.micro',
+    'soak': 'benchmarks.soak',
+    'startup': 'benchmarks.startup',
+}
+
+
+# --- scrape / resume ------------------------------------------------------
+
+def add_scrape_arguments(parser: argparse.ArgumentParser):
+    """Scraping options (they override environment variables)"""
+    from .log import LOG_LEVELS
+    
+    parser.add_argument(
+        '--time-budget',
+        default=os.getenv('TIME_BUDGET'),
+        help="Fixed scraping window, e.g. 2400, 40m or 1h30m. Stops admitting new products "
+             "in time to finish in-flight work and export before the deadline"
+    )
+    parser.add_argument(
+        '--time-budget-reserve',
+        default=os.getenv('TIME_BUDGET_RESERVE', '30s'),
+        help="Part of the time budget kept free for flushing and export (default: 30s)"
+    )
+    parser.add_argument(
+        '--max-products',
+        type=int,
+        default=None,
+        help="Maximum number of products to scrape (0 = no limit)"
+    )
+    parser.add_argument(
+        '--queue',
+        default=os.getenv('WORK_QUEUE'),
+        help="Path to a shared SQLite work queue. Runs as a queue worker; start more workers "
+             "(other processes or hosts on a shared volume) to add capacity"
+    )
+    parser.add_argument(
+        '--worker-id',
+        default=os.getenv('WORKER_ID'),
+        help="Worker ID used for queue leases (default: host-pid-random)"
+    )
+    parser.add_argument(
+        '--rotate-mb',
+        type=float,
+        default=None,
+        help="Rotate the output CSV after this many megabytes"
+    )
+    parser.add_argument(
+        '--rotate-rows',
+        type=int,
+        default=None,
+        help="Rotate the output CSV after this many rows"
+    )
+    parser.add_argument(
+        '--parquet',
+        action='store_true',
+        default=os.getenv('PARQUET_EXPORT', 'False').lower() == 'true',
+        help="Also write partitioned Parquet (run_date/category) under <output>/parquet (needs pyarrow)"
+    )
+    parser.add_argument(
+        '--catalog-db',
+        default=os.getenv('CATALOG_DB'),
+        help="SQLite catalog to upsert products into by SKU (persists across runs)"
+    )
+    parser.add_argument(
+        '--jsonl',
+        choices=['gzip', 'zstd', 'none'],
+        default=os.getenv('JSONL_EXPORT'),
+        help="Also write nested JSON Lines (categories, provenance, timings) with this compression"
+    )
+    parser.add_argument(
+        '--stdout-ndjson',
+        action='store_true',
+        help="Stream records to stdout as NDJSON while scraping (log output goes to stderr, no CSV)"
+    )
+    parser.add_argument(
+        '--metrics-port',
+        type=int,
+        default=int(os.getenv('METRICS_PORT')) if os.getenv('METRICS_PORT') else None,
+        help="Serve Prometheus metrics on http://127.0.0.1:<port>/metrics while scraping"
+    )
+    parser.add_argument(
+        '--bandwidth-budget-mb',
+        type=float,
+        default=float(os.getenv('BANDWIDTH_BUDGET_MB')) if os.getenv('BANDWIDTH_BUDGET_MB') else None,
+        help="Network budget for the run. At 80%% heavy resources are blocked and descriptions are not "
+             "expanded; when spent, no new products are started"
+    )
+    parser.add_argument(
+        '--trace-sampling',
+        action='store_true',
+        default=os.getenv('TRACE_SAMPLING', 'False').lower() == 'true',
+        help="Keep Playwright traces of failed products and of products slower than --trace-percentile "
+             "(saved to <output>/traces, view with 'playwright show-trace')"
+    )
+    parser.add_argument(
+        '--trace-percentile',
+        type=float,
+        default=float(os.getenv('TRACE_PERCENTILE', '95')),
+        help="Latency percentile of healthy products above which a trace is kept (default 95)"
+    )
+    parser.add_argument(
+        '--trace-max-mb',
+        type=float,
+        default=float(os.getenv('TRACE_MAX_MB', '200')),
+        help="Disk budget for saved traces; the least interesting are evicted first (default 200)"
+    )
+    parser.add_argument(
+        '--profile-memory',
+        action='store_true',
+        default=os.getenv('PROFILE_MEMORY', 'False').lower() == 'true',
+        help="Take tracemalloc snapshots at phase boundaries and every --profile-memory-every products, "
+             "with browser RSS, and write <output>/memory_profile.json/.txt (slows the run down)"
+    )
+    parser.add_argument(
+        '--profile-memory-every',
+        type=int,
+        default=int(os.getenv('PROFILE_MEMORY_EVERY', '500')),
+        help="Products between memory checkpoints (0 = phase boundaries only, default 500)"
+    )
+    parser.add_argument(
+        '--profile-memory-frames',
+        type=int,
+        default=int(os.getenv('PROFILE_MEMORY_FRAMES', '1')),
+        help="Stack frames recorded per allocation; more frames give call paths in the report (default 1)"
+    )
+    parser.add_argument(
+        '--profile-cpu',
+        action='store_true',
+        default=os.getenv('PROFILE_CPU', 'False').lower() == 'true',
+        help="Sample the event loop and attribute wall/CPU time to phases, stages and coroutines; "
+             "writes <output>/profile/wall.folded, cpu.folded (flamegraph input) and summary.json"
+    )
+    parser.add_argument(
+        '--profile-cpu-interval-ms',
+        type=float,
+        default=float(os.getenv('PROFILE_CPU_INTERVAL_MS', '5')),
+        help="Sampling interval of the CPU profiler (default 5 ms)"
+    )
+    parser.add_argument(
+        '--rpc-accounting',
+        action='store_true',
+        default=os.getenv('RPC_ACCOUNTING', 'False').lower() == 'true',
+        help="Count and time every Playwright call by method and call site, per product, and list the "
+             "chattiest call sites at the end of the run"
+    )
+    parser.add_argument(
+        '--trace-spans',
+        action='store_true',
+        default=os.getenv('TRACE_SPANS', 'False').lower() == 'true',
+        help="Record per-product stage spans (navigation, readiness wait, extraction, formatting, sink write, "
+             "queue wait) per worker and write <output>/spans.trace.json for chrome://tracing or Perfetto"
+    )
+    parser.add_argument(
+        '--log-level',
+        choices=list(LOG_LEVELS),
+        default=os.getenv('LOG_LEVEL', 'quiet'),
+        help="quiet: progress line plus warnings/errors (default); info: run narrative; "
+             "debug: per-field extraction output"
+    )
+    parser.add_argument(
+        '--log-json',
+        action='store_true',
+        default=os.getenv('LOG_JSON', 'False').lower() == 'true',
+        help="Write log records as JSON lines (to stderr)"
+    )
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse the scraping options on their own (main_modular.py's command line)"""
+    parser = argparse.ArgumentParser(description="Sysco product scraper")
+    add_scrape_arguments(parser)
+    return parser.parse_args(argv)
+
+
+def load_config(args: Optional[argparse.Namespace] = None) -> 'ScrapingConfig':
+    """Load configuration from environment variables and command line options"""
+    from dotenv import load_dotenv
+    from .models import ScrapingConfig
+    from .time_budget import parse_duration
+    
+    load_dotenv()
+    if args is None:
+        args = parse_args([])
+    
+    config = ScrapingConfig(
+        zip_code=os.getenv('ZIP_CODE', '97035'),
+        base_url=os.getenv('BASE_URL', 'https://shop.sysco.com'),
+        headless=os.getenv('HEADLESS', 'False').lower() == 'true',
+        categories_to_scrape=[
+            "Meat & Seafood",
+            "Dairy & Eggs", 
+            "Canned & Dry"
+        ],
+        max_products=10,  # Set to 10 for testing, remove or increase for full scraping
+        output_dir=os.getenv('OUTPUT_DIR', 'output'),
+        output_file='sysco_products.csv'
+    )
+    
+    if args.max_products is not None:
+        config.max_products = args.max_products or None
+    config.export_rotate_mb = args.rotate_mb
+    config.export_rotate_rows = args.rotate_rows
+    config.enable_parquet_export = args.parquet
+    config.catalog_db_path = args.catalog_db
+    config.metrics_port = args.metrics_port
+    config.bandwidth_budget_mb = args.bandwidth_budget_mb
+    config.trace_sampling = args.trace_sampling
+    config.trace_percentile = args.trace_percentile
+    config.trace_max_mb = args.trace_max_mb
+    config.profile_memory = args.profile_memory
+    config.profile_memory_every = args.profile_memory_every
+    config.profile_memory_frames = max(1, args.profile_memory_frames)
+    config.profile_cpu = args.profile_cpu
+    config.profile_cpu_interval_ms = args.profile_cpu_interval_ms
+    config.rpc_accounting = args.rpc_accounting
+    config.span_tracing = args.trace_spans
+    config.log_level = args.log_level
+    config.log_json = args.log_json
+    if args.jsonl:
+        config.enable_jsonl_export = True
+        config.jsonl_compression = args.jsonl
+    if args.stdout_ndjson:
+        # Pipe mode: records go to stdout only, no intermediate file
+        config.stdout_ndjson = True
+        config.enable_streaming_export = False
+    if args.queue:
+        config.work_queue_path = args.queue
+        config.worker_id = args.worker_id
+        if args.max_products is None:
+            # Workers keep going until the shared queue is drained
+            config.max_products = None
+    if args.time_budget:
+        config.time_budget_seconds = parse_duration(args.time_budget)
+        config.time_budget_reserve_seconds = parse_duration(args.time_budget_reserve)
+        if args.max_products is None:
+            # The deadline decides how much gets scraped
+            config.max_products = None
+    
+    return config
+
+
+async def run_scrape(args: argparse.Namespace) -> bool:
+    """Run the scraper (or a queue worker) with the given options"""
+    from .log import setup_logging, shutdown_logging
+    from .main import SyscoScraperOrchestrator
+    
+    success = False
+    try:
+        # Load configuration
+        config = load_config(args)
+        setup_logging(config.log_level, config.log_json)
+        logger.info("=" * 60)
+        logger.info("🏪 SYSCO PRODUCT SCRAPER - MODULAR ARCHITECTURE")
+        logger.info("=" * 60)
+        logger.info("📋 Configuration loaded:")
+        logger.info(f"   • ZIP Code: {config.zip_code}")
+        logger.info(f"   • Headless: {config.headless}")
+        logger.info(f"   • Categories: {', '.join(config.categories_to_scrape)}")
+        logger.info(f"   • Max Products: {config.max_products}")
+        if config.time_budget_seconds:
+            logger.info(f"   • Time Budget: {config.time_budget_seconds:.0f}s")
+        logger.info(f"   • Output: {config.output_dir}/{config.output_file}")
+        
+        # Initialize and run scraper
+        orchestrator = SyscoScraperOrchestrator(config)
+        if config.work_queue_path:
+            success = await orchestrator.run_queue_worker()
+        else:
+            success = await orchestrator.run_scraper()
+        
+        # Drain queued log records before the summary so it comes last
+        shutdown_logging()
+        if success:
+            print("\n" + "=" * 60)
+            print("🎉 SCRAPING COMPLETED SUCCESSFULLY!")
+            print(f"📁 Results saved to: {orchestrator.get_output_path()}")
+            print(f"📊 Products scraped: {orchestrator.get_scraped_count()}")
+            print("=" * 60)
+        else:
+            print("\n" + "=" * 60)
+            print("❌ SCRAPING FAILED")
+            print("=" * 60)
+            
+    except KeyboardInterrupt:
+        print("\n⚠️ Scraping interrupted by user")
+    except Exception as e:
+        print(f"\n❌ Unexpected error: {e}")
+    finally:
+        shutdown_logging()
+    return success
+
+
+def scrape_command(args: argparse.Namespace) -> int:
+    import asyncio
+    
+    if args.stdout_ndjson:
+        # stdout carries the NDJSON records, so all other output goes to stderr
+        with contextlib.redirect_stdout(sys.stderr):
+            return 0 if asyncio.run(run_scrape(args)) else 1
+    return 0 if asyncio.run(run_scrape(args)) else 1
+
+
+def resume_command(args: argparse.Namespace) -> int:
+    """Continue an interrupted queue run: pending tasks are picked up, expired leases reclaimed"""
+    if not args.queue:
+        print("❌ resume needs the work queue of the interrupted run (--queue PATH or WORK_QUEUE)", file=sys.stderr)
+        return 2
+    if not os.path.exists(args.queue):
+        print(f"❌ No work queue at {args.queue}", file=sys.stderr)
+        return 2
+    from .work_queue import WorkQueue, EXPORT_CLAIM, STATUS_DONE, STATUS_FAILED, STATUS_LEASED, STATUS_PENDING
+    
+    queue = WorkQueue(args.queue)
+    try:
+        counts = {status: queue.count([status]) for status in (STATUS_PENDING, STATUS_LEASED, STATUS_DONE, STATUS_FAILED)}
+        exporter = None
+        if not counts[STATUS_PENDING] and not counts[STATUS_LEASED]:
+            # A finished (or abandoned) export claim of the earlier run would stop the re-export
+            exporter = queue.clear_claim(EXPORT_CLAIM)
+    finally:
+        queue.close()
+    print(f"🔁 Resuming {args.queue}: {counts[STATUS_PENDING]} pending, {counts[STATUS_LEASED]} leased "
+          f"(picked up once their lease expires), {counts[STATUS_DONE]} done, {counts[STATUS_FAILED]} failed",
+          file=sys.stderr)
+    if exporter:
+        print(f"❌ Worker {exporter} is still exporting this queue; resume once it is done", file=sys.stderr)
+        return 1
+    if not counts[STATUS_PENDING] and not counts[STATUS_LEASED] and counts[STATUS_DONE]:
+        print("✅ Nothing left to scrape; the worker only re-exports the results", file=sys.stderr)
+    return scrape_command(args)
+
+
+# --- Offline snapshot commands -------------------------------------------
+
+def add_output_arguments(parser: argparse.ArgumentParser):
+    parser.add_argument('source', help="Snapshot to read: CSV, JSONL (.gz/.zst) or a Parquet file/dataset directory")
+    parser.add_argument('target', help="File to write (for Parquet, the dataset directory)")
+    parser.add_argument('--to', choices=['csv', 'jsonl', 'parquet'],
+                        help="Output format (default: from the target's extension)")
+    parser.add_argument('--compression', choices=['gzip', 'zstd', 'none'], default='gzip',
+                        help="JSONL compression (default gzip)")
+
+
+def export_command(args: argparse.Namespace) -> int:
+    from .snapshots import convert
+    
+    stats = convert(args.source, args.target, args.to, args.compression)
+    print(f"📦 Exported {stats['written']} of {stats['read']} products to {', '.join(stats['paths'])}")
+    return 0 if stats['published'] else 1
+
+
+def reextract_command(args: argparse.Namespace) -> int:
+    from .snapshots import ReExtractor, convert
+    
+    extractor = ReExtractor(args.base_url)
+    stats = convert(args.source, args.target, args.to, args.compression, transform=extractor)
+    print(f"🔧 Re-extracted {stats['read']} products ({extractor.changed} changed), "
+          f"wrote {stats['written']} to {', '.join(stats['paths'])}")
+    return 0 if stats['published'] else 1
+
+
+# --- Entry point ----------------------------------------------------------
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m scraper", description="Sysco product scraper")
+    commands = parser.add_subparsers(dest='command', required=True, metavar='COMMAND')
+    
+    scrape = commands.add_parser('scrape', help="Scrape the catalog (or work a shared queue with --queue)")
+    add_scrape_arguments(scrape)
+    scrape.set_defaults(handler=scrape_command)
+    
+    resume = commands.add_parser('resume', help="Continue an interrupted queue run from its work queue")
+    add_scrape_arguments(resume)
+    resume.set_defaults(handler=resume_command)
+    
+    export = commands.add_parser('export', help="Convert a snapshot between CSV, JSONL and Parquet")
+    add_output_arguments(export)
+    export.set_defaults(handler=export_command)
+    
+    reextract = commands.add_parser('re-extract', help="Re-run field cleaning and pack/price parsing over a snapshot")
+    add_output_arguments(reextract)
+    reextract.add_argument('--base-url', default=os.getenv('BASE_URL', 'https://shop.sysco.com'),
+                           help="Site root relative URLs are resolved against")
+    reextract.set_defaults(handler=reextract_command)
+    
+    # Listed for --help; their arguments are parsed by the module they are handed to
+    for name, (_, help_text) in DELEGATED.items():
+        commands.add_parser(name, help=help_text, add_help=False)
+    commands.add_parser('bench', help=f"Benchmarks: bench [{'|'.join(BENCHMARKS)}] ... (default run)", add_help=False)
+    return parser
+
+
+def _delegate(module_name: str, command: str, argv: List[str]) -> int:
+    """Run another module's main(argv); its usage lines show the subcommand"""
+    sys.argv[0] = f"python -m scraper {command}"
+    return import_module(module_name).main(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    argv = sys.argv[1:] if argv is None else list(argv)
+    if argv and argv[0] in DELEGATED:
+        return _delegate(DELEGATED[argv[0]][0], argv[0], argv[1:])
+    if argv and argv[0] == 'bench':
+        rest = argv[1:]
+        name = rest.pop(0) if rest and rest[0] in BENCHMARKS else next(iter(BENCHMARKS))
+        return _delegate(BENCHMARKS[name], f"bench {name}", rest)
+    
+    args = build_parser().parse_args(argv)
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,262 @@
+"""
+Sampling CPU profiler for the Sysco scraper
+Samples the event-loop thread (and helper threads) from a background thread and
+attributes wall and CPU time to run phases, coroutines and pipeline stages, with
+folded-stack output for flamegraph.pl, speedscope or inferno
+"""
+
+import asyncio
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+from .models import ScrapingConfig
+
+logger = logging.getLogger(__name__)
+
+# Frames kept per sample (deeper stacks are cut at the root end)
+MAX_DEPTH = 96
+
+IDLE_STAGE = 'idle (awaiting I/O)'
+
+# Leaf-to-root, the first frame whose file matches decides the stage
+STAGE_RULES: List[Tuple[str, str]] = [
+    ('selectors.py', IDLE_STAGE),
+    ('/playwright/', 'playwright IPC'),
+    ('/logging/', 'logging'),
+    ('scraper/log.py', 'logging'),
+    ('scraper/data_formatter.py', 'formatting'),
+    ('scraper/parsing.py', 'formatting'),
+    ('scraper/urls.py', 'formatting'),
+    ('scraper/sinks/', 'export'),
+    ('scraper/csv_exporter.py', 'export'),
+    ('scraper/product_batch.py', 'export'),
+    ('scraper/metrics.py', 'metrics'),
+    ('scraper/extractors/', 'extraction'),
+    ('scraper/', 'orchestration'),
+    ('/asyncio/', 'event loop'),
+]
+
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _thread_cpu_clock(ident: int):
+    """Per-thread CPU clock id, or None where the platform has none"""
+    try:
+        return time.pthread_getcpuclockid(ident)
+    except (AttributeError, OSError):
+        return None
+
+
+class CPUProfiler:
+    """
+    Asyncio-aware sampling profiler
+
+    Every interval the sampler thread grabs all thread stacks. For the event-loop
+    thread the sample is tagged with the current phase (set by the orchestrator),
+    the coroutine of the running task and a pipeline stage derived from the innermost
+    recognised frame; wall time is the time since the previous sample and CPU time the
+    thread's CPU clock delta. Samples taken while the loop sits in select() are the
+    time spent awaiting the browser or network. Off by default; each sample holds
+    the GIL briefly, so longer intervals cost less.
+    """
+
+    def __init__(self, config: ScrapingConfig):
+        self.enabled = config.profile_cpu
+        self.interval = max(config.profile_cpu_interval_ms, 0.5) / 1000
+        self.directory = os.path.join(config.output_dir, "profile")
+
+        self.phase = "startup"
+        self.samples = 0
+        self.wall_stacks: Dict[str, float] = defaultdict(float)
+        self.cpu_stacks: Dict[str, float] = defaultdict(float)
+        self.stages: Dict[Tuple[str, str], List[float]] = defaultdict(lambda: [0.0, 0.0])
+        self.coroutines: Dict[str, List[float]] = defaultdict(lambda: [0.0, 0.0])
+        self.functions: Dict[str, float] = defaultdict(float)  # Leaf frame -> self CPU seconds
+        self.threads: Dict[str, float] = defaultdict(float)    # Thread name -> CPU seconds
+        self.unattributed_cpu = 0.0
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread: Optional[int] = None
+        self._labels: Dict[object, str] = {}
+        self._stages: Dict[object, Optional[str]] = {}
+        self._cpu_seen: Dict[int, float] = {}
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._started = 0.0
+
+    def start(self):
+        """Start sampling; call from the event loop that runs the orchestrator"""
+        if not self.enabled or self._thread is not None:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread = threading.get_ident()
+        self._started = time.perf_counter()
+        self._thread = threading.Thread(target=self._run, name="cpu-profiler", daemon=True)
+        self._thread.start()
+        logger.info(f"🔬 CPU profiling on (sampling every {self.interval * 1000:.1f} ms)")
+
+    def set_phase(self, phase: str):
+        """Label following samples with a run phase (browser_startup, scraping, ...)"""
+        self.phase = phase
+
+    # --- Sampling ---------------------------------------------------------
+
+    def _run(self):
+        last = time.perf_counter()
+        while not self._stop.wait(self.interval):
+            now = time.perf_counter()
+            try:
+                self._sample(now - last)
+            except Exception as e:  # A profiler must never take the run down
+                logger.debug(f"CPU profiler sample failed: {e}")
+            last = now
+
+    def _cpu_delta(self, ident: int) -> float:
+        clock = _thread_cpu_clock(ident)
+        if clock is None:
+            return 0.0
+        try:
+            now = time.clock_gettime(clock)
+        except OSError:
+            return 0.0  # Thread exited
+        previous = self._cpu_seen.get(ident, now)
+        self._cpu_seen[ident] = now
+        return max(now - previous, 0.0)
+
+    def _sample(self, wall: float):
+        frames = sys._current_frames()
+        own = threading.get_ident()
+        for thread in threading.enumerate():
+            if thread.ident == own or thread.ident not in frames:
+                continue
+            cpu = self._cpu_delta(thread.ident)
+            self.threads[thread.name] += cpu
+            stack = self._stack(frames[thread.ident])
+            if thread.ident == self._loop_thread:
+                self._record_loop_sample(stack, frames[thread.ident], wall, cpu)
+            elif cpu > 0:
+                # Helper threads (sink writers, log listener) only show up where they burn CPU
+                self.cpu_stacks[";".join([f"thread:{thread.name}"] + stack)] += cpu
+        self.samples += 1
+
+    def _record_loop_sample(self, stack: List[str], leaf, wall: float, cpu: float):
+        task = asyncio.current_task(self._loop) if self._loop else None
+        coroutine = "(no task)"
+        if task is not None:
+            coro = task.get_coro()
+            coroutine = getattr(coro, '__qualname__', None) or task.get_name()
+        stage = self._stage(leaf)
+        if stage == IDLE_STAGE:
+            # CPU burnt since the last sample belongs to whatever ran before the loop went idle
+            self.unattributed_cpu += cpu
+            cpu = 0.0
+
+        folded = ";".join([f"phase:{self.phase}", f"stage:{stage}", f"coro:{coroutine}"] + stack)
+        self.wall_stacks[folded] += wall
+        self.cpu_stacks[folded] += cpu
+        totals = self.stages[(self.phase, stage)]
+        totals[0] += wall
+        totals[1] += cpu
+        totals = self.coroutines[coroutine]
+        totals[0] += wall
+        totals[1] += cpu
+        if stack:
+            self.functions[stack[-1]] += cpu
+
+    def _label(self, code) -> str:
+        label = self._labels.get(code)
+        if label is None:
+            path = code.co_filename
+            if 'site-packages' + os.sep in path:
+                path = path.split('site-packages' + os.sep, 1)[1]
+            elif path.startswith(_ROOT + os.sep):
+                path = os.path.relpath(path, _ROOT)
+            else:
+                path = os.path.basename(path)
+            name = getattr(code, 'co_qualname', code.co_name)
+            label = f"{name} ({path}:{code.co_firstlineno})".replace(';', ',')
+            self._labels[code] = label
+        return label
+
+    def _stack(self, frame) -> List[str]:
+        """Root-to-leaf frame labels"""
+        labels = []
+        while frame is not None and len(labels) < MAX_DEPTH:
+            labels.append(self._label(frame.f_code))
+            frame = frame.f_back
+        labels.reverse()
+        return labels
+
+    def _stage(self, frame) -> str:
+        while frame is not None:
+            code = frame.f_code
+            if code not in self._stages:
+                path = code.co_filename.replace(os.sep, '/')
+                self._stages[code] = next((stage for marker, stage in STAGE_RULES if marker in path), None)
+            if self._stages[code]:
+                return self._stages[code]
+            frame = frame.f_back
+        return 'other'
+
+    # --- Results ----------------------------------------------------------
+
+    def stop(self) -> Optional[str]:
+        """Stop sampling and write the folded stacks and summary; returns the summary path"""
+        if self._thread is None:
+            return None
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+
+        os.makedirs(self.directory, exist_ok=True)
+        # Folded stacks weighted in microseconds: flamegraph.pl wall.folded > wall.svg
+        for name, stacks in (('wall.folded', self.wall_stacks), ('cpu.folded', self.cpu_stacks)):
+            with open(os.path.join(self.directory, name), 'w', encoding='utf-8') as f:
+                for stack, seconds in sorted(stacks.items()):
+                    weight = int(seconds * 1_000_000)
+                    if weight:
+                        f.write(f"{stack} {weight}\n")
+        path = os.path.join(self.directory, "summary.json")
+        summary = self.summary()
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(summary, f, indent=2)
+        self._log_summary(summary)
+        return path
+
+    def summary(self, top: int = 20) -> dict:
+        """Wall/CPU seconds by phase and stage, by coroutine, and the hottest functions"""
+        def rows(items, key_names):
+            ordered = sorted(items, key=lambda item: item[1][0], reverse=True)
+            return [dict(zip(key_names, key if isinstance(key, tuple) else (key,)),
+                         wall_seconds=round(wall, 3), cpu_seconds=round(cpu, 3))
+                    for key, (wall, cpu) in ordered]
+
+        stage_totals: Dict[str, List[float]] = defaultdict(lambda: [0.0, 0.0])
+        for (_, stage), (wall, cpu) in self.stages.items():
+            stage_totals[stage][0] += wall
+            stage_totals[stage][1] += cpu
+        hottest = sorted(self.functions.items(), key=lambda item: item[1], reverse=True)[:top]
+        return {
+            'samples': self.samples,
+            'interval_ms': round(self.interval * 1000, 2),
+            'profiled_seconds': round(time.perf_counter() - self._started, 3) if self._started else 0.0,
+            'cpu_clock': _thread_cpu_clock(threading.get_ident()) is not None,
+            'stages': rows(stage_totals.items(), ['stage']),
+            'phase_stages': rows(self.stages.items(), ['phase', 'stage']),
+            'coroutines': rows(self.coroutines.items(), ['coroutine'])[:top],
+            'hottest_functions': [{'function': name, 'self_cpu_seconds': round(cpu, 3)} for name, cpu in hottest],
+            'unattributed_cpu_seconds': round(self.unattributed_cpu, 3),
+            'thread_cpu_seconds': {name: round(cpu, 3) for name, cpu in self.threads.items()},
+        }
+
+    def _log_summary(self, summary: dict):
+        wall_total = sum(row['wall_seconds'] for row in summary['stages']) or 1.0
+        logger.info("🔬 Event-loop time by stage (wall / CPU):")
+        for row in summary['stages'][:8]:
+            logger.info(f"   • {row['stage']}: {row['wall_seconds']:.1f}s ({row['wall_seconds'] / wall_total:.0%}) "
+                        f"/ {row['cpu_seconds']:.1f}s CPU")
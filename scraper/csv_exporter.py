@@ -1,48 +1,61 @@
 import csv
+import logging
 import os
-from typing import List
+from typing import Iterable
 from .models import ProductData, ScrapingConfig
 
+logger = logging.getLogger(__name__)
+
+
+CSV_FIELDNAMES = [
+    'brand', 'product_name', 'packaging', 'sku',
+    'image_url', 'description', 'price', 'category', 'url',
+    'price_cents', 'pack_count', 'pack_unit_quantity', 'pack_unit', 'unit_price_cents'
+]
+
 
 class CSVExporter:
     """Handles CSV export of scraped product data"""
     
     def __init__(self, config: ScrapingConfig):
         self.config = config
-        self.fieldnames = [
-            'brand', 'product_name', 'packaging', 'sku', 
-            'image_url', 'description', 'price', 'category', 'url'
-        ]
+        self.fieldnames = CSV_FIELDNAMES
     
-    def export_products(self, products: List[ProductData]) -> bool:
+    def export_products(self, products: Iterable[ProductData]) -> bool:
         """Export products to CSV file"""
         try:
             # Create output directory if it doesn't exist
             os.makedirs(self.config.output_dir, exist_ok=True)
             
             if not products:
-                print("No products to save")
+                logger.info("No products to save")
                 return False
             
             # Convert products to dictionaries
             product_dicts = [product.to_dict() for product in products if product.is_valid()]
             
             if not product_dicts:
-                print("No valid products to save")
+                logger.info("No valid products to save")
                 return False
             
-            # Write to CSV
+            # Write to CSV via a temp file, so readers never see a partial export
             output_path = os.path.join(self.config.output_dir, self.config.output_file)
-            with open(output_path, 'w', newline='', encoding='utf-8') as csvfile:
-                writer = csv.DictWriter(csvfile, fieldnames=self.fieldnames)
-                writer.writeheader()
-                writer.writerows(product_dicts)
+            temp_path = f"{output_path}.{os.getpid()}.part"
+            try:
+                with open(temp_path, 'w', newline='', encoding='utf-8') as csvfile:
+                    writer = csv.DictWriter(csvfile, fieldnames=self.fieldnames)
+                    writer.writeheader()
+                    writer.writerows(product_dicts)
+                os.replace(temp_path, output_path)
+            finally:
+                if os.path.exists(temp_path):
+                    os.remove(temp_path)
             
-            print(f"Successfully saved {len(product_dicts)} products to {output_path}")
+            logger.info(f"Successfully saved {len(product_dicts)} products to {output_path}")
             return True
             
         except Exception as e:
-            print(f"Error exporting products to CSV: {e}")
+            logger.error(f"Error exporting products to CSV: {e}")
             return False
     
     def get_output_path(self) -> str:
@@ -3,13 +3,74 @@ Data formatting utilities for the Sysco scraper
 Handles cleaning and organizing product descriptions and other text fields
 """
 
+import asyncio
+import hashlib
+import os
 import re
-from typing import Dict, List
+import threading
+from collections import OrderedDict
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Dict, List, Optional, Sequence
+
+
+# Cleaners, compiled once at import
+WHITESPACE_RE = re.compile(r'\s+')
+BULLET_RE = re.compile(r'[•·▪▫◦‣⁃]\s*')
+REPEATED_DOTS_RE = re.compile(r'[.]{2,}')
+REPEATED_DASHES_RE = re.compile(r'[-]{2,}')
+SPACE_BEFORE_PUNCT_RE = re.compile(r'\s+([,.!?;:])')
+SPACE_AFTER_PUNCT_RE = re.compile(r'([,.!?;:])\s+')
+SENTENCE_SPLIT_RE = re.compile(r'[.!?]+')
+PRICE_RE = re.compile(r'\$[\d,]+\.?\d*')
+UNWANTED_CHARS_RE = re.compile(r'[^\w\s\-.,!?()&/$€£¥°À-ÖØ-öø-ÿ]', re.UNICODE)
+
+# Section keywords in priority order: a sentence goes to the first section with a match.
+# Keywords match as substrings (e.g. 'cut' matches 'cutlet'), like the original any(... in ...) scans
+SECTION_KEYWORDS = [
+    ('COOKING_INSTRUCTIONS', ['cook', 'bake', 'fry', 'grill', 'heat', 'temperature',
+                              'oven', 'microwave', 'preparation', 'serve']),
+    ('SPECIFICATIONS', ['weight', 'size', 'count', 'piece', 'lb', 'oz', 'gram',
+                        'dimension', 'pack', 'case', 'unit']),
+    ('FEATURES', ['feature', 'benefit', 'quality', 'fresh', 'premium',
+                  'natural', 'organic', 'grade', 'cut', 'style']),
+]
+
+# One compiled alternation per section, so each sentence costs at most three regex scans
+SECTION_PATTERNS = [
+    (section, re.compile('|'.join(re.escape(keyword) for keyword in sorted(keywords, key=len, reverse=True))))
+    for section, keywords in SECTION_KEYWORDS
+]
+
+DEFAULT_CACHE_SIZE = 4096
+
+
+# Per-process formatter used by pool workers (keeps its cache between chunks)
+_worker_formatter: Optional['DataFormatter'] = None
+
+
+def _format_chunk(descriptions: List[str]) -> List[str]:
+    """Process pool worker: format a chunk of descriptions"""
+    global _worker_formatter
+    if _worker_formatter is None:
+        _worker_formatter = DataFormatter()
+    return [_worker_formatter.format_description(text) for text in descriptions]
 
 
 class DataFormatter:
     """Handles formatting and cleaning of scraped data"""
-    
+
+    def __init__(self, cache_size: int = DEFAULT_CACHE_SIZE):
+        # Descriptions repeat heavily across products, so formatted output is memoized
+        # by a digest of the raw text (keys stay small even for long descriptions)
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[bytes, str]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self.cache_hits = 0
+        self.cache_misses = 0
+        # Process pool for large batches, started on first use and reused until close()
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._pool_lock = threading.Lock()
+
     def format_description(self, raw_description: str) -> str:
         """
         Format and organize product description into readable sections
@@ -22,7 +83,16 @@ class DataFormatter:
         """
         if not raw_description or not raw_description.strip():
             return ""
-        
+
+        cached = self._cached(raw_description)
+        if cached is not None:
+            return cached
+
+        formatted = self._format_uncached(raw_description)
+        self._store(raw_description, formatted)
+        return formatted
+
+    def _format_uncached(self, raw_description: str) -> str:
         # Clean the raw text
         cleaned_text = self._clean_raw_text(raw_description)
         
@@ -31,22 +101,107 @@ class DataFormatter:
         
         # Format the final output
         return self._format_sections(sections)
-    
+
+    def format_descriptions_batch(self, descriptions: Sequence[str], workers: Optional[int] = None,
+                                  chunk_size: int = 256, executor: Optional[Executor] = None) -> List[str]:
+        """
+        Format many descriptions at once, spreading unique texts over a process pool
+
+        Duplicates and cached texts are resolved locally; only the remaining unique
+        descriptions are shipped to worker processes. Small batches run inline.
+
+        Args:
+            descriptions: Raw description texts
+            workers: Pool size when the formatter's pool is started (default: CPU count)
+            chunk_size: Descriptions per task sent to a worker
+            executor: Process pool to use instead of the formatter's own
+
+        Returns:
+            Formatted descriptions in input order
+        """
+        pending: Dict[str, Optional[str]] = {}
+        for text in descriptions:
+            if text not in pending:
+                pending[text] = self._cached(text)
+
+        todo = [text for text, formatted in pending.items() if formatted is None]
+        if len(todo) <= chunk_size:
+            for text in todo:
+                pending[text] = self.format_description(text)
+        else:
+            chunks = [todo[i:i + chunk_size] for i in range(0, len(todo), chunk_size)]
+            executor = executor or self._get_pool(workers)
+            for chunk, results in zip(chunks, executor.map(_format_chunk, chunks)):
+                for text, formatted in zip(chunk, results):
+                    pending[text] = formatted
+                    self._store(text, formatted)
+
+        return [pending[text] for text in descriptions]
+
+    async def format_descriptions_async(self, descriptions: Sequence[str], workers: Optional[int] = None,
+                                        chunk_size: int = 256) -> List[str]:
+        """Batch-format off the event loop (the pool is driven from a worker thread)"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            None, lambda: self.format_descriptions_batch(descriptions, workers, chunk_size)
+        )
+
+    def _get_pool(self, workers: Optional[int] = None) -> ProcessPoolExecutor:
+        with self._pool_lock:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(max_workers=workers or os.cpu_count() or 1)
+            return self._pool
+
+    def close(self):
+        """Stop the worker processes (a later large batch starts a new pool)"""
+        with self._pool_lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown()
+
+    @staticmethod
+    def _cache_key(raw_description: str) -> bytes:
+        return hashlib.blake2b(raw_description.encode('utf-8'), digest_size=16).digest()
+
+    def _cached(self, raw_description: str) -> Optional[str]:
+        """Cached formatted text, without computing it on a miss"""
+        if not raw_description or not raw_description.strip():
+            return ""
+        if not self.cache_size:
+            return None
+        key = self._cache_key(raw_description)
+        with self._cache_lock:
+            cached = self._cache.get(key)
+            if cached is not None:
+                self._cache.move_to_end(key)
+                self.cache_hits += 1
+            return cached
+
+    def _store(self, raw_description: str, formatted: str):
+        if not self.cache_size:
+            return
+        key = self._cache_key(raw_description)
+        with self._cache_lock:
+            self.cache_misses += 1
+            self._cache[key] = formatted
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
     def _clean_raw_text(self, text: str) -> str:
         """Clean raw text by removing unwanted characters and formatting"""
         # Remove excessive whitespace and newlines
-        text = re.sub(r'\s+', ' ', text)
+        text = WHITESPACE_RE.sub(' ', text)
         
         # Remove bullet points and list markers
-        text = re.sub(r'[•·▪▫◦‣⁃]\s*', '', text)
+        text = BULLET_RE.sub('', text)
         
         # Remove excessive punctuation
-        text = re.sub(r'[.]{2,}', '.', text)
-        text = re.sub(r'[-]{2,}', '-', text)
+        text = REPEATED_DOTS_RE.sub('.', text)
+        text = REPEATED_DASHES_RE.sub('-', text)
         
         # Clean up spacing around punctuation
-        text = re.sub(r'\s+([,.!?;:])', r'\1', text)
-        text = re.sub(r'([,.!?;:])\s+', r'\1 ', text)
+        text = SPACE_BEFORE_PUNCT_RE.sub(r'\1', text)
+        text = SPACE_AFTER_PUNCT_RE.sub(r'\1 ', text)
         
         return text.strip()
     
@@ -60,31 +215,17 @@ class DataFormatter:
         }
         
         # Split text into sentences
-        sentences = re.split(r'[.!?]+', text)
+        sentences = SENTENCE_SPLIT_RE.split(text)
         sentences = [s.strip() for s in sentences if s.strip()]
         
         for sentence in sentences:
             sentence_lower = sentence.lower()
             
-            # Categorize sentences based on keywords
-            if any(keyword in sentence_lower for keyword in [
-                'cook', 'bake', 'fry', 'grill', 'heat', 'temperature', 
-                'oven', 'microwave', 'preparation', 'serve'
-            ]):
-                sections['COOKING_INSTRUCTIONS'] += sentence + '. '
-                
-            elif any(keyword in sentence_lower for keyword in [
-                'weight', 'size', 'count', 'piece', 'lb', 'oz', 'gram',
-                'dimension', 'pack', 'case', 'unit'
-            ]):
-                sections['SPECIFICATIONS'] += sentence + '. '
-                
-            elif any(keyword in sentence_lower for keyword in [
-                'feature', 'benefit', 'quality', 'fresh', 'premium',
-                'natural', 'organic', 'grade', 'cut', 'style'
-            ]):
-                sections['FEATURES'] += sentence + '. '
-                
+            # Categorize sentences based on keywords (first matching section wins)
+            for section, pattern in SECTION_PATTERNS:
+                if pattern.search(sentence_lower):
+                    sections[section] += sentence + '. '
+                    break
             else:
                 # Default to product description
                 sections['PRODUCT'] += sentence + '. '
@@ -138,10 +279,10 @@ class DataFormatter:
             return ""
         
         # Remove extra whitespace
-        price_text = re.sub(r'\s+', ' ', price_text.strip())
+        price_text = WHITESPACE_RE.sub(' ', price_text.strip())
         
         # Extract price pattern (e.g., "$12.99", "$1,234.56")
-        price_match = re.search(r'\$[\d,]+\.?\d*', price_text)
+        price_match = PRICE_RE.search(price_text)
         if price_match:
             return price_match.group()
         
@@ -153,10 +294,10 @@ class DataFormatter:
             return ""
         
         # Remove excessive whitespace
-        text = re.sub(r'\s+', ' ', text.strip())
+        text = WHITESPACE_RE.sub(' ', text.strip())
         
         # Remove common unwanted characters
         # Allow common characters, including unicode letters for different languages
-        text = re.sub(r'[^\w\s\-.,!?()&/$€£¥°À-ÖØ-öø-ÿ]', '', text, flags=re.UNICODE)
+        text = UNWANTED_CHARS_RE.sub('', text)
         
         return text
@@ -4,8 +4,12 @@ Handles pagination and URL collection from category pages
 """
 
 import asyncio
+import logging
 from typing import List
 from playwright.async_api import Page
+from ..urls import canonicalize_url, is_product_link
+
+logger = logging.getLogger(__name__)
 
 
 class CategoryExtractor:
@@ -27,19 +31,19 @@ class CategoryExtractor:
         product_urls = []
         
         try:
-            print(f"📂 Scraping products from category: {category_url}")
+            logger.debug(f"📂 Scraping products from category: {category_url}")
             # 🚀 PERFORMANCE OPTIMIZATION: Use faster wait strategy
             import time
             start_time = time.time()
             await self.page.goto(category_url, wait_until="domcontentloaded", timeout=15000)
             load_time = time.time() - start_time
-            print(f"⚡ Category page loaded in {load_time:.2f}s")
+            logger.debug(f"⚡ Category page loaded in {load_time:.2f}s")
             
             page_num = 1
             max_pages = 10  # Limit to prevent infinite loops
             
             while page_num <= max_pages:
-                print(f"📄 Processing page {page_num}...")
+                logger.debug(f"📄 Processing page {page_num}...")
                 
                 # 🚀 PERFORMANCE OPTIMIZATION: Reduced wait time
                 await self.page.wait_for_timeout(1000)
@@ -52,21 +56,21 @@ class CategoryExtractor:
                 page_products = await self.extract_product_links_from_current_page()
                 product_urls.extend(page_products)
                 
-                print(f"✅ Found {len(page_products)} products on page {page_num}")
+                logger.debug(f"✅ Found {len(page_products)} products on page {page_num}")
                 
                 # Try to go to next page
                 if not await self.navigate_to_next_page():
-                    print("📄 No more pages found")
+                    logger.debug("📄 No more pages found")
                     break
                 
                 page_num += 1
                 await self.page.wait_for_timeout(1000)  # Reduced wait between pages
             
-            print(f"📊 Total products found in category: {len(product_urls)}")
+            logger.debug(f"📊 Total products found in category: {len(product_urls)}")
             return list(set(product_urls))  # Remove duplicates
             
         except Exception as e:
-            print(f"❌ Error scraping category products: {e}")
+            logger.error(f"❌ Error scraping category products: {e}")
             return product_urls
     
     async def extract_product_links_from_current_page(self) -> List[str]:
@@ -97,32 +101,29 @@ class CategoryExtractor:
                 try:
                     elements = await self.page.query_selector_all(selector)
                     if elements:
-                        print(f"  🔍 Selector '{selector}' found {len(elements)} elements")
+                        logger.debug(f"  🔍 Selector '{selector}' found {len(elements)} elements")
                     for element in elements:
                         href = await element.get_attribute('href')
-                        if href and ('/product/' in href or '/item/' in href or '/detail/' in href or '/p/' in href or '/app/catalog' in href):
-                            # Convert relative URLs to absolute (from original scraper)
-                            if href.startswith('/'):
-                                full_url = f"https://shop.sysco.com{href}"
-                            else:
-                                full_url = href
+                        if href and is_product_link(href):
+                            # Convert relative URLs to absolute against the page's own origin
+                            full_url = canonicalize_url(href, self.page.url)
                             page_products.add(full_url)
                             if len(page_products) <= 3:  # Debug first few URLs
-                                print(f"    ✅ Added product URL: {full_url}")
+                                logger.debug(f"    ✅ Added product URL: {full_url}")
                 except Exception as e:
                     continue
             
             # Debug: If no products found, analyze the page (from original scraper)
             if len(page_products) == 0:
-                print("🔍 DEBUG: No products found, analyzing page content...")
+                logger.debug("🔍 DEBUG: No products found, analyzing page content...")
                 
                 # Check if page title suggests we need to log in or enter zip
                 title = await self.page.title()
-                print(f"  📄 Page title: {title}")
+                logger.debug(f"  📄 Page title: {title}")
                 
                 # Look for any links on the page
                 all_links = await self.page.query_selector_all('a')
-                print(f"  🔗 Total links on page: {len(all_links)}")
+                logger.debug(f"  🔗 Total links on page: {len(all_links)}")
                 
                 # Check for specific content that might indicate issues
                 content_checks = [
@@ -137,26 +138,26 @@ class CategoryExtractor:
                     try:
                         elements = await self.page.query_selector_all(selector)
                         if elements:
-                            print(f"  ⚠️ Found {len(elements)} elements with '{check_name}' text")
+                            logger.debug(f"  ⚠️ Found {len(elements)} elements with '{check_name}' text")
                     except:
                         pass
                 
                 # Sample some link hrefs to understand page structure
                 sample_links = all_links[:10]
-                print("  🔗 Sample link hrefs:")
+                logger.debug("  🔗 Sample link hrefs:")
                 for i, link in enumerate(sample_links):
                     try:
                         href = await link.get_attribute('href')
                         text = await link.inner_text()
                         if href:
-                            print(f"    {i}: {href[:80]} | Text: {text[:30]}")
+                            logger.debug(f"    {i}: {href[:80]} | Text: {text[:30]}")
                     except:
                         pass
             
             return list(page_products)
             
         except Exception as e:
-            print(f"❌ Error extracting product links: {e}")
+            logger.error(f"❌ Error extracting product links: {e}")
             return []
     
     async def navigate_to_next_page(self) -> bool:
@@ -187,5 +188,5 @@ class CategoryExtractor:
             return False
             
         except Exception as e:
-            print(f"⚠️ Error navigating to next page: {e}")
+            logger.warning(f"⚠️ Error navigating to next page: {e}")
             return False
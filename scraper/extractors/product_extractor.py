@@ -3,18 +3,25 @@ Individual product data extraction functionality
 Handles extraction of specific product fields from product pages
 """
 
-from typing import Dict, Any
+import logging
+import time
+from typing import Dict, Optional
 from playwright.async_api import Page
 from ..models import ProductData
 from ..data_formatter import DataFormatter
+from ..network_accounting import NetworkAccounting
+from .. import spans
+
+logger = logging.getLogger(__name__)
 
 
 class ProductExtractor:
     """Handles extraction of individual product data fields"""
     
-    def __init__(self, page: Page):
+    def __init__(self, page: Page, network: Optional[NetworkAccounting] = None):
         self.page = page
         self.formatter = DataFormatter()
+        self.network = network  # Bandwidth budget: skips 'Read More' expansion when demoted
     
     async def extract_all_fields(self, product_url: str, category: str) -> ProductData:
         """
@@ -27,70 +34,76 @@ class ProductExtractor:
             ProductData object with extracted information
         """
         try:
-            print(f"🔍 Navigating to product: {product_url}")
+            logger.debug("🔍 Navigating to product: %s", product_url)
             # 🚀 PERFORMANCE OPTIMIZATION: Use faster wait strategy
-            import time
             start_time = time.time()
-            await self.page.goto(product_url, wait_until="domcontentloaded", timeout=15000)
+            with spans.span('navigation'):
+                await self.page.goto(product_url, wait_until="domcontentloaded", timeout=15000)
             load_time = time.time() - start_time
-            print(f"⚡ Product page loaded in {load_time:.2f}s")
+            logger.debug("⚡ Product page loaded in %.2fs", load_time)
             
             # Wait for content to load (longer wait for dynamic content)
-            await self.page.wait_for_timeout(3000)
+            wait_start_time = time.time()
+            with spans.span('readiness_wait'):
+                await self.page.wait_for_timeout(3000)
+            wait_time = time.time() - wait_start_time
             
             # Extract all product fields
             product_data = ProductData(url=product_url)
+            # Selector each field was extracted with; per call, since concurrent products share the extractor
+            sources: Dict[str, str] = {}
+            extraction_start_time = time.time()
             
             # Extract each field with debugging
-            print("  🔍 Extracting product fields...")
-            product_data.brand = await self.extract_brand()
-            print(f"    🏷️ Brand: '{product_data.brand}'")
-            
-            product_data.product_name = await self.extract_product_name()
-            print(f"    📝 Name: '{product_data.product_name}'")
-            
-            product_data.packaging = await self.extract_packaging()
-            print(f"    📦 Packaging: '{product_data.packaging}'")
-            
-            product_data.sku = await self.extract_sku()
-            print(f"    🔢 SKU: '{product_data.sku}'")
-            
-            product_data.image_url = await self.extract_image_url()
-            print(f"    🖼️ Image: '{product_data.image_url[:50] if product_data.image_url else ""}'")
-            
-            product_data.description = await self.extract_description()
-            print(f"    📝 Description: '{product_data.description[:50] if product_data.description else ""}'")
-            
-            product_data.price = await self.extract_price()
-            print(f"    💰 Price: '{product_data.price}'")
-            
+            with spans.span('extraction'):
+                product_data.brand = await self.extract_brand(sources)
+                product_data.product_name = await self.extract_product_name(sources)
+                product_data.packaging = await self.extract_packaging(sources)
+                product_data.sku = await self.extract_sku(sources)
+                product_data.image_url = await self.extract_image_url(sources)
+                product_data.description = await self.extract_description(sources)
+                product_data.price = await self.extract_price(sources)
+            
+            # Typed pack/price fields are parsed per batch before export (ProductBatch.parse_fields)
             product_data.category = category
-            
-            # Check if we have minimum required data
-            has_required_data = bool(product_data.product_name or product_data.brand or product_data.sku)
-            print(f"  📊 Has required data: {has_required_data}")
-            
-            # Validate extracted fields
-            if not product_data.product_name:
-                print("  ⚠️ No product name found")
-            if not product_data.brand:
-                print("  ⚠️ No brand found")
-            if not product_data.sku:
-                print("  ⚠️ No SKU found")
-            if not product_data.image_url:
-                print("  ⚠️ No image URL found")
-            if not product_data.description:
-                print("  ⚠️ No description found")
-            if not product_data.price:
-                print("  ⚠️ No price found")
+            product_data.intern_strings()
+            product_data.field_sources = sources
+            product_data.timings = {
+                'navigation': load_time,
+                'readiness_wait': wait_time,
+                'extraction': time.time() - extraction_start_time,
+            }
+            
+            # Per-field output is only built when debug logging is on
+            if logger.isEnabledFor(logging.DEBUG):
+                self._log_fields(product_data)
             
             return product_data
             
         except Exception as e:
-            print(f"❌ Error scraping product {product_url}: {e}")
+            logger.error(f"❌ Error scraping product {product_url}: {e}")
             return ProductData(url=product_url)
-    
-    async def extract_brand(self) -> str:
+
+    @staticmethod
+    def _record_source(sources: Optional[Dict[str, str]], name: str, selector: str):
+        if sources is not None:
+            sources[name] = selector
+
+    @staticmethod
+    def _log_fields(product_data: ProductData):
+        """Debug output of the extracted fields and the ones that are missing"""
+        logger.debug("    🏷️ Brand: '%s'", product_data.brand)
+        logger.debug("    📝 Name: '%s'", product_data.product_name)
+        logger.debug("    📦 Packaging: '%s'", product_data.packaging)
+        logger.debug("    🔢 SKU: '%s'", product_data.sku)
+        logger.debug("    🖼️ Image: '%s'", product_data.image_url[:50])
+        logger.debug("    📝 Description: '%s'", product_data.description[:50])
+        logger.debug("    💰 Price: '%s'", product_data.price)
+        for name in ('product_name', 'brand', 'sku', 'image_url', 'description', 'price'):
+            if not getattr(product_data, name):
+                logger.debug("  ⚠️ No %s found", name)
+
+    async def extract_brand(self, sources: Optional[Dict[str, str]] = None) -> str:
         """Extract brand from product page"""
         try:
             # Updated selectors based on actual HTML structure
@@ -107,13 +120,14 @@ class ProductExtractor:
                 if brand_element:
                     brand_text = await brand_element.inner_text()
                     if brand_text and brand_text.strip():
+                        self._record_source(sources, 'brand', selector)
                         return self.formatter.clean_text_field(brand_text)
                         
         except Exception as e:
-            print(f"⚠️ Error extracting brand: {e}")
+            logger.warning(f"⚠️ Error extracting brand: {e}")
         return ""
     
-    async def extract_product_name(self) -> str:
+    async def extract_product_name(self, sources: Optional[Dict[str, str]] = None) -> str:
         """Extract product name"""
         try:
             # Updated selectors based on actual HTML structure
@@ -132,24 +146,26 @@ class ProductExtractor:
                 if name_element:
                     name_text = await name_element.inner_text()
                     if name_text and name_text.strip():
+                        self._record_source(sources, 'product_name', selector)
                         return self.formatter.clean_text_field(name_text)
                     
         except Exception as e:
-            print(f"⚠️ Error extracting product name: {e}")
+            logger.warning(f"⚠️ Error extracting product name: {e}")
         return ""
     
-    async def extract_packaging(self) -> str:
+    async def extract_packaging(self, sources: Optional[Dict[str, str]] = None) -> str:
         """Extract packaging information"""
         try:
             packaging_element = await self.page.query_selector('div[data-id="pack_size"]')
             if packaging_element:
                 packaging_text = await packaging_element.inner_text()
+                self._record_source(sources, 'packaging', 'div[data-id="pack_size"]')
                 return self.formatter.clean_text_field(packaging_text)
         except Exception as e:
-            print(f"⚠️ Error extracting packaging: {e}")
+            logger.warning(f"⚠️ Error extracting packaging: {e}")
         return ""
     
-    async def extract_sku(self) -> str:
+    async def extract_sku(self, sources: Optional[Dict[str, str]] = None) -> str:
         """Extract SKU/Product ID"""
         try:
             # Updated selectors for SKU extraction
@@ -168,13 +184,14 @@ class ProductExtractor:
                 if sku_element:
                     sku_text = await sku_element.inner_text()
                     if sku_text and sku_text.strip():
+                        self._record_source(sources, 'sku', selector)
                         return self.formatter.clean_text_field(sku_text)
                         
         except Exception as e:
-            print(f"⚠️ Error extracting SKU: {e}")
+            logger.warning(f"⚠️ Error extracting SKU: {e}")
         return ""
     
-    async def extract_image_url(self) -> str:
+    async def extract_image_url(self, sources: Optional[Dict[str, str]] = None) -> str:
         """Extract main product image URL"""
         try:
             # Updated selectors for product image
@@ -193,20 +210,25 @@ class ProductExtractor:
                 if img_element:
                     img_src = await img_element.get_attribute('src')
                     if img_src and img_src.strip():
+                        self._record_source(sources, 'image_url', selector)
                         return img_src.strip()
                         
         except Exception as e:
-            print(f"⚠️ Error extracting image URL: {e}")
+            logger.warning(f"⚠️ Error extracting image URL: {e}")
         return ""
     
-    async def extract_description(self) -> str:
-        """Extract product description with Read More handling"""
+    async def extract_description(self, sources: Optional[Dict[str, str]] = None) -> str:
+        """Extract the raw product description with Read More handling (formatted later, per batch)"""
         try:
             # First check if "Read More" button exists
             read_more_button = await self.page.query_selector('button[data-id="ellipsis-read-more-button"]')
             
+            if read_more_button and self.network and not self.network.allow_expansion():
+                logger.debug("📉 Bandwidth budget low, keeping the collapsed description")
+                read_more_button = None
+            
             if read_more_button:
-                print("📖 Found 'Read More' button, clicking to expand...")
+                logger.debug("📖 Found 'Read More' button, clicking to expand...")
                 await read_more_button.click()
                 await self.page.wait_for_timeout(1000)  # Reduced wait time for expansion
                 
@@ -214,31 +236,32 @@ class ProductExtractor:
                 desc_element = await self.page.query_selector('.description-detail-wrapper')
                 if desc_element:
                     description_text = await desc_element.inner_text()
-                    print(f"✅ Extracted expanded description ({len(description_text)} chars)")
+                    self._record_source(sources, 'description', '.description-detail-wrapper')
+                    logger.debug("✅ Extracted expanded description (%d chars)", len(description_text))
                 else:
-                    print("⚠️ Could not find expanded description content")
+                    logger.warning("⚠️ Could not find expanded description content")
                     description_text = ""
             else:
                 # No "Read More" button, extract from default description container
                 desc_element = await self.page.query_selector('div[data-id="product_description_text"]')
                 if desc_element:
                     description_text = await desc_element.inner_text()
-                    print(f"✅ Extracted standard description ({len(description_text)} chars)")
+                    self._record_source(sources, 'description', 'div[data-id="product_description_text"]')
+                    logger.debug("✅ Extracted standard description (%d chars)", len(description_text))
                 else:
                     description_text = ""
             
-            # Format the description using our formatter
-            if description_text:
-                formatted_description = self.formatter.format_description(description_text)
-                print(f"📝 Formatted description ({len(formatted_description)} chars)")
-                return formatted_description
+            # Raw text: descriptions are formatted per export batch, off the event loop
+            # (SinkManager.prepare / format_descriptions_async)
+            if description_text and description_text.strip():
+                return description_text
             
         except Exception as e:
-            print(f"❌ Error extracting description: {e}")
+            logger.error(f"❌ Error extracting description: {e}")
         
         return ""
     
-    async def extract_price(self) -> str:
+    async def extract_price(self, sources: Optional[Dict[str, str]] = None) -> str:
         """Extract price information with improved selectors"""
         try:
             # Updated price selectors based on inspection
@@ -259,40 +282,41 @@ class ProductExtractor:
                 if price_element:
                     price_text = await price_element.inner_text()
                     if price_text and price_text.strip():
+                        self._record_source(sources, 'price', selector)
                         return self.formatter.clean_text_field(price_text)
                     
         except Exception as e:
-            print(f"⚠️ Error extracting price: {e}")
+            logger.warning(f"⚠️ Error extracting price: {e}")
         return ""
     
     async def debug_product_page_structure(self):
         """Debug method to inspect the actual HTML structure of the product page"""
         try:
-            print("🔍 DEBUG: Inspecting product page structure...")
+            logger.debug("🔍 DEBUG: Inspecting product page structure...")
             
             # Get page title and URL
             title = await self.page.title()
             url = self.page.url
-            print(f"  📝 Page title: {title}")
-            print(f"  🔗 Page URL: {url}")
+            logger.debug(f"  📝 Page title: {title}")
+            logger.debug(f"  🔗 Page URL: {url}")
             
             # Check if page is actually loaded
             body = await self.page.query_selector('body')
             if not body:
-                print("  ❌ No body element found - page may not be loaded")
+                logger.error("  ❌ No body element found - page may not be loaded")
                 return
             
             # Get page content summary
             all_text = await self.page.evaluate('() => document.body.innerText')
-            print(f"  📝 Page content length: {len(all_text)} characters")
+            logger.debug(f"  📝 Page content length: {len(all_text)} characters")
             
             # Show first 200 characters of page content
             if all_text:
                 preview = all_text[:200].replace('\n', ' ').strip()
-                print(f"  🔍 Content preview: '{preview}...'")
+                logger.debug(f"  🔍 Content preview: '{preview}...'")
             
             # Look for ANY elements with common product-related text
-            print("  🔍 Looking for elements with product-related content:")
+            logger.debug("  🔍 Looking for elements with product-related content:")
             
             # Check for any elements containing numbers (potential SKUs/prices)
             try:
@@ -308,14 +332,14 @@ class ProductExtractor:
                     except:
                         pass
                 
-                print(f"  🔢 Found {len(number_elements)} elements with numbers:")
+                logger.debug(f"  🔢 Found {len(number_elements)} elements with numbers:")
                 for tag, cls, text in number_elements[:10]:  # Show first 10
-                    print(f"    {tag}.{cls}: '{text}'")
+                    logger.debug(f"    {tag}.{cls}: '{text}'")
             except Exception as e:
-                print(f"  ⚠️ Error analyzing number elements: {e}")
+                logger.warning(f"  ⚠️ Error analyzing number elements: {e}")
             
             # Look for common product page elements
-            print("  🔍 Looking for specific product elements:")
+            logger.debug("  🔍 Looking for specific product elements:")
             
             # Check for brand elements with more comprehensive search
             brand_candidates = [
@@ -332,13 +356,13 @@ class ProductExtractor:
                         for i, elem in enumerate(elements[:3]):  # Show first 3
                             text = await elem.inner_text()
                             if text and text.strip():
-                                print(f"    🏷️ Brand candidate '{selector}': '{text.strip()}'")
+                                logger.debug(f"    🏷️ Brand candidate '{selector}': '{text.strip()}'")
                                 brand_found = True
                 except:
                     pass
             
             if not brand_found:
-                print("    ⚠️ No brand elements found with standard selectors")
+                logger.debug("    ⚠️ No brand elements found with standard selectors")
             
             # Check for product name elements with more comprehensive search
             name_candidates = [
@@ -355,13 +379,13 @@ class ProductExtractor:
                         for i, elem in enumerate(elements[:3]):  # Show first 3
                             text = await elem.inner_text()
                             if text and text.strip() and len(text.strip()) > 3:
-                                print(f"    📝 Name candidate '{selector}': '{text.strip()}'")
+                                logger.debug(f"    📝 Name candidate '{selector}': '{text.strip()}'")
                                 name_found = True
                 except:
                     pass
             
             if not name_found:
-                print("    ⚠️ No product name elements found with standard selectors")
+                logger.debug("    ⚠️ No product name elements found with standard selectors")
             
             # Check for SKU elements
             sku_candidates = [
@@ -376,7 +400,7 @@ class ProductExtractor:
                         for i, elem in enumerate(elements[:3]):  # Show first 3
                             text = await elem.inner_text()
                             if text.strip():
-                                print(f"    🔢 SKU candidate '{selector}': '{text.strip()}'")
+                                logger.debug(f"    🔢 SKU candidate '{selector}': '{text.strip()}'")
                 except:
                     pass
             
@@ -393,7 +417,7 @@ class ProductExtractor:
                         for i, elem in enumerate(elements[:3]):  # Show first 3
                             text = await elem.inner_text()
                             if text.strip():
-                                print(f"    💰 Price candidate '{selector}': '{text.strip()}'")
+                                logger.debug(f"    💰 Price candidate '{selector}': '{text.strip()}'")
                 except:
                     pass
             
@@ -411,12 +435,12 @@ class ProductExtractor:
                             src = await elem.get_attribute('src')
                             alt = await elem.get_attribute('alt')
                             if src:
-                                print(f"    🖼️ Image candidate '{selector}': src='{src[:50]}...' alt='{alt}'")
+                                logger.debug(f"    🖼️ Image candidate '{selector}': src='{src[:50]}...' alt='{alt}'")
                 except:
                     pass
             
             # Final check: Look for ANY div or span elements with meaningful text
-            print("  🔍 Looking for ANY meaningful text elements:")
+            logger.debug("  🔍 Looking for ANY meaningful text elements:")
             try:
                 all_divs = await self.page.query_selector_all('div, span, p, h1, h2, h3')
                 meaningful_texts = []
@@ -430,21 +454,21 @@ class ProductExtractor:
                     except:
                         pass
                 
-                print(f"    📝 Found {len(meaningful_texts)} elements with meaningful text:")
+                logger.debug(f"    📝 Found {len(meaningful_texts)} elements with meaningful text:")
                 for tag, cls, text in meaningful_texts[:15]:  # Show first 15
-                    print(f"    {tag}.{cls}: '{text}'")
+                    logger.debug(f"    {tag}.{cls}: '{text}'")
                     
             except Exception as e:
-                print(f"    ⚠️ Error analyzing text elements: {e}")
+                logger.warning(f"    ⚠️ Error analyzing text elements: {e}")
             
-            print("  ✅ Product page structure inspection complete")
+            logger.debug("  ✅ Product page structure inspection complete")
             
         except Exception as e:
-            print(f"⚠️ Error inspecting product page structure: {e}")
+            logger.warning(f"⚠️ Error inspecting product page structure: {e}")
             # Try to get basic page info even if inspection fails
             try:
                 title = await self.page.title()
                 url = self.page.url
-                print(f"  🔗 Basic info - Title: {title}, URL: {url}")
+                logger.debug(f"  🔗 Basic info - Title: {title}, URL: {url}")
             except:
                 pass
@@ -0,0 +1,191 @@
+"""
+Logging setup for the Sysco scraper
+Leveled, optionally JSON-formatted logging written through a non-blocking queue,
+plus a single-line progress display for quiet runs
+"""
+
+import datetime
+import json
+import logging
+import logging.handlers
+import queue
+import sys
+import threading
+import time
+from typing import Optional, TextIO
+
+
+LOGGER_NAME = 'scraper'
+
+# Progress updates get their own level so they show in quiet mode without being warnings
+PROGRESS = 25
+logging.addLevelName(PROGRESS, 'PROGRESS')
+
+# quiet: warnings/errors plus the progress line; info: run narrative; debug: per-field output
+LOG_LEVELS = {
+    'quiet': logging.WARNING,
+    'info': logging.INFO,
+    'debug': logging.DEBUG,
+}
+
+# Attributes every LogRecord has; anything else came in through `extra=` and is emitted as a JSON field
+_RECORD_ATTRIBUTES = set(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {'message', 'asctime', 'taskName'}
+
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
+def get_logger(name: str) -> logging.Logger:
+    """Logger below the scraper's root logger ('scraper.main' etc.)"""
+    if name == LOGGER_NAME or name.startswith(LOGGER_NAME + '.'):
+        return logging.getLogger(name)
+    return logging.getLogger(f"{LOGGER_NAME}.{name}")
+
+
+class JSONFormatter(logging.Formatter):
+    """One JSON object per line: ts, level, logger, msg and any `extra=` fields"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            'ts': datetime.datetime.fromtimestamp(record.created, datetime.timezone.utc).isoformat(timespec='milliseconds'),
+            'level': record.levelname.lower(),
+            'logger': record.name,
+            'msg': record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRIBUTES and not key.startswith('_'):
+                entry[key] = value
+        if record.exc_info:
+            entry['exc'] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class ConsoleHandler(logging.StreamHandler):
+    """
+    Human-readable output that keeps a live progress line at the bottom
+
+    Progress records (extra={'progress': True}) redraw the line in place on a
+    terminal; other records clear it, print, and let the next update redraw it.
+    """
+
+    def __init__(self, stream: TextIO):
+        super().__init__(stream)
+        self.interactive = hasattr(stream, 'isatty') and stream.isatty()
+        self.progress_shown = False
+
+    def emit(self, record: logging.LogRecord):
+        try:
+            message = self.format(record)
+            if getattr(record, 'progress', False):
+                if self.interactive:
+                    self.stream.write('\r\033[K' + message)
+                    self.progress_shown = True
+                else:
+                    self.stream.write(message + '\n')
+            else:
+                if self.progress_shown:
+                    self.stream.write('\r\033[K')
+                    self.progress_shown = False
+                self.stream.write(message + '\n')
+            self.flush()
+        except Exception:
+            self.handleError(record)
+
+    def finish_progress(self):
+        if self.progress_shown:
+            self.stream.write('\n')
+            self.flush()
+            self.progress_shown = False
+
+
+def setup_logging(level: str = 'quiet', json_output: bool = False, stream: Optional[TextIO] = None):
+    """
+    Route all scraper logging through a queue to a background writer thread
+
+    Args:
+        level: 'quiet', 'info' or 'debug'
+        json_output: Emit JSON lines instead of plain text
+        stream: Destination (default: stderr, so stdout stays free for data)
+    """
+    global _listener
+    shutdown_logging()
+
+    stream = stream or sys.stderr
+    if json_output:
+        handler: logging.Handler = logging.StreamHandler(stream)
+        handler.setFormatter(JSONFormatter())
+    else:
+        handler = ConsoleHandler(stream)
+        handler.setFormatter(logging.Formatter('%(message)s'))
+
+    threshold = LOG_LEVELS.get(level, logging.WARNING)
+    logger = logging.getLogger(LOGGER_NAME)
+    logger.handlers.clear()
+    logger.setLevel(min(threshold, PROGRESS))
+    logger.propagate = False
+
+    # Callers only enqueue; formatting and I/O happen on the listener thread
+    records: "queue.SimpleQueue" = queue.SimpleQueue()
+    queue_handler = logging.handlers.QueueHandler(records)
+    queue_handler.addFilter(lambda record: record.levelno >= threshold or record.levelno == PROGRESS)
+    logger.addHandler(queue_handler)
+    _listener = logging.handlers.QueueListener(records, handler)
+    _listener.start()
+
+
+def shutdown_logging():
+    """Flush queued records and stop the writer thread"""
+    global _listener
+    if _listener is None:
+        return
+    _listener.stop()
+    for handler in _listener.handlers:
+        if isinstance(handler, ConsoleHandler):
+            handler.finish_progress()
+    _listener = None
+
+
+class ProgressReporter:
+    """Throttled single-line progress: done/total, rate, ETA and error count"""
+
+    def __init__(self, total: Optional[int] = None, interval: float = 1.0, logger: Optional[logging.Logger] = None):
+        self.total = total
+        self.interval = interval
+        self.logger = logger or get_logger('progress')
+        self.done = 0
+        self.failed = 0
+        self.started = time.monotonic()
+        self.last_emit = 0.0
+        self._lock = threading.Lock()
+
+    def advance(self, ok: bool = True):
+        """Count one finished product (ok=False for failures)"""
+        with self._lock:
+            if ok:
+                self.done += 1
+            else:
+                self.failed += 1
+        self.maybe_emit()
+
+    def maybe_emit(self, force: bool = False):
+        now = time.monotonic()
+        if not force and now - self.last_emit < self.interval:
+            return
+        self.last_emit = now
+        self.logger.log(PROGRESS, self.render(now), extra={
+            'progress': True, 'done': self.done, 'failed': self.failed, 'total': self.total,
+        })
+
+    def render(self, now: Optional[float] = None) -> str:
+        elapsed = max((now or time.monotonic()) - self.started, 1e-9)
+        finished = self.done + self.failed
+        rate = finished / elapsed * 60
+        line = f"⏳ {self.done}/{self.total} products" if self.total else f"⏳ {self.done} products"
+        line += f" | {rate:.1f}/min"
+        if self.total and finished and finished < self.total:
+            remaining = (self.total - finished) * elapsed / finished
+            line += f" | ETA {int(remaining // 60)}m {int(remaining % 60):02d}s"
+        line += f" | {self.failed} errors"
+        return line
+
+    def finish(self):
+        self.maybe_emit(force=True)
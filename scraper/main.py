@@ -1,11 +1,31 @@
 import asyncio
+import logging
+import os
 import time
-from typing import List, Dict
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import List, Dict, Optional
 from .models import ProductData, ScrapingConfig
+from .product_batch import ProductBatch
+from .data_formatter import DataFormatter
 from .browser_manager import BrowserManager
 from .category_navigator import CategoryNavigator
 from .product_scraper import ProductScraper
 from .csv_exporter import CSVExporter
+from .sinks import ProductSink, SinkManager, StreamingCSVSink, ParquetSink, JSONLSink, StdoutNDJSONSink
+from .catalog_store import CatalogStore
+from . import metrics
+from . import spans
+from .log import ProgressReporter
+from .cpu_profile import CPUProfiler
+from .run_report import RunReport
+from .rpc_accounting import RPCAccounting
+from .memory_profile import MemoryProfiler
+from .supervisor import BrowserSupervisor, SupervisedTaskError
+from .time_budget import TimeBudget
+from .work_queue import AsyncWorkQueue, WorkItem, EXPORT_CLAIM, KIND_LISTING, KIND_PRODUCT, STATUS_LEASED, STATUS_PENDING, default_worker_id
+
+logger = logging.getLogger(__name__)
 
 
 class SyscoScraperOrchestrator:
@@ -14,133 +34,421 @@ class SyscoScraperOrchestrator:
     def __init__(self, config: ScrapingConfig):
         self.config = config
         self.browser_manager = BrowserManager(config)
-        self.products: List[ProductData] = []
+        self.products = ProductBatch()  # Columnar; only used without streaming sinks
         
         # Components initialized after browser starts
         self.category_navigator = None
         self.product_scraper = None
+        self.supervisor: Optional[BrowserSupervisor] = None
         self.csv_exporter = CSVExporter(config)
+        
+        # Streaming outputs; when enabled, finished products are fanned out to the sinks
+        self.sink_manager: Optional[SinkManager] = None
+        self.products_scraped = 0
+        
+        # Optional fixed scraping window
+        self.time_budget: Optional[TimeBudget] = None
+        
+        # Task IDs currently leased from the shared work queue (queue worker mode)
+        self.held_leases = set()
+        self.work_queue_pending: Optional[int] = None  # Refreshed by the worker loop for the depth gauge
+        
+        # Metrics endpoint and event-loop lag monitor (started per run)
+        self.metrics_server: Optional[metrics.MetricsServer] = None
+        self.lag_monitor: Optional[metrics.EventLoopLagMonitor] = None
+        
+        # Single-line progress display (shown even in quiet mode)
+        self.progress: Optional[ProgressReporter] = None
+        
+        # tracemalloc checkpoints at phase boundaries (--profile-memory)
+        self.memory_profiler = MemoryProfiler(config)
+        
+        # Sampling CPU profiler attributing time to phases, stages and coroutines (--profile-cpu)
+        self.cpu_profiler = CPUProfiler(config)
+        
+        # Machine-readable report written to output_dir/reports at the end of every run
+        self.run_report = RunReport(config, mode="sequential")
+        
+        # Round trips of the instrumented page per method/call site/product (--rpc-accounting)
+        self.rpc = RPCAccounting(config.rpc_accounting)
+        
+        # Span lane for products: None picks the lowest free worker-N lane, the queue worker uses its ID
+        self.span_lane: Optional[str] = None
     
     async def run_scraper(self) -> bool:
         """Main scraper orchestration method with comprehensive timing"""
-        import time
-        
         # Start total timer
         total_start_time = time.time()
         
+        if self.config.time_budget_seconds:
+            self.time_budget = TimeBudget(
+                self.config.time_budget_seconds,
+                reserve_seconds=self.config.time_budget_reserve_seconds
+            )
+        
+        self._start_metrics()
+        self.memory_profiler.start()
+        self.cpu_profiler.start()
+        spans.RECORDER.configure(self.config.span_tracing, self.config.span_max_events)
+        
         try:
-            print("\n" + "="*60)
-            print(" SYSCO PRODUCT SCRAPER - MODULAR ARCHITECTURE")
-            print("="*60)
+            logger.info("="*60)
+            logger.info(" SYSCO PRODUCT SCRAPER - MODULAR ARCHITECTURE")
+            logger.info("="*60)
             
             # Print configuration
-            print(" Configuration loaded:")
-            print(f"   • ZIP Code: {self.config.zip_code}")
-            print(f"   • Headless: {self.config.headless}")
-            print(f"   • Categories: {', '.join(self.config.categories_to_scrape)}")
-            print(f"   • Max Products: {self.config.max_products}")
-            print(f"   • Output: {self.config.output_file}")
-            print()
+            logger.info(" Configuration loaded:")
+            logger.info(f"   • ZIP Code: {self.config.zip_code}")
+            logger.info(f"   • Headless: {self.config.headless}")
+            logger.info(f"   • Categories: {', '.join(self.config.categories_to_scrape)}")
+            logger.info(f"   • Max Products: {self.config.max_products}")
+            if self.time_budget:
+                logger.info(f"   • Time Budget: {self.config.time_budget_seconds:.0f}s "
+                            f"(reserve {self.config.time_budget_reserve_seconds:.0f}s for export)")
+            logger.info(f"   • Output: {self.config.output_file}")
             
-            print(" Starting scraper timer...")
-            print(" Starting Sysco product scraper with modular architecture...")
+            logger.info(" Starting scraper timer...")
+            logger.info(" Starting Sysco product scraper with modular architecture...")
             
             # Step 1: Initialize browser and components
+            self.cpu_profiler.set_phase("browser_startup")
             browser_start_time = time.time()
             page = await self.browser_manager.start_browser()
-            self.category_navigator = CategoryNavigator(page)
-            self.product_scraper = ProductScraper(page)
+            self._attach_page(page)
             browser_time = time.time() - browser_start_time
-            print(f"⚡ Browser startup: {browser_time:.2f}s")
+            logger.info(f"⚡ Browser startup: {browser_time:.2f}s")
+            self.run_report.phase("browser_startup", browser_time)
             
             # Step 2: Navigate to Sysco and handle initial setup
+            self.cpu_profiler.set_phase("session_setup")
             session_start_time = time.time()
             if not await self._setup_sysco_session():
-                print("❌ Failed to setup Sysco session")
+                logger.error("❌ Failed to setup Sysco session")
                 return False
             session_time = time.time() - session_start_time
-            print(f"⚡ Session setup: {session_time:.2f}s")
+            logger.info(f"⚡ Session setup: {session_time:.2f}s")
+            self.run_report.phase("session_setup", session_time)
+            self.memory_profiler.checkpoint("session_setup")
             
             # Step 3: Process each category
+            self.cpu_profiler.set_phase("url_collection")
             collection_start_time = time.time()
             category_to_urls_map = await self._collect_product_urls()
             collection_time = time.time() - collection_start_time
-            print(f"⚡ URL collection: {collection_time:.2f}s")
+            logger.info(f"⚡ URL collection: {collection_time:.2f}s")
+            self.run_report.phase("url_collection", collection_time)
+            self.memory_profiler.checkpoint("url_collection")
             
             if not category_to_urls_map:
-                print("❌ No product URLs found")
+                logger.error("❌ No product URLs found")
                 return False
             
             # Step 4: Scrape individual products
+            self.cpu_profiler.set_phase("scraping")
             scraping_start_time = time.time()
+            self._open_sinks()
             await self._scrape_products(category_to_urls_map)
             scraping_time = time.time() - scraping_start_time
-            print(f"⚡ Product scraping: {scraping_time:.2f}s")
+            logger.info(f"⚡ Product scraping: {scraping_time:.2f}s")
+            self.run_report.phase("scraping", scraping_time)
+            self.memory_profiler.checkpoint("scraping")
             
             # Step 5: Export results
+            self.cpu_profiler.set_phase("export")
             export_start_time = time.time()
-            success = self.csv_exporter.export_products(self.products)
+            if self.sink_manager:
+                success = await self.sink_manager.aclose(success=True)
+            else:
+                await self._prepare_export(self.products)
+                success = self.csv_exporter.export_products(self.products)
             export_time = time.time() - export_start_time
-            print(f"⚡ Data export: {export_time:.2f}s")
+            logger.info(f"⚡ Data export: {export_time:.2f}s")
+            self.run_report.phase("export", export_time)
+            self.memory_profiler.checkpoint("export")
             
             # Calculate and display total time
             total_time = time.time() - total_start_time
             
-            print("\n" + "="*60)
-            print("🏁 SCRAPING PERFORMANCE SUMMARY")
-            print("="*60)
-            print(f"⏱️ Total scraping time: {total_time:.2f} seconds ({total_time/60:.1f} minutes)")
-            print(f"🚀 Browser startup: {browser_time:.2f}s ({browser_time/total_time*100:.1f}%)")
-            print(f"🔑 Session setup: {session_time:.2f}s ({session_time/total_time*100:.1f}%)")
-            print(f"🔗 URL collection: {collection_time:.2f}s ({collection_time/total_time*100:.1f}%)")
-            print(f"📊 Product scraping: {scraping_time:.2f}s ({scraping_time/total_time*100:.1f}%)")
-            print(f"💾 Data export: {export_time:.2f}s ({export_time/total_time*100:.1f}%)")
+            logger.info("="*60)
+            logger.info("🏁 SCRAPING PERFORMANCE SUMMARY")
+            logger.info("="*60)
+            logger.info(f"⏱️ Total scraping time: {total_time:.2f} seconds ({total_time/60:.1f} minutes)")
+            logger.info(f"🚀 Browser startup: {browser_time:.2f}s ({browser_time/total_time*100:.1f}%)")
+            logger.info(f"🔑 Session setup: {session_time:.2f}s ({session_time/total_time*100:.1f}%)")
+            logger.info(f"🔗 URL collection: {collection_time:.2f}s ({collection_time/total_time*100:.1f}%)")
+            logger.info(f"📊 Product scraping: {scraping_time:.2f}s ({scraping_time/total_time*100:.1f}%)")
+            logger.info(f"💾 Data export: {export_time:.2f}s ({export_time/total_time*100:.1f}%)")
             
             # Performance metrics
-            total_products = len(self.products)
+            total_products = self.products_scraped
             if total_products > 0:
                 avg_time_per_product = scraping_time / total_products
-                print(f"📊 Average time per product: {avg_time_per_product:.2f}s")
-                print(f"📊 Products per minute: {60/avg_time_per_product:.1f}")
+                logger.info(f"📊 Average time per product: {avg_time_per_product:.2f}s")
+                logger.info(f"📊 Products per minute: {60/avg_time_per_product:.1f}")
             
-            print("="*60)
-            print(f"✅ Scraping completed! Found {len(self.products)} valid products")
+            supervision = self.supervisor.summary()
+            if any(supervision.values()):
+                logger.info(f"🛡️ Supervisor: {supervision['deadline_hits']} deadline hits, "
+                            f"{supervision['page_recycles']} page / {supervision['context_recycles']} context recycles, "
+                            f"{supervision['browser_restarts']} browser restarts")
+            
+            network = self.browser_manager.network.summary()
+            logger.info(f"🌐 Network: {network['total_bytes'] / 1024 / 1024:.1f} MB in {network['requests']} requests, "
+                        f"{network['mean_bytes_per_product'] / 1024:.0f} KB/product; {network['blocked_requests']} blocked "
+                        f"(~{network['estimated_bytes_saved'] / 1024 / 1024:.1f} MB saved)")
+            if network['budget_bytes']:
+                logger.info(f"🌐 Bandwidth budget: {network['total_bytes'] / network['budget_bytes']:.0%} used "
+                            f"({network['budget_level']})")
+            
+            rpc = self.rpc.summary()
+            if rpc['calls']:
+                logger.info(f"📞 Browser round trips: {rpc['calls']} ({rpc['seconds']:.1f}s), "
+                            f"{rpc['mean_calls_per_product']:.0f} per product; chattiest call sites:")
+                for site in rpc['chattiest_sites'][:5]:
+                    logger.info(f"   • {site['site']} {site['method']}: {site['calls']} calls, "
+                                f"{site['seconds']:.1f}s ({site['mean_ms']:.0f} ms each)")
+            
+            traces = self.browser_manager.trace_sampler.summary()
+            if traces['saved'] or traces['evicted']:
+                logger.info(f"🧵 Traces: {traces['saved']} saved for slow/failed products "
+                            f"(slow = over {traces['threshold_seconds']:.1f}s), {traces['evicted']} evicted over budget")
+            
+            if self.time_budget:
+                coverage = self.time_budget.coverage()
+                logger.info(f"⏳ Time budget: {coverage['elapsed_seconds']:.1f}s used of {coverage['budget_seconds']:.0f}s")
+                logger.info(f"⏳ Coverage: {coverage['admitted']}/{coverage['planned']} products "
+                            f"({coverage['coverage_pct']:.1f}%), skipped {coverage['skipped']}")
+                if coverage['skipped_categories']:
+                    logger.info(f"⏳ Categories never listed: {coverage['skipped_category_count']} "
+                                f"({', '.join(coverage['skipped_categories'])})")
+            
+            logger.info("="*60)
+            logger.info(f"✅ Scraping completed! Found {self.products_scraped} valid products")
+            self.run_report.success = success
             return success
             
         except Exception as e:
             total_time = time.time() - total_start_time
-            print(f" Error in main scraper after {total_time:.2f}s: {e}")
+            logger.error(f" Error in main scraper after {total_time:.2f}s: {e}")
             return False
         finally:
+            if self.sink_manager and not self.sink_manager.closed:
+                # Error or Ctrl-C: flush every sink, but don't publish partial output as complete
+                self.sink_manager.close(success=False)
             await self.browser_manager.close_browser()
+            self._write_trace_index()
+            self._write_memory_profile()
+            self._write_cpu_profile()
+            self._write_run_report()
+            self._write_span_trace()
+            self._stop_metrics()
+    
+    def _open_sinks(self):
+        """Open the configured streaming sinks behind a fan-out manager"""
+        sinks: List[ProductSink] = []
+        if self.config.enable_streaming_export:
+            rotate_bytes = int(self.config.export_rotate_mb * 1024 * 1024) if self.config.export_rotate_mb else None
+            sinks.append(StreamingCSVSink(
+                self.config,
+                batch_size=self.config.export_batch_size,
+                flush_interval=self.config.export_flush_seconds,
+                max_bytes=rotate_bytes,
+                max_rows=self.config.export_rotate_rows
+            ))
+        if self.config.enable_parquet_export:
+            sinks.append(ParquetSink(self.config, row_group_size=self.config.parquet_row_group_size))
+        if self.config.catalog_db_path:
+            # The manager already gives the store its own writer thread
+            sinks.append(CatalogStore(self.config.catalog_db_path, use_writer_thread=False))
+        if self.config.enable_jsonl_export:
+            sinks.append(JSONLSink(self.config, compression=self.config.jsonl_compression,
+                                   flush_interval=self.config.export_flush_seconds))
+        if self.config.stdout_ndjson:
+            sinks.append(StdoutNDJSONSink())
+        
+        if sinks:
+            # Stdout consumers expect each record as soon as it is scraped
+            batch_size = 1 if self.config.stdout_ndjson else self.config.sink_batch_size
+            self.sink_manager = SinkManager(sinks, queue_size=self.config.sink_queue_size, batch_size=batch_size,
+                                            max_batch_seconds=self.config.export_flush_seconds)
+            self.sink_manager.open()
+    
+    def _start_metrics(self):
+        """Start the loop-lag monitor and, if configured, the Prometheus endpoint"""
+        metrics.RUN_STARTED.set(time.time())
+        metrics.QUEUE_DEPTH.set_function(self._queue_depths)
+        self.lag_monitor = metrics.EventLoopLagMonitor(metrics.LOOP_LAG_SECONDS, metrics.LOOP_LAG_CURRENT)
+        self.lag_monitor.start()
+        if self.config.metrics_port and not self.metrics_server:
+            try:
+                self.metrics_server = metrics.MetricsServer(metrics.REGISTRY, self.config.metrics_port).start()
+                logger.info(f"📈 Metrics at {self.metrics_server.address}")
+            except OSError as e:
+                logger.warning(f"⚠️ Could not start metrics endpoint on port {self.config.metrics_port}: {e}")
+    
+    def _stop_metrics(self):
+        """Stop monitoring and dump the final metrics next to the output"""
+        if self.lag_monitor:
+            self.lag_monitor.stop()
+        if self.config.metrics_file:
+            path = os.path.join(self.config.output_dir, self.config.metrics_file)
+            try:
+                metrics.REGISTRY.dump(path)
+                logger.info(f"📈 Metrics written to {path}")
+            except OSError as e:
+                logger.warning(f"⚠️ Could not write metrics: {e}")
+        if self.metrics_server:
+            self.metrics_server.stop()
+            self.metrics_server = None
+    
+    @asynccontextmanager
+    async def _product_window(self, label: str):
+        """Per-product span, trace sampling, network byte and RPC accounting"""
+        network_start = self.browser_manager.network.begin_product()
+        rpc_product = self.rpc.begin_product(label)
+        try:
+            with spans.worker(self.span_lane), spans.span('product', category='product', url=label):
+                async with self.browser_manager.trace_sampler.sample(label) as trace:
+                    yield trace
+        finally:
+            self.rpc.end_product(rpc_product)
+            self.browser_manager.network.end_product(label, network_start)
+    
+    def _write_trace_index(self):
+        """List the saved traces in output_dir/traces/index.json"""
+        try:
+            path = self.browser_manager.trace_sampler.write_index()
+            if path:
+                logger.info(f"🧵 Trace index written to {path}")
+        except OSError as e:
+            logger.warning(f"⚠️ Could not write trace index: {e}")
+    
+    def _write_memory_profile(self):
+        """Final tracemalloc checkpoint and the top-allocators report (--profile-memory)"""
+        try:
+            path = self.memory_profiler.stop()
+            if path:
+                logger.info(f"🧠 Memory profile written to {path}")
+        except OSError as e:
+            logger.warning(f"⚠️ Could not write memory profile: {e}")
+    
+    def _write_cpu_profile(self):
+        """Stop the sampler and write folded stacks plus the stage summary (--profile-cpu)"""
+        try:
+            path = self.cpu_profiler.stop()
+            if path:
+                logger.info(f"🔬 CPU profile written to {os.path.dirname(path)} (wall.folded, cpu.folded, summary.json)")
+        except OSError as e:
+            logger.warning(f"⚠️ Could not write CPU profile: {e}")
+    
+    def _write_run_report(self):
+        """Write output_dir/reports/run-*.json with the run's numbers and component summaries"""
+        extra = {
+            'network': self.browser_manager.network.summary(),
+            'traces': self.browser_manager.trace_sampler.summary(),
+            'supervisor': self.supervisor.summary() if self.supervisor else {},
+            'rpc': self.rpc.summary(),
+            'time_budget': self.time_budget.coverage() if self.time_budget else None,
+        }
+        try:
+            path = self.run_report.write(extra)
+            logger.info(f"📑 Run report written to {path}")
+        except (OSError, TypeError, ValueError) as e:
+            logger.warning(f"⚠️ Could not write run report: {e}")
+    
+    def _write_span_trace(self):
+        """Export the recorded spans as output_dir/spans.trace.json (--trace-spans)"""
+        try:
+            path = spans.RECORDER.export(os.path.join(self.config.output_dir, "spans.trace.json"))
+            if path:
+                dropped = f", {spans.RECORDER.dropped} dropped over the cap" if spans.RECORDER.dropped else ""
+                logger.info(f"🪢 {len(spans.RECORDER.events)} spans written to {path}{dropped} "
+                            f"(open in chrome://tracing or ui.perfetto.dev)")
+        except OSError as e:
+            logger.warning(f"⚠️ Could not write span trace: {e}")
+        spans.RECORDER.configure(False)
+    
+    def _queue_depths(self) -> Dict[str, int]:
+        """Queue depth gauge source: sink backlogs plus pending work-queue tasks"""
+        depths = {}
+        if self.sink_manager and not self.sink_manager.closed:
+            depths.update({f"sink:{name}": depth for name, depth in self.sink_manager.queue_depths().items()})
+        if self.work_queue_pending is not None:
+            depths['work_queue'] = self.work_queue_pending
+        return depths
+    
+    def _observe_product(self, product_data: ProductData, category: str, seconds: float):
+        """Per-product metrics and progress: scraped counter, stage latencies and task time"""
+        metrics.PRODUCTS_SCRAPED.labels(category).inc()
+        for stage, stage_seconds in product_data.timings.items():
+            metrics.PRODUCT_STAGE_SECONDS.labels(stage).observe(stage_seconds)
+        metrics.PRODUCT_SECONDS.observe(seconds)
+        self.run_report.product_ok(product_data, category, seconds)
+        if self.progress:
+            self.progress.advance(ok=True)
+        self.memory_profiler.product_finished()
+    
+    def _product_failed(self, category: str, reason: str, final: bool = True):
+        """Count a failed product attempt; only final failures move the progress line"""
+        metrics.PRODUCTS_FAILED.labels(category, reason).inc()
+        self.run_report.product_failed(category, reason, final)
+        if final and self.progress:
+            self.progress.advance(ok=False)
+    
+    async def _record_product(self, product_data: ProductData, product_info: Optional[Dict] = None):
+        """Hand a valid product to the sinks (or keep it in memory without streaming)"""
+        if product_info and product_info.get('categories'):
+            product_data.categories = product_info['categories']
+        self.products_scraped += 1
+        if self.sink_manager:
+            await self.sink_manager.submit(product_data)
+        else:
+            self.products.append(product_data)
+    
+    def _attach_page(self, page):
+        """(Re)bind page-dependent components, e.g. after the supervisor recycled the page"""
+        page = self.rpc.wrap(page)
+        self.category_navigator = CategoryNavigator(page)
+        self.product_scraper = ProductScraper(page, self.browser_manager.network)
+        if self.supervisor is None:
+            self.supervisor = BrowserSupervisor(self.browser_manager, self.config, self._attach_page)
     
     async def _setup_sysco_session(self) -> bool:
         """Setup initial Sysco session (navigation, login, zip code)"""
-        print("🔧 Setting up Sysco session...")
+        logger.info("🔧 Setting up Sysco session...")
         
         # Navigate and handle guest login
         if not await self.browser_manager.navigate_to_sysco():
-            print("❌ Failed to navigate to Sysco")
+            logger.error("❌ Failed to navigate to Sysco")
             return False
         
         # Handle zip code modal
         if not await self.browser_manager.handle_zip_code_modal():
-            print("⚠️ Failed to handle zip code modal, continuing anyway...")
+            logger.warning("⚠️ Failed to handle zip code modal, continuing anyway...")
         
-        print("✅ Sysco session setup complete")
+        # Keep the session so recycled contexts and respawned browsers skip login/ZIP
+        await self.browser_manager.save_session_state()
+        
+        logger.info("✅ Sysco session setup complete")
         return True
     
     async def _collect_product_urls(self) -> Dict[str, List[str]]:
         """Collect product URLs from all configured categories"""
-        print("📂 Collecting product URLs from categories...")
+        logger.info("📂 Collecting product URLs from categories...")
         category_to_urls_map: Dict[str, List[str]] = {}
         
         for i, category in enumerate(self.config.categories_to_scrape):
-            print(f"\n📁 Processing category {i+1}/{len(self.config.categories_to_scrape)}: {category}")
+            if self.time_budget and self.time_budget.expired():
+                skipped = self.config.categories_to_scrape[i:]
+                self.time_budget.mark_categories_skipped(skipped)
+                logger.info(f"⏳ Time budget exhausted, skipping {len(skipped)} remaining categories: {', '.join(skipped)}")
+                break
+            
+            logger.info(f"📁 Processing category {i+1}/{len(self.config.categories_to_scrape)}: {category}")
             
             # Select the category
             if not await self.category_navigator.select_category(category):
-                print(f"⚠️ Skipping category '{category}' - could not select")
+                logger.warning(f"⚠️ Skipping category '{category}' - could not select")
                 continue
             
             # Get products from this category
@@ -151,7 +459,7 @@ class SyscoScraperOrchestrator:
                 # Use list(set(...)) to remove duplicates within the category
                 category_to_urls_map[category] = list(set(product_urls))
             
-            print(f"✅ Found {len(product_urls)} products in '{category}'")
+            logger.info(f"✅ Found {len(product_urls)} products in '{category}'")
             
             # Return to dashboard for next category (if not last)
             if i < len(self.config.categories_to_scrape) - 1:
@@ -161,87 +469,169 @@ class SyscoScraperOrchestrator:
             await self.browser_manager.throttle()
         
         total_urls = sum(len(urls) for urls in category_to_urls_map.values())
-        print(f"📊 Total product URLs collected: {total_urls}")
+        logger.info(f"📊 Total product URLs collected: {total_urls}")
         return category_to_urls_map
     
     async def _scrape_products(self, category_to_urls_map: Dict[str, List[str]]):
         """Scrape individual product data from URLs with performance optimizations"""
-        print("🔍 Scraping individual product data...")
+        logger.info("🔍 Scraping individual product data...")
         
-        # Flatten the dictionary for total count and limiting, while keeping category association
-        all_products_to_scrape = []
+        # Flatten the dictionary for total count and limiting, while keeping category association.
+        # A product listed in several categories is scraped once and keeps all of them.
+        categories_by_url: Dict[str, List[str]] = {}
         for category, urls in category_to_urls_map.items():
             for url in urls:
-                all_products_to_scrape.append({'url': url, 'category': category})
+                categories_by_url.setdefault(url, []).append(category)
+        all_products_to_scrape = [
+            {'url': url, 'category': categories[0], 'categories': categories}
+            for url, categories in categories_by_url.items()
+        ]
 
         # Apply product limit if configured
         max_products = self.config.max_products or len(all_products_to_scrape)
         products_to_process = all_products_to_scrape[:max_products]
         
-        print(f"📝 Scraping {len(products_to_process)} products (limit: {self.config.max_products})")
+        logger.info(f"📝 Scraping {len(products_to_process)} products (limit: {self.config.max_products})")
+        
+        if self.time_budget:
+            self.time_budget.total_planned = len(products_to_process)
+            logger.info(f"⏳ Predicted capacity in remaining {self.time_budget.remaining():.0f}s: "
+                        f"~{self.time_budget.predicted_capacity()} products")
+        
+        self.progress = ProgressReporter(total=len(products_to_process))
         
         # 🚀 PERFORMANCE OPTIMIZATION: Use async scraping based on configuration
         if (self.config.enable_async_scraping and 
             len(products_to_process) <= self.config.async_batch_size):
-            print(f"⚡ Using asynchronous scraping for {len(products_to_process)} products...")
+            logger.info(f"⚡ Using asynchronous scraping for {len(products_to_process)} products...")
+            self.run_report.mode = "async"
             await self._scrape_products_async(products_to_process)
         else:
-            print(f"🔄 Using sequential scraping for {len(products_to_process)} products...")
+            logger.info(f"🔄 Using sequential scraping for {len(products_to_process)} products...")
             await self._scrape_products_sequential(products_to_process)
         
-        print(f"📊 Successfully scraped {len(self.products)} valid products")
+        self.progress.finish()
+        logger.info(f"📊 Successfully scraped {self.products_scraped} valid products")
     
     async def _scrape_products_sequential(self, products_to_process: List[Dict]):
-        """Sequential product scraping (original method)"""
-        for i, product_info in enumerate(products_to_process):
+        """Sequential product scraping (original method) under the supervisor watchdog"""
+        pending = deque((i, product_info, 1) for i, product_info in enumerate(products_to_process))
+        
+        while pending:
+            if self.time_budget and not self.time_budget.should_admit():
+                self.time_budget.mark_skipped(len(pending))
+                break
+            if not self.browser_manager.network.should_admit():
+                logger.warning(f"📉 Bandwidth budget exhausted, skipping {len(pending)} remaining products")
+                break
+            
+            i, product_info, attempt = pending.popleft()
             product_url = product_info['url']
             category = product_info['category']
-            print(f"🔍 Scraping product {i+1}/{len(products_to_process)} from '{category}': {product_url}")
+            product_start_time = time.time()
+            logger.info("🔍 Scraping product %d/%d from '%s': %s", i + 1, len(products_to_process), category, product_url)
             
+            metrics.ACTIVE_WORKERS.inc()
             try:
-                import time
                 start_time = time.time()
-                product_data = await self.product_scraper.scrape_product(product_url, category)
+                async with self._product_window(product_url) as trace:
+                    product_data = await self.supervisor.run(
+                        lambda: self.product_scraper.scrape_product(product_url, category),
+                        label=product_url
+                    )
+                    trace.failed = not product_data.is_valid()
                 scrape_time = time.time() - start_time
                 
                 if product_data.is_valid():
-                    self.products.append(product_data)
-                    print(f"✅ Successfully scraped in {scrape_time:.2f}s: {product_data.product_name[:50]}...")
+                    self._observe_product(product_data, category, scrape_time)
+                    await self._record_product(product_data, product_info)
+                    logger.info("✅ Successfully scraped in %.2fs: %s...", scrape_time, product_data.product_name[:50],
+                                extra={'url': product_url, 'category': category, 'seconds': round(scrape_time, 3)})
                 else:
-                    print(f"⚠️ Skipped invalid product data (took {scrape_time:.2f}s)")
+                    self._product_failed(category, 'invalid')
+                    logger.warning("⚠️ Skipped invalid product data (took %.2fs)", scrape_time,
+                                   extra={'url': product_url, 'category': category})
                 
+            except SupervisedTaskError as e:
+                retry = attempt < self.config.max_task_attempts
+                self._product_failed(category, type(e).__name__, final=not retry)
+                if retry:
+                    pending.append((i, product_info, attempt + 1))
+                    logger.info("↩️ Requeued product %d after %s (attempt %d)", i + 1, type(e).__name__, attempt)
+                else:
+                    logger.error("❌ Giving up on product %d after %d attempts", i + 1, attempt)
             except Exception as e:
-                print(f"❌ Error scraping product {i+1}: {e}")
+                self._product_failed(category, 'error')
+                logger.error("❌ Error scraping product %d: %s", i + 1, e, extra={'url': product_url, 'category': category})
+            finally:
+                metrics.ACTIVE_WORKERS.dec()
+            
+            await self.supervisor.maybe_recycle()
             
             # Throttle between products
             await self.browser_manager.throttle()
+            
+            if self.time_budget:
+                self.time_budget.record_duration(time.time() - product_start_time)
     
     async def _scrape_products_async(self, products_to_process: List[Dict]):
         """Asynchronous product scraping for better performance"""
-        import time
+        in_flight = 0
+        concurrency = max(len(products_to_process), 1)
+        aborted: List[Dict] = []
         
         async def scrape_single_product(product_info: Dict, index: int):
             """Scrape a single product with error handling"""
+            nonlocal in_flight
             product_url = product_info['url']
             category = product_info['category']
             
+            if self.time_budget and not self.time_budget.should_admit(concurrency, in_flight):
+                self.time_budget.mark_skipped()
+                return None
+            if not self.browser_manager.network.should_admit():
+                return None
+            
+            in_flight += 1
+            metrics.ACTIVE_WORKERS.inc()
+            start_time = time.time()
             try:
-                start_time = time.time()
-                print(f"⚡ [{index+1}] Starting async scrape: {product_url}")
+                logger.info("⚡ [%d] Starting async scrape: %s", index + 1, product_url)
                 
-                product_data = await self.product_scraper.scrape_product(product_url, category)
+                # Tasks share the page, so repairs wait until all of them are done
+                async with self._product_window(product_url) as trace:
+                    product_data = await self.supervisor.run(
+                        lambda: self.product_scraper.scrape_product(product_url, category),
+                        label=product_url,
+                        recover=False
+                    )
+                    trace.failed = not product_data.is_valid()
                 scrape_time = time.time() - start_time
                 
                 if product_data.is_valid():
-                    print(f"✅ [{index+1}] Completed in {scrape_time:.2f}s: {product_data.product_name[:50]}...")
+                    self._observe_product(product_data, category, scrape_time)
+                    logger.info("✅ [%d] Completed in %.2fs: %s...", index + 1, scrape_time, product_data.product_name[:50],
+                                extra={'url': product_url, 'category': category, 'seconds': round(scrape_time, 3)})
                     return product_data
                 else:
-                    print(f"⚠️ [{index+1}] Invalid data (took {scrape_time:.2f}s)")
+                    self._product_failed(category, 'invalid')
+                    logger.warning("⚠️ [%d] Invalid data (took %.2fs)", index + 1, scrape_time)
                     return None
                     
+            except SupervisedTaskError as e:
+                self._product_failed(category, type(e).__name__, final=False)
+                logger.warning("⚠️ [%d] Aborted (%s), will retry", index + 1, type(e).__name__)
+                aborted.append(product_info)
+                return None
             except Exception as e:
-                print(f"❌ [{index+1}] Error: {e}")
+                self._product_failed(category, 'error')
+                logger.error("❌ [%d] Error: %s", index + 1, e, extra={'url': product_url, 'category': category})
                 return None
+            finally:
+                in_flight -= 1
+                metrics.ACTIVE_WORKERS.dec()
+                if self.time_budget:
+                    self.time_budget.record_duration(time.time() - start_time)
         
         # Create tasks for concurrent execution
         tasks = [
@@ -250,25 +640,289 @@ class SyscoScraperOrchestrator:
         ]
         
         # Execute tasks concurrently with some throttling
-        print(f"🚀 Starting {len(tasks)} concurrent scraping tasks...")
+        logger.info(f"🚀 Starting {len(tasks)} concurrent scraping tasks...")
         start_time = time.time()
         
         results = await asyncio.gather(*tasks, return_exceptions=True)
         
         total_time = time.time() - start_time
-        print(f"⚡ Async scraping completed in {total_time:.2f}s (avg: {total_time/len(tasks):.2f}s per product)")
+        logger.info(f"⚡ Async scraping completed in {total_time:.2f}s (avg: {total_time/len(tasks):.2f}s per product)")
         
         # Process results
-        for result in results:
+        for product_info, result in zip(products_to_process, results):
             if result and not isinstance(result, Exception):
-                self.products.append(result)
+                await self._record_product(result, product_info)
+        
+        if aborted:
+            # Repair the shared page once, then retry the aborted products one by one
+            await self.supervisor.recover()
+            logger.info(f"↩️ Retrying {len(aborted)} aborted products sequentially...")
+            await self._scrape_products_sequential(aborted)
+    
+    async def run_queue_worker(self) -> bool:
+        """Run as a worker on the shared work queue until it is drained"""
+        queue = await AsyncWorkQueue.open(
+            self.config.work_queue_path,
+            lease_seconds=self.config.lease_seconds,
+            max_attempts=self.config.max_task_attempts
+        )
+        worker_id = self.config.worker_id or default_worker_id()
+        heartbeat_task = None
+        self.run_report.mode = "queue"
+        self.span_lane = worker_id
+        self._start_metrics()
+        self.memory_profiler.start()
+        self.cpu_profiler.start()
+        spans.RECORDER.configure(self.config.span_tracing, self.config.span_max_events)
+        
+        if self.config.time_budget_seconds:
+            self.time_budget = TimeBudget(
+                self.config.time_budget_seconds,
+                reserve_seconds=self.config.time_budget_reserve_seconds
+            )
+        
+        try:
+            logger.info(f"👷 Starting queue worker {worker_id} on {self.config.work_queue_path}")
+            self.cpu_profiler.set_phase("session_setup")
+            phase_start_time = time.time()
+            page = await self.browser_manager.start_browser()
+            self._attach_page(page)
+            
+            if not await self._setup_sysco_session():
+                logger.error("❌ Failed to setup Sysco session")
+                return False
+            self.run_report.phase("session_setup", time.time() - phase_start_time)
+            self.memory_profiler.checkpoint("session_setup")
+            
+            # Seeding is idempotent, so every worker may do it
+            seeded = await queue.enqueue_many(
+                KIND_LISTING,
+                [(category, '', category) for category in self.config.categories_to_scrape]
+            )
+            if seeded:
+                logger.info(f"🌱 Seeded queue with {seeded} listing task(s)")
+            
+            heartbeat_task = asyncio.create_task(self._heartbeat_loop(queue, worker_id))
+            self.cpu_profiler.set_phase("scraping")
+            phase_start_time = time.time()
+            products_processed = 0
+            self.progress = ProgressReporter(total=self.config.max_products)
+            depth_checked = 0.0
+            
+            while True:
+                if self.config.max_products and products_processed >= self.config.max_products:
+                    logger.info(f"🛑 Reached product limit ({self.config.max_products}) for this worker")
+                    break
+                if self.time_budget and not self.time_budget.should_admit():
+                    break
+                if not self.browser_manager.network.should_admit():
+                    logger.warning("📉 Bandwidth budget exhausted, leaving the rest to other workers")
+                    break
+                
+                with spans.worker(worker_id), spans.span('queue_wait', category='queue'):
+                    items = await queue.lease(worker_id)
+                if time.monotonic() - depth_checked >= 5.0:
+                    # The gauge is read from the metrics thread, so it reports a cached count
+                    self.work_queue_pending = await queue.count([STATUS_PENDING])
+                    depth_checked = time.monotonic()
+                if not items:
+                    if await queue.is_drained():
+                        logger.info("📭 Work queue drained")
+                        break
+                    # Other workers still hold leases; they may finish or expire and be reclaimed
+                    with spans.worker(worker_id), spans.span('queue_wait', category='queue', idle=True):
+                        await asyncio.sleep(self.config.queue_poll_seconds)
+                    continue
+                
+                item = items[0]
+                self.held_leases.add(item.task_id)
+                try:
+                    if item.kind == KIND_LISTING:
+                        await self.supervisor.run(
+                            lambda: self._process_listing_task(queue, worker_id, item),
+                            label=f"listing {item.category}"
+                        )
+                    else:
+                        async with self._product_window(item.url) as trace:
+                            ok = await self.supervisor.run(
+                                lambda: self._process_product_task(queue, worker_id, item),
+                                label=item.url
+                            )
+                            trace.failed = not ok
+                        products_processed += 1
+                except SupervisedTaskError as e:
+                    retried = await queue.fail(item.task_id, worker_id, f"{type(e).__name__}: {e}")
+                    if item.kind == KIND_PRODUCT:
+                        self._product_failed(item.category, type(e).__name__, final=not retried)
+                    logger.info("↩️ Task %s aborted, %s", item.task_id, 'returned to queue' if retried else 'marked failed')
+                finally:
+                    self.held_leases.discard(item.task_id)
+                
+                await self.supervisor.maybe_recycle()
+                await self.browser_manager.throttle()
+            
+            self.progress.finish()
+            self.run_report.phase("scraping", time.time() - phase_start_time)
+            self.memory_profiler.checkpoint("scraping")
+            logger.info(f"📊 Queue status: {await queue.stats()}")
+            logger.info(f"📊 This worker scraped {self.products_scraped} valid products")
+            
+            success = True
+            # Once the queue is drained exactly one worker, the first to claim it, writes the
+            # combined export, streamed from the queue
+            holder = await queue.claim(EXPORT_CLAIM, worker_id, when_drained=True)
+            if holder:
+                logger.info(f"📦 Export already claimed by worker {holder}")
+            elif holder == '':
+                left = await queue.count([STATUS_PENDING, STATUS_LEASED])
+                logger.warning(f"📦 Nothing exported: {left} task(s) still pending or leased. The worker that "
+                               f"drains the queue exports, or run `resume --queue {self.config.work_queue_path}`")
+            else:
+                self.cpu_profiler.set_phase("export")
+                phase_start_time = time.time()
+                success = False
+                try:
+                    success = await self._export_queue_results(queue)
+                finally:
+                    if success:
+                        await queue.finish_claim(EXPORT_CLAIM, worker_id)
+                    else:
+                        # Failed or interrupted: let another worker or a rerun export instead
+                        await queue.unclaim(EXPORT_CLAIM, worker_id)
+                self.run_report.phase("export", time.time() - phase_start_time)
+            self.run_report.success = success
+            return success
+            
+        except Exception as e:
+            logger.error(f"❌ Error in queue worker {worker_id}: {e}")
+            return False
+        finally:
+            if heartbeat_task:
+                heartbeat_task.cancel()
+            # Each step on its own, so a failing one doesn't skip closing the browser or the reports
+            try:
+                # Hand back anything still leased so other workers don't wait for expiry
+                released = await queue.release(worker_id)
+                if released:
+                    logger.info(f"↩️ Released {released} unfinished task(s)")
+            except Exception as e:
+                logger.warning(f"⚠️ Could not release leases: {e}")
+            try:
+                await queue.close()
+            except Exception as e:
+                logger.warning(f"⚠️ Could not close the work queue: {e}")
+            try:
+                if self.sink_manager and not self.sink_manager.closed:
+                    self.sink_manager.close(success=False)
+            except Exception as e:
+                logger.warning(f"⚠️ Could not close the sinks: {e}")
+            await self.browser_manager.close_browser()
+            self._write_trace_index()
+            self._write_memory_profile()
+            self._write_cpu_profile()
+            self._write_run_report()
+            self._write_span_trace()
+            self._stop_metrics()
+    
+    async def _export_queue_results(self, queue: AsyncWorkQueue) -> bool:
+        """Write the combined export of all committed queue results"""
+        self._open_sinks()
+        if not self.sink_manager:
+            products = ProductBatch.from_products([ProductData.from_record(data) async for data in queue.iter_results()])
+            await self._prepare_export(products)
+            # Off the loop, so the heartbeat keeps renewing the export claim meanwhile
+            return await asyncio.get_running_loop().run_in_executor(None, self.csv_exporter.export_products, products)
+        async for data in queue.iter_results():
+            await self.sink_manager.submit(ProductData.from_record(data))
+        return await self.sink_manager.aclose(success=True)
+    
+    async def _heartbeat_loop(self, queue: AsyncWorkQueue, worker_id: str):
+        """Periodically extend the leases this worker holds"""
+        interval = max(self.config.lease_seconds / 3, 1.0)
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await queue.heartbeat(worker_id, list(self.held_leases))
+            except Exception as e:
+                logger.warning(f"⚠️ Heartbeat failed: {e}")
+    
+    async def _process_listing_task(self, queue: AsyncWorkQueue, worker_id: str, item: WorkItem):
+        """Collect product URLs for a category and enqueue them as product tasks"""
+        category = item.category
+        logger.info(f"📁 [{worker_id}] Processing listing task: {category}")
+        
+        # A recycled or respawned page starts blank, without the category menu
+        await self.browser_manager.ensure_on_site()
+        
+        if not await self.category_navigator.select_category(category):
+            await queue.fail(item.task_id, worker_id, f"could not select category '{category}'")
+            logger.warning(f"⚠️ Could not select category '{category}', returned to queue")
+            return
+        
+        category_url = await self.category_navigator.get_current_category_url()
+        product_urls = await self.product_scraper.scrape_category_products(category_url)
+        added = await queue.enqueue_many(KIND_PRODUCT, [(url, url, category) for url in set(product_urls)])
+        await queue.complete(item.task_id, worker_id)
+        logger.info(f"✅ Found {len(product_urls)} products in '{category}' ({added} new in queue)")
     
-    def get_scraped_products(self) -> List[ProductData]:
-        """Get the list of scraped products"""
+    async def _process_product_task(self, queue: AsyncWorkQueue, worker_id: str, item: WorkItem) -> bool:
+        """Scrape a single product task and commit its result (False if the product failed)"""
+        logger.info("🔍 [%s] Scraping product (attempt %d) from '%s': %s", worker_id, item.attempts, item.category, item.url)
+        start_time = time.time()
+        
+        metrics.ACTIVE_WORKERS.inc()
+        try:
+            product_data = await self.product_scraper.scrape_product(item.url, item.category)
+        except Exception as e:
+            retried = await queue.fail(item.task_id, worker_id, str(e))
+            self._product_failed(item.category, 'error', final=not retried)
+            logger.error("❌ Error scraping product: %s", e)
+            return False
+        finally:
+            metrics.ACTIVE_WORKERS.dec()
+            if self.time_budget:
+                self.time_budget.record_duration(time.time() - start_time)
+        
+        scrape_time = time.time() - start_time
+        if product_data.is_valid():
+            if await queue.complete(item.task_id, worker_id, product_data.to_record()):
+                # Results live in the queue; the final export streams them from there
+                self.products_scraped += 1
+                self._observe_product(product_data, item.category, scrape_time)
+                logger.info("✅ Committed in %.2fs: %s...", scrape_time, product_data.product_name[:50],
+                            extra={'url': item.url, 'category': item.category, 'seconds': round(scrape_time, 3)})
+            else:
+                logger.info("ℹ️ Result already committed by another worker")
+            return True
+        
+        retried = await queue.fail(item.task_id, worker_id, "invalid product data")
+        self._product_failed(item.category, 'invalid', final=not retried)
+        logger.warning("⚠️ Invalid product data (took %.2fs), %s", scrape_time, 'will retry' if retried else 'giving up')
+        return False
+    
+    async def _prepare_export(self, products: ProductBatch):
+        """Typed pack/price fields and formatted descriptions for the CSV export without sinks"""
+        products.parse_fields()
+        formatter = DataFormatter()
+        try:
+            descriptions = await formatter.format_descriptions_async(products.column('description'))
+        finally:
+            formatter.close()
+        products.replace_strings('description', descriptions)
+    
+    def get_scraped_products(self) -> ProductBatch:
+        """Get the list of scraped products (empty with streaming export, see get_scraped_count)"""
         return self.products
     
+    def get_scraped_count(self) -> int:
+        """Number of valid products scraped in this run"""
+        return self.products_scraped
+    
     def get_output_path(self) -> str:
-        """Get the path to the output CSV file"""
+        """Get the path to the output CSV file(s)"""
+        paths = self.sink_manager.output_paths() if self.sink_manager else []
+        if paths:
+            return ', '.join(paths)
         return self.csv_exporter.get_output_path()
 
 
@@ -276,4 +930,6 @@ class SyscoScraperOrchestrator:
 async def run_scraper(config: ScrapingConfig) -> bool:
     """Run the scraper with the given configuration"""
     orchestrator = SyscoScraperOrchestrator(config)
-    return await orchestrator.scrape_all_products()
+    if config.work_queue_path:
+        return await orchestrator.run_queue_worker()
+    return await orchestrator.run_scraper()
@@ -0,0 +1,163 @@
+"""
+Memory profiling for the Sysco scraper
+tracemalloc snapshots at phase boundaries and every N products, with browser RSS
+alongside, and a top-allocators diff report written at exit
+"""
+
+import json
+import linecache
+import logging
+import os
+import time
+import tracemalloc
+from typing import List, Optional
+from .models import ScrapingConfig
+from .resource_usage import browser_rss_bytes, process_rss_bytes
+
+logger = logging.getLogger(__name__)
+
+# Allocation sites listed per checkpoint and in the final report
+TOP_ALLOCATORS = 15
+
+# tracemalloc's own bookkeeping, the report's source lookups and import machinery are noise
+SNAPSHOT_FILTERS = [
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, linecache.__file__),  # Source lines read for the report itself
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<unknown>"),
+]
+
+
+def _mb(nbytes: int) -> float:
+    return round(nbytes / 1024 / 1024, 2)
+
+
+def _top_diff(current: tracemalloc.Snapshot, previous: tracemalloc.Snapshot, key: str, limit: int) -> List[dict]:
+    """Allocation sites ordered by growth between two snapshots"""
+    rows = []
+    for stat in current.compare_to(previous, key)[:limit]:
+        frame = stat.traceback[0]
+        rows.append({
+            'site': f"{frame.filename}:{frame.lineno}",
+            'code': linecache.getline(frame.filename, frame.lineno).strip(),
+            'size_diff_kb': round(stat.size_diff / 1024, 1),
+            'size_kb': round(stat.size / 1024, 1),
+            'count_diff': stat.count_diff,
+            'traceback': stat.traceback.format() if len(stat.traceback) > 1 else [],
+        })
+    return rows
+
+
+class MemoryProfiler:
+    """
+    Checkpointed tracemalloc profile of one run
+
+    Only the first and the most recent snapshot are kept in memory; each checkpoint
+    stores its traced/peak heap, process and browser RSS and the sites that grew since
+    the previous checkpoint. The report (memory_profile.json plus a readable .txt)
+    ranks allocators by growth over the whole run. Tracing slows Python code down,
+    so this is a diagnostic mode, off by default.
+    """
+
+    def __init__(self, config: ScrapingConfig):
+        self.enabled = config.profile_memory
+        self.every = config.profile_memory_every
+        self.frames = config.profile_memory_frames
+        self.directory = config.output_dir
+
+        self.checkpoints: List[dict] = []
+        self.products = 0
+        self.started = 0.0
+        self._first: Optional[tracemalloc.Snapshot] = None
+        self._previous: Optional[tracemalloc.Snapshot] = None
+        self._owns_tracing = False
+
+    def start(self):
+        """Begin tracing (no-op when disabled or already started)"""
+        if not self.enabled or self._first is not None:
+            return
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.frames)
+            self._owns_tracing = True
+        self.started = time.monotonic()
+        logger.info(f"🧠 Memory profiling on ({self.frames} frame(s), checkpoint every {self.every} products)")
+        self.checkpoint("start")
+
+    def checkpoint(self, label: str) -> Optional[dict]:
+        """Snapshot now; label names the phase that just ended (or products:N)"""
+        if not self.enabled or not tracemalloc.is_tracing():
+            return None
+        snapshot = tracemalloc.take_snapshot().filter_traces(SNAPSHOT_FILTERS)
+        traced, peak = tracemalloc.get_traced_memory()
+        entry = {
+            'label': label,
+            'elapsed_seconds': round(time.monotonic() - self.started, 2),
+            'products': self.products,
+            'traced_mb': _mb(traced),
+            'peak_mb': _mb(peak),
+            'python_rss_mb': _mb(process_rss_bytes()),
+            'browser_rss_mb': _mb(browser_rss_bytes()),
+            'top_growth': _top_diff(snapshot, self._previous, 'lineno', TOP_ALLOCATORS) if self._previous else [],
+        }
+        self.checkpoints.append(entry)
+        if self._first is None:
+            self._first = snapshot
+        self._previous = snapshot
+        tracemalloc.reset_peak()  # Each checkpoint's peak covers the interval since the last one
+        logger.debug(f"🧠 {label}: heap {entry['traced_mb']} MB (peak {entry['peak_mb']} MB), "
+                     f"browser RSS {entry['browser_rss_mb']} MB")
+        return entry
+
+    def product_finished(self):
+        """Count a finished product; checkpoints every `every` products"""
+        if not self.enabled:
+            return
+        self.products += 1
+        if self.every and self.products % self.every == 0:
+            self.checkpoint(f"products:{self.products}")
+
+    def report(self) -> dict:
+        """Checkpoint series plus the top allocators over the whole run"""
+        overall = []
+        if self._first is not None and self._previous is not None and self._previous is not self._first:
+            overall = _top_diff(self._previous, self._first, 'traceback' if self.frames > 1 else 'lineno',
+                                TOP_ALLOCATORS)
+        return {
+            'frames': self.frames,
+            'every_products': self.every,
+            'products': self.products,
+            'checkpoints': self.checkpoints,
+            'top_allocators': overall,
+        }
+
+    def stop(self) -> Optional[str]:
+        """Final checkpoint, write the report and stop tracing; returns the report path"""
+        if not self.enabled or self._first is None:
+            return None
+        self.checkpoint("end")
+        report = self.report()
+        if self._owns_tracing:
+            tracemalloc.stop()
+        self._first = self._previous = None
+
+        os.makedirs(self.directory, exist_ok=True)
+        path = os.path.join(self.directory, "memory_profile.json")
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        with open(os.path.join(self.directory, "memory_profile.txt"), 'w', encoding='utf-8') as f:
+            f.write(self.format_report(report))
+        return path
+
+    @staticmethod
+    def format_report(report: dict) -> str:
+        """Readable version of the report: checkpoint table, then the biggest allocators"""
+        lines = [f"{'checkpoint':<22}{'products':>9}{'heap MB':>10}{'peak MB':>10}{'RSS MB':>9}{'browser MB':>12}"]
+        for entry in report['checkpoints']:
+            lines.append(f"{entry['label']:<22}{entry['products']:>9}{entry['traced_mb']:>10.1f}{entry['peak_mb']:>10.1f}"
+                         f"{entry['python_rss_mb']:>9.1f}{entry['browser_rss_mb']:>12.1f}")
+        lines += ["", "Top allocators (growth from start to end):"]
+        for row in report['top_allocators']:
+            lines.append(f"{row['size_diff_kb']:>+12.1f} KB {row['count_diff']:>+9} blocks  {row['site']}  {row['code']}")
+            lines += [f"{'':>32}{frame}" for frame in row['traceback']]
+        return "\n".join(lines) + "\n"
@@ -0,0 +1,324 @@
+"""
+Metrics registry for the Sysco scraper
+Counters, gauges and histograms with Prometheus text exposition, an optional
+local HTTP endpoint and an asyncio event-loop lag monitor
+"""
+
+import asyncio
+import bisect
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+
+# Latency buckets (seconds) sized for page navigations and extractions
+DEFAULT_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 30.0, 60.0, 120.0)
+
+# Event-loop lag buckets (seconds): anything above a few ms means something is blocking the loop
+LAG_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+# Bytes per product page, from a few KB of API calls up to unblocked multi-MB pages
+BYTE_BUCKETS = (10_000, 50_000, 100_000, 250_000, 500_000, 1_000_000, 2_500_000, 5_000_000, 10_000_000)
+
+# Browser round trips per product
+RPC_BUCKETS = (5, 10, 20, 40, 60, 80, 120, 160, 250, 400)
+
+
+def _escape(value: str) -> str:
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = '') -> str:
+    parts = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return '{' + ','.join(parts) + '}' if parts else ''
+
+
+def _format_value(value: float) -> str:
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class _Metric:
+    """Shared label handling: children are created once per label set and cached"""
+
+    kind = 'untyped'
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[Tuple[str, ...], '_Metric'] = {}
+        self._lock = threading.Lock()
+
+    def labels(self, *values, **kwargs) -> '_Metric':
+        """Child metric for one label combination (cache the result on hot paths)"""
+        if kwargs:
+            values = tuple(str(kwargs[name]) for name in self.labelnames)
+        else:
+            values = tuple(str(value) for value in values)
+        child = self._children.get(values)
+        if child is None:
+            with self._lock:
+                child = self._children.get(values)
+                if child is None:
+                    child = self._new_child()
+                    self._children[values] = child
+        return child
+
+    def _new_child(self) -> '_Metric':
+        raise NotImplementedError
+
+    def _samples(self) -> List[Tuple[str, str, float]]:
+        """(suffix, label string, value) for this metric and all children"""
+        if not self.labelnames:
+            return self._own_samples('')
+        samples = []
+        for values, child in sorted(self._children.items()):
+            samples.extend(child._own_samples(_format_labels(self.labelnames, values)))
+        return samples
+
+    def _own_samples(self, labels: str) -> List[Tuple[str, str, float]]:
+        raise NotImplementedError
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        for suffix, labels, value in self._samples():
+            lines.append(f"{self.name}{suffix}{labels} {_format_value(value)}")
+        return '\n'.join(lines)
+
+
+class Counter(_Metric):
+    """Monotonically increasing count"""
+
+    kind = 'counter'
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self.value = 0.0
+
+    def _new_child(self) -> 'Counter':
+        return Counter(self.name, self.documentation)
+
+    def inc(self, amount: float = 1.0):
+        with self._lock:
+            self.value += amount
+
+    def _own_samples(self, labels: str):
+        return [('_total', labels, self.value)]
+
+
+class Gauge(_Metric):
+    """Value that goes up and down, or is read from a callback at scrape time"""
+
+    kind = 'gauge'
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self.value = 0.0
+        self._function: Optional[Callable[[], object]] = None
+
+    def _new_child(self) -> 'Gauge':
+        return Gauge(self.name, self.documentation)
+
+    def set(self, value: float):
+        self.value = value
+
+    def inc(self, amount: float = 1.0):
+        with self._lock:
+            self.value += amount
+
+    def dec(self, amount: float = 1.0):
+        self.inc(-amount)
+
+    def set_function(self, function: Optional[Callable[[], object]]):
+        """
+        Compute the value when metrics are collected instead of on the hot path
+
+        For labelled gauges the function returns {label value (or tuple): value}.
+        """
+        self._function = function
+
+    def _samples(self):
+        if self._function is None:
+            return super()._samples()
+        try:
+            result = self._function()
+        except Exception:
+            return []  # The source went away (e.g. sinks closed); report nothing
+        if not self.labelnames:
+            return [('', '', float(result))]
+        samples = []
+        for key, value in sorted(result.items()):
+            values = key if isinstance(key, tuple) else (key,)
+            samples.append(('', _format_labels(self.labelnames, values), float(value)))
+        return samples
+
+    def _own_samples(self, labels: str):
+        return [('', labels, self.value)]
+
+
+class Histogram(_Metric):
+    """Distribution of observations in cumulative buckets"""
+
+    kind = 'histogram'
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+
+    def _new_child(self) -> 'Histogram':
+        return Histogram(self.name, self.documentation, buckets=self.buckets)
+
+    def observe(self, value: float):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.sum += value
+
+    @property
+    def count(self) -> int:
+        return sum(self.counts)
+
+    def _own_samples(self, labels: str):
+        samples = []
+        cumulative = 0
+        inner = labels[1:-1] if labels else ''
+        for bound, count in zip(self.buckets + (float('inf'),), self.counts):
+            cumulative += count
+            le = f'le="{_format_value(bound)}"'
+            samples.append(('_bucket', '{' + (inner + ',' if inner else '') + le + '}', cumulative))
+        samples.append(('_sum', labels, self.sum))
+        samples.append(('_count', labels, cumulative))
+        return samples
+
+
+class MetricsRegistry:
+    """Collection of metrics rendered together"""
+
+    def __init__(self):
+        self.metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def _register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            existing = self.metrics.get(metric.name)
+            if existing is not None:
+                return existing
+            self.metrics[metric.name] = metric
+            return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self._register(Gauge(name, documentation, labelnames))
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def render(self) -> str:
+        """All metrics in Prometheus text exposition format"""
+        return '\n'.join(metric.render() for metric in self.metrics.values()) + '\n'
+
+    def dump(self, path: str):
+        """Write the current metrics to a file (atomically)"""
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path + '.tmp', 'w', encoding='utf-8') as f:
+            f.write(self.render())
+        os.replace(path + '.tmp', path)
+
+
+class MetricsServer:
+    """Serves GET /metrics from a daemon thread (bind to localhost unless told otherwise)"""
+
+    def __init__(self, registry: MetricsRegistry, port: int, host: str = '127.0.0.1'):
+        registry_ref = registry
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split('?')[0] not in ('/metrics', '/'):
+                    self.send_error(404)
+                    return
+                body = registry_ref.render().encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass  # Keep scrapes out of the scraper's output
+
+        self.server = ThreadingHTTPServer((host, port), Handler)
+        self.server.daemon_threads = True
+        self.thread = threading.Thread(target=self.server.serve_forever, name="metrics-http", daemon=True)
+
+    @property
+    def address(self) -> str:
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}/metrics"
+
+    def start(self) -> 'MetricsServer':
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+class EventLoopLagMonitor:
+    """Measures how late the event loop wakes a sleeping task (blocking work shows up as lag)"""
+
+    def __init__(self, histogram: Histogram, gauge: Gauge, interval: float = 0.25):
+        self.histogram = histogram
+        self.gauge = gauge
+        self.interval = interval
+        self.task: Optional[asyncio.Task] = None
+
+    def start(self):
+        if self.task is None:
+            self.task = asyncio.get_running_loop().create_task(self._run())
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            scheduled = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            lag = max(loop.time() - scheduled, 0.0)
+            self.histogram.observe(lag)
+            self.gauge.set(lag)
+
+    def stop(self):
+        if self.task:
+            self.task.cancel()
+            self.task = None
+
+
+# Default registry and the scraper's metrics
+REGISTRY = MetricsRegistry()
+
+PRODUCTS_SCRAPED = REGISTRY.counter('scraper_products_scraped', "Valid products scraped", ['category'])
+PRODUCTS_FAILED = REGISTRY.counter('scraper_products_failed', "Products that failed or were invalid", ['category', 'reason'])
+PRODUCT_STAGE_SECONDS = REGISTRY.histogram('scraper_product_stage_seconds', "Per-product stage latency", ['stage'])
+PRODUCT_SECONDS = REGISTRY.histogram('scraper_product_seconds', "End-to-end time per product task")
+QUEUE_DEPTH = REGISTRY.gauge('scraper_queue_depth', "Items waiting per queue", ['queue'])
+ACTIVE_WORKERS = REGISTRY.gauge('scraper_active_workers', "Product tasks currently in flight")
+BYTES_TRANSFERRED = REGISTRY.counter('scraper_network_bytes', "Bytes transferred by the browser (headers + body)", ['resource_type'])
+NETWORK_REQUESTS = REGISTRY.counter('scraper_network_requests', "Browser requests by outcome", ['resource_type', 'status'])
+PRODUCT_NETWORK_BYTES = REGISTRY.histogram('scraper_product_network_bytes', "Bytes transferred per product", buckets=BYTE_BUCKETS)
+PRODUCT_RPC_CALLS = REGISTRY.histogram('scraper_product_rpc_calls', "Browser round trips per product", buckets=RPC_BUCKETS)
+PRODUCT_RPC_SECONDS = REGISTRY.histogram('scraper_product_rpc_seconds', "Time spent in browser round trips per product")
+LOOP_LAG_SECONDS = REGISTRY.histogram('scraper_event_loop_lag_seconds', "Event-loop wake-up delay", buckets=LAG_BUCKETS)
+LOOP_LAG_CURRENT = REGISTRY.gauge('scraper_event_loop_lag_current_seconds', "Most recent event-loop wake-up delay")
+RUN_STARTED = REGISTRY.gauge('scraper_run_start_time_seconds', "Unix time the run started")
@@ -2,13 +2,27 @@
 Data models for the Sysco scraper
 """
 from dataclasses import dataclass, field
-from typing import List, Optional
+from typing import Dict, List, Optional
 import os
+import sys
+from .parsing import apply_parsed_fields
 
 
-@dataclass
+# Plain text fields of a product record
+TEXT_FIELDS = ['url', 'brand', 'product_name', 'packaging', 'sku', 'image_url', 'description', 'price', 'category']
+
+# Numeric fields parsed from packaging/price -> type used when reading them back from text
+TYPED_FIELDS = {
+    'price_cents': int,
+    'pack_count': int,
+    'pack_unit_quantity': float,
+    'unit_price_cents': float,
+}
+
+
+@dataclass(slots=True)
 class ProductData:
-    """Data model for a scraped product"""
+    """Data model for a scraped product (slotted: no per-instance __dict__)"""
     url: str = ""
     brand: str = ""
     product_name: str = ""
@@ -19,10 +33,26 @@ class ProductData:
     price: str = ""
     category: str = ""
     
-    # Performance optimization flags
-    enable_resource_blocking: bool = True
-    enable_async_scraping: bool = False
-    enable_performance_monitoring: bool = True
+    # Typed values parsed from packaging/price (see parsing.apply_parsed_fields)
+    price_cents: Optional[int] = None
+    pack_count: Optional[int] = None
+    pack_unit_quantity: Optional[float] = None  # Per inner unit, in pack_unit
+    pack_unit: str = ""                          # Normalized unit: lb, gal, ea (or the raw unit)
+    unit_price_cents: Optional[float] = None     # Price per pack_unit
+    
+    # Nested data carried by JSON outputs (not part of the flat CSV row)
+    categories: List[str] = field(default_factory=list)        # Every category the product was listed in
+    field_sources: Dict[str, str] = field(default_factory=dict)  # Field -> selector it was extracted with
+    timings: Dict[str, float] = field(default_factory=dict)      # Stage -> seconds
+    
+    def __post_init__(self):
+        self.intern_strings()
+    
+    def intern_strings(self):
+        """Share one string object per distinct brand/category/unit across all records"""
+        self.brand = sys.intern(self.brand)
+        self.category = sys.intern(self.category)
+        self.pack_unit = sys.intern(self.pack_unit)
     
     def is_valid(self) -> bool:
         """Check if product has minimum required data"""
@@ -43,21 +73,51 @@ class ProductData:
             'image_url': self.image_url,
             'description': self.description,
             'price': self.price,
-            'category': self.category
+            'category': self.category,
+            'price_cents': self.price_cents,
+            'pack_count': self.pack_count,
+            'pack_unit_quantity': self.pack_unit_quantity,
+            'pack_unit': self.pack_unit,
+            'unit_price_cents': self.unit_price_cents
         }
+    
+    def to_record(self) -> dict:
+        """Convert ProductData to a nested record for JSON outputs"""
+        record = self.to_dict()
+        record['categories'] = self.categories or ([self.category] if self.category else [])
+        record['provenance'] = self.field_sources
+        record['timings'] = {stage: round(seconds, 4) for stage, seconds in self.timings.items()}
+        return record
+    
+    @classmethod
+    def from_record(cls, record: dict) -> 'ProductData':
+        """Rebuild ProductData from to_dict()/to_record() output"""
+        product = cls(**{key: record.get(key) or '' for key in TEXT_FIELDS})
+        for key, cast in TYPED_FIELDS.items():
+            value = record.get(key)
+            # CSV rows carry the typed values as strings ('' for missing)
+            setattr(product, key, cast(value) if value not in (None, '') else None)
+        product.pack_unit = sys.intern(record.get('pack_unit') or '')
+        if 'price_cents' not in record:
+            apply_parsed_fields(product)  # Record written before the typed fields existed
+        product.categories = list(record.get('categories') or [])
+        product.field_sources = dict(record.get('provenance') or {})
+        product.timings = dict(record.get('timings') or {})
+        return product
 
 
 @dataclass
 class ScrapingConfig:
     """Configuration for the scraper"""
     zip_code: str = "97035"
+    base_url: str = "https://shop.sysco.com"  # Site root (a local stand-in for benchmarks)
     headless: bool = False
     categories_to_scrape: List[str] = field(default_factory=lambda: [
         "Meat & Seafood",
         "Dairy & Eggs", 
         "Canned & Dry"
     ])
-    max_products: int = 10  # Limit for testing, can be increased to 20 for production
+    max_products: Optional[int] = 10  # Limit for testing, can be increased to 20 for production
     output_dir: str = "output"
     output_file: str = "sysco_products.csv"
     
@@ -72,6 +132,74 @@ class ScrapingConfig:
     enable_performance_monitoring: bool = True
     async_batch_size: int = 3
     
+    # Time budget settings (None = no deadline, run until max_products is reached)
+    time_budget_seconds: Optional[float] = None
+    time_budget_reserve_seconds: float = 30.0  # Kept free at the end for flushing/export
+    
+    # Shared work queue settings (None = standalone run without a queue)
+    work_queue_path: Optional[str] = None
+    worker_id: Optional[str] = None
+    lease_seconds: float = 120.0     # Lease length, renewed by heartbeats while a task runs
+    max_task_attempts: int = 3
+    queue_poll_seconds: float = 5.0  # Idle wait while other workers still hold leases
+    
+    # Browser supervision settings
+    product_deadline_seconds: float = 90.0      # Hard limit per product/listing task
+    recycle_after_navigations: int = 200        # Fresh context every N tasks (0 = never)
+    browser_rss_limit_mb: Optional[int] = 2048  # Recycle when browser processes exceed this (PSS where available)
+    memory_check_seconds: float = 15.0          # Min time between browser memory samples
+    max_browser_restarts: int = 5
+    
+    # Streaming export settings
+    enable_streaming_export: bool = True  # Write records as they finish instead of holding them all
+    export_batch_size: int = 200          # Rows buffered before a write
+    export_flush_seconds: float = 5.0     # Max time between flush+fsync
+    export_rotate_mb: Optional[float] = None  # Start a new file after this size
+    export_rotate_rows: Optional[int] = None  # Start a new file after this many rows
+    enable_parquet_export: bool = False   # Partitioned Parquet next to the CSV (needs pyarrow)
+    parquet_row_group_size: int = 10000
+    catalog_db_path: Optional[str] = None  # SQLite catalog upserted by SKU across runs
+    enable_jsonl_export: bool = False      # Nested JSON Lines next to the CSV
+    jsonl_compression: str = "gzip"        # gzip, zstd (needs zstandard) or none
+    stdout_ndjson: bool = False            # Stream records to stdout as they are produced
+    sink_queue_size: int = 1000            # Per-sink backlog before scraping waits for the writer
+    sink_batch_size: int = 64              # Records per columnar batch handed to the sinks
+    
+    # Metrics settings
+    metrics_port: Optional[int] = None            # Serve Prometheus metrics on 127.0.0.1:<port>/metrics
+    metrics_file: Optional[str] = "metrics.prom"  # Metrics dump written to output_dir at exit (None = off)
+    
+    # Bandwidth budget (None = unmetered); demotes at the fraction, sheds new products when spent
+    bandwidth_budget_mb: Optional[float] = None
+    bandwidth_demote_fraction: float = 0.8
+    
+    # Tail-sampled tracing (traces of slow/failed products saved to output_dir/traces)
+    trace_sampling: bool = False
+    trace_percentile: float = 95.0   # Keep healthy products slower than this percentile...
+    trace_min_seconds: float = 15.0  # ...but never faster than this (also used until enough samples)
+    trace_max_count: int = 20
+    trace_max_mb: float = 200.0
+    
+    # Memory profiling (tracemalloc; report written to output_dir/memory_profile.json)
+    profile_memory: bool = False
+    profile_memory_every: int = 500   # Products between checkpoints (0 = phase boundaries only)
+    profile_memory_frames: int = 1    # Stack depth per allocation (more = slower, better attribution)
+    
+    # CPU profiling (sampling; folded stacks and summary written to output_dir/profile)
+    profile_cpu: bool = False
+    profile_cpu_interval_ms: float = 5.0
+    
+    # Playwright RPC accounting (round trips per method, call site and product; on in benchmarks)
+    rpc_accounting: bool = False
+    
+    # Span tracing (Chrome trace-event JSON written to output_dir/spans.trace.json)
+    span_tracing: bool = False
+    span_max_events: int = 500_000  # Later spans are counted but not kept
+    
+    # Logging settings
+    log_level: str = "quiet"  # quiet (progress line + warnings), info or debug
+    log_json: bool = False    # JSON lines instead of plain text
+    
     @property
     def output_path(self) -> str:
         """Get full output file path"""
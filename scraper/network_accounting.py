@@ -0,0 +1,163 @@
+"""
+Network byte accounting for the Sysco scraper
+Transfer sizes per resource type, host and allowed/blocked status, per product and
+per run, with an optional bandwidth budget that demotes and then sheds work
+"""
+
+import logging
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+from . import metrics
+
+logger = logging.getLogger(__name__)
+
+ALLOWED = 'allowed'
+BLOCKED = 'blocked'
+
+# Budget levels: normal, demoted (heavy resources blocked, no description expansion), shed (no new products)
+LEVEL_NORMAL = 'normal'
+LEVEL_DEMOTED = 'demoted'
+LEVEL_SHED = 'shed'
+
+# Resource types dropped once the budget is demoted (documents, scripts and API calls still load)
+DEMOTED_TYPES = {'image', 'media', 'font', 'stylesheet', 'texttrack', 'manifest', 'other'}
+
+# Typical transfer sizes (bytes) used to estimate savings before an allowed sample of the type exists
+TYPICAL_SIZES = {
+    'image': 40_000,
+    'media': 500_000,
+    'font': 35_000,
+    'stylesheet': 25_000,
+    'script': 60_000,
+    'xhr': 5_000,
+    'fetch': 5_000,
+    'document': 80_000,
+}
+
+# Heaviest products kept for the summary
+TOP_PRODUCTS = 10
+
+
+def host_of(url: str) -> str:
+    """Host part of a URL ('' for data: and other host-less URLs)"""
+    return urlsplit(url).hostname or ''
+
+
+class NetworkAccounting:
+    """
+    Per-request byte counters aggregated per product and per run
+
+    Requests are keyed by (resource_type, host, status). Blocked requests never
+    transfer anything, so their savings are estimated from the mean size of the
+    same resource type when it was allowed (or TYPICAL_SIZES).
+    """
+
+    def __init__(self, budget_bytes: Optional[int] = None, demote_fraction: float = 0.8):
+        self.budget_bytes = budget_bytes
+        self.demote_fraction = demote_fraction
+        self.requests: Dict[Tuple[str, str, str], List[int]] = {}  # key -> [requests, bytes]
+        self.total_bytes = 0
+        self.level = LEVEL_NORMAL
+
+        self.products = 0
+        self.product_bytes = 0
+        self.heaviest: List[Tuple[int, str]] = []  # (bytes, label), largest first
+
+    def record(self, resource_type: str, url: str, status: str, nbytes: int = 0):
+        """Count one request (nbytes = transfer size: headers + encoded body)"""
+        key = (resource_type, host_of(url), status)
+        entry = self.requests.get(key)
+        if entry is None:
+            entry = self.requests[key] = [0, 0]
+        entry[0] += 1
+        entry[1] += nbytes
+        metrics.NETWORK_REQUESTS.labels(resource_type, status).inc()
+        if nbytes:
+            self.total_bytes += nbytes
+            metrics.BYTES_TRANSFERRED.labels(resource_type).inc(nbytes)
+            self._update_level()
+
+    def _update_level(self):
+        if not self.budget_bytes:
+            return
+        if self.total_bytes >= self.budget_bytes:
+            level = LEVEL_SHED
+        elif self.total_bytes >= self.budget_bytes * self.demote_fraction:
+            level = LEVEL_DEMOTED
+        else:
+            level = LEVEL_NORMAL
+        if level != self.level:
+            self.level = level
+            spent_mb = self.total_bytes / 1024 / 1024
+            if level == LEVEL_DEMOTED:
+                logger.warning(f"📉 Bandwidth budget {self.demote_fraction:.0%} spent ({spent_mb:.1f} MB): "
+                               f"blocking heavy resources and skipping description expansion")
+            elif level == LEVEL_SHED:
+                logger.warning(f"📉 Bandwidth budget exhausted ({spent_mb:.1f} MB): no new products will be started")
+
+    # --- Budget decisions -------------------------------------------------
+
+    def should_block(self, resource_type: str) -> bool:
+        """Extra blocking once the budget is demoted"""
+        return self.level != LEVEL_NORMAL and resource_type in DEMOTED_TYPES
+
+    def allow_expansion(self) -> bool:
+        """Optional page interactions (e.g. 'Read More') that pull in more content"""
+        return self.level == LEVEL_NORMAL
+
+    def should_admit(self) -> bool:
+        """False once the budget is exhausted"""
+        return self.level != LEVEL_SHED
+
+    # --- Per-product windows ----------------------------------------------
+
+    def begin_product(self) -> int:
+        """Snapshot to pass to end_product() (overlapping products share their bytes)"""
+        return self.total_bytes
+
+    def end_product(self, label: str, start: int):
+        nbytes = self.total_bytes - start
+        self.products += 1
+        self.product_bytes += nbytes
+        metrics.PRODUCT_NETWORK_BYTES.observe(nbytes)
+        if len(self.heaviest) < TOP_PRODUCTS or nbytes > self.heaviest[-1][0]:
+            self.heaviest.append((nbytes, label))
+            self.heaviest.sort(reverse=True)
+            del self.heaviest[TOP_PRODUCTS:]
+
+    # --- Reporting ----------------------------------------------------------
+
+    def _totals(self, index: int) -> Dict[str, Dict[str, int]]:
+        """Aggregate by one part of the key (0 = resource type, 1 = host)"""
+        totals: Dict[str, Dict[str, int]] = {}
+        for key, (count, nbytes) in self.requests.items():
+            entry = totals.setdefault(key[index], {'allowed': 0, 'blocked': 0, 'bytes': 0})
+            entry[key[2]] += count
+            entry['bytes'] += nbytes
+        return totals
+
+    def estimated_savings(self) -> int:
+        """Bytes blocking is estimated to have saved"""
+        saved = 0
+        for resource_type, entry in self._totals(0).items():
+            if not entry['blocked']:
+                continue
+            mean = entry['bytes'] / entry['allowed'] if entry['allowed'] and entry['bytes'] else TYPICAL_SIZES.get(resource_type, 0)
+            saved += int(mean * entry['blocked'])
+        return saved
+
+    def summary(self) -> dict:
+        by_host = sorted(self._totals(1).items(), key=lambda item: item[1]['bytes'], reverse=True)
+        return {
+            'total_bytes': self.total_bytes,
+            'requests': sum(count for count, _ in self.requests.values()),
+            'blocked_requests': sum(count for key, (count, _) in self.requests.items() if key[2] == BLOCKED),
+            'estimated_bytes_saved': self.estimated_savings(),
+            'budget_bytes': self.budget_bytes,
+            'budget_level': self.level,
+            'by_resource_type': self._totals(0),
+            'top_hosts': dict(by_host[:10]),
+            'products': self.products,
+            'mean_bytes_per_product': round(self.product_bytes / self.products) if self.products else 0,
+            'heaviest_products': [{'label': label, 'bytes': nbytes} for nbytes, label in self.heaviest],
+        }
@@ -0,0 +1,207 @@
+"""
+Pack size and price parsing engine for the Sysco scraper
+Turns pack strings ('6/5 LB') and prices ('$45.99') into typed values and unit prices
+"""
+
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Iterable, List, NamedTuple, Optional, Sequence
+
+
+# Unit code -> (normalized unit, factor to the normalized unit)
+UNIT_FACTORS = {
+    # Weight, normalized to pounds
+    'LB': ('lb', 1.0), 'LBS': ('lb', 1.0), '#': ('lb', 1.0),
+    'OZ': ('lb', 1 / 16), 'G': ('lb', 1 / 453.59237), 'GM': ('lb', 1 / 453.59237),
+    'GR': ('lb', 1 / 453.59237), 'KG': ('lb', 1000 / 453.59237),
+    # Volume, normalized to gallons
+    'GAL': ('gal', 1.0), 'GA': ('gal', 1.0), 'QT': ('gal', 0.25), 'PT': ('gal', 0.125),
+    'FLOZ': ('gal', 1 / 128), 'FZ': ('gal', 1 / 128),
+    'L': ('gal', 0.264172052), 'LT': ('gal', 0.264172052), 'LTR': ('gal', 0.264172052),
+    'ML': ('gal', 0.000264172052),
+    # Counts, normalized to each
+    'EA': ('ea', 1.0), 'CT': ('ea', 1.0), 'PC': ('ea', 1.0), 'PCS': ('ea', 1.0),
+    'DZ': ('ea', 12.0), 'DOZ': ('ea', 12.0),
+}
+
+# '6/5 LB', '4/1 GAL', '12/32 OZ', '2/5#', '6/#10 CAN', '12 CT', '24/12 FL OZ'
+PACK_PATTERN = re.compile(
+    r'^\s*(?:(?P<count>\d+)\s*/\s*)?(?P<can>#)?\s*(?P<quantity>\d+(?:\.\d+)?)\s*'
+    r'(?P<unit>FL\.?\s*OZ|#|[A-Z]+)?',
+    re.IGNORECASE
+)
+
+# '$1,234.56', '$3.49 / LB', '$3.49 per lb'
+PRICE_PATTERN = re.compile(
+    r'\$?\s*(?P<whole>\d[\d,]*)(?:\.(?P<fraction>\d+))?(?:\s*(?:/|per)\s*(?P<unit>[A-Z]+))?',
+    re.IGNORECASE
+)
+
+
+class PackSize(NamedTuple):
+    """Parsed pack: count x quantity (in the normalized unit)"""
+    count: Optional[int]
+    unit_quantity: Optional[float]
+    unit: str
+
+    @property
+    def total_quantity(self) -> Optional[float]:
+        if self.count is None or self.unit_quantity is None:
+            return None
+        return self.count * self.unit_quantity
+
+
+class Price(NamedTuple):
+    """Parsed price in integer cents; per_unit is set for catch-weight prices like '$3.49/LB'"""
+    cents: Optional[int]
+    per_unit: str = ''
+    per_quantity: Optional[float] = None
+
+
+EMPTY_PACK = PackSize(None, None, '')
+EMPTY_PRICE = Price(None)
+
+
+def normalize_unit(code: str) -> tuple:
+    """Unit code -> (normalized unit, factor); unknown units are kept as-is with factor 1"""
+    code = re.sub(r'[\s.]', '', code.upper())
+    return UNIT_FACTORS.get(code, (code.lower(), 1.0))
+
+
+@lru_cache(maxsize=4096)
+def parse_pack(packaging: str) -> PackSize:
+    """
+    Parse a Sysco pack size string
+
+    '6/5 LB' -> PackSize(6, 5.0, 'lb'), '12/32 OZ' -> PackSize(12, 2.0, 'lb'),
+    '6/#10 CAN' -> PackSize(6, 1.0, 'can'). Pack strings repeat heavily, so results are cached.
+    """
+    match = PACK_PATTERN.match(packaging or '')
+    if not match or not (match.group('unit') or match.group('count')):
+        return EMPTY_PACK
+
+    count = int(match.group('count') or 1)
+    quantity = float(match.group('quantity'))
+    unit_code = match.group('unit') or 'EA'
+
+    if match.group('can') or unit_code.upper() == 'CAN':
+        # '#10' is a can size, not a weight ('#' is often stripped): count whole containers
+        return PackSize(count, 1.0, normalize_unit(unit_code)[0])
+
+    unit, factor = normalize_unit(unit_code)
+    return PackSize(count, quantity * factor, unit)
+
+
+@lru_cache(maxsize=4096)
+def parse_price(price: str) -> Price:
+    """'$1,234.56' -> Price(123456); '$3.49/LB' -> Price(349, 'lb', 1.0)"""
+    match = PRICE_PATTERN.search(price or '')
+    if not match:
+        return EMPTY_PRICE
+
+    # Integer arithmetic on the digits, so no float rounding creeps into cents
+    fraction = (match.group('fraction') or '').ljust(3, '0')
+    cents = int(match.group('whole').replace(',', '')) * 100 + int(fraction[:2])
+    if int(fraction[2]) >= 5:
+        cents += 1
+
+    # Only weight/volume/count units mean a per-unit price ('$45.99/CS' is the pack price)
+    unit_code = (match.group('unit') or '').upper()
+    if unit_code in UNIT_FACTORS:
+        unit, factor = UNIT_FACTORS[unit_code]
+        return Price(cents, unit, factor)
+    return Price(cents)
+
+
+def unit_price_cents(pack: PackSize, price: Price) -> Optional[float]:
+    """Price per normalized unit (cents) for one product"""
+    if price.cents is None:
+        return None
+    if price.per_unit:
+        return round(price.cents / price.per_quantity, 4) if price.per_quantity else None
+    total = pack.total_quantity
+    if not total:
+        return None
+    return round(price.cents / total, 4)
+
+
+def apply_parsed_fields(product) -> None:
+    """Fill the typed fields of a ProductData from its packaging and price text"""
+    pack = parse_pack(product.packaging)
+    price = parse_price(product.price)
+    product.pack_count = pack.count
+    product.pack_unit_quantity = round(pack.unit_quantity, 6) if pack.unit_quantity is not None else None
+    product.pack_unit = price.per_unit or pack.unit
+    product.price_cents = price.cents
+    product.unit_price_cents = unit_price_cents(pack, price)
+
+
+@dataclass
+class ParsedBatch:
+    """Column-oriented parse results (NumPy arrays when NumPy is installed, else lists with None)"""
+    pack_count: Sequence
+    pack_unit_quantity: Sequence
+    pack_unit: List[str]
+    price_cents: Sequence
+    unit_price_cents: Sequence
+
+    def __len__(self) -> int:
+        return len(self.pack_unit)
+
+
+@lru_cache(maxsize=None)
+def _numpy():
+    """NumPy if installed (optional, used for vectorized unit pricing over batches)"""
+    try:
+        import numpy  # Imported on first use; it costs more than the rest of the package
+    except ImportError:
+        return None
+    return numpy
+
+
+def parse_batch(packagings: Iterable[str], prices: Iterable[str]) -> ParsedBatch:
+    """
+    Parse whole columns of pack and price strings and compute unit prices in one pass
+
+    String parsing goes through the cached per-value parsers (distinct pack strings
+    are few), the unit-price arithmetic runs vectorized over the batch.
+    Missing values are NaN in the NumPy arrays (pack_count uses -1).
+    """
+    packs = [parse_pack(text) for text in packagings]
+    parsed_prices = [parse_price(text) for text in prices]
+    units = [price.per_unit or pack.unit for pack, price in zip(packs, parsed_prices)]
+
+    np = _numpy()
+    if np is None:
+        return ParsedBatch(
+            pack_count=[pack.count for pack in packs],
+            pack_unit_quantity=[pack.unit_quantity for pack in packs],
+            pack_unit=units,
+            price_cents=[price.cents for price in parsed_prices],
+            unit_price_cents=[unit_price_cents(pack, price) for pack, price in zip(packs, parsed_prices)],
+        )
+
+    nan = float('nan')
+    count = np.fromiter((-1 if pack.count is None else pack.count for pack in packs),
+                        dtype=np.int64, count=len(packs))
+    quantity = np.fromiter((nan if pack.unit_quantity is None else pack.unit_quantity for pack in packs),
+                           dtype=np.float64, count=len(packs))
+    cents = np.fromiter((nan if price.cents is None else price.cents for price in parsed_prices),
+                        dtype=np.float64, count=len(parsed_prices))
+    per_quantity = np.fromiter((price.per_quantity or nan for price in parsed_prices),
+                               dtype=np.float64, count=len(parsed_prices))
+
+    # Catch-weight prices are already per unit; everything else is divided by the pack total
+    total = np.where(count >= 0, count * quantity, nan)
+    divisor = np.where(np.isnan(per_quantity), total, per_quantity)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        unit_prices = np.where(divisor > 0, cents / divisor, nan).round(4)
+
+    return ParsedBatch(
+        pack_count=count,
+        pack_unit_quantity=quantity,
+        pack_unit=units,
+        price_cents=cents,
+        unit_price_cents=unit_prices,
+    )
@@ -0,0 +1,254 @@
+"""
+Columnar product batches for the Sysco scraper
+Holds many products as typed arrays instead of one Python object per record
+"""
+
+import json
+import sys
+from array import array
+from functools import lru_cache
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence
+from .models import ProductData
+from .parsing import parse_batch
+
+@lru_cache(maxsize=None)
+def _pyarrow():
+    """pyarrow, imported on first use (optional, only needed for to_arrow())"""
+    try:
+        import pyarrow
+    except ImportError:
+        raise ImportError("ProductBatch.to_arrow requires pyarrow (pip install pyarrow)") from None
+    return pyarrow
+
+
+class _StringColumn:
+    """UTF-8 bytes plus int32 offsets: the Arrow string layout, so to_arrow() wraps the buffers as-is"""
+
+    def __init__(self):
+        self.data = bytearray()
+        self.offsets = array('i', [0])
+
+    def append(self, value: str):
+        self.data += value.encode('utf-8')
+        self.offsets.append(len(self.data))
+
+    def __getitem__(self, index: int) -> str:
+        return self.data[self.offsets[index]:self.offsets[index + 1]].decode('utf-8')
+
+    def nbytes(self) -> int:
+        return len(self.data) + self.offsets.itemsize * len(self.offsets)
+
+    def to_arrow(self, length: int):
+        pa = _pyarrow()
+        return pa.Array.from_buffers(pa.string(), length, [None, pa.py_buffer(self.offsets), pa.py_buffer(self.data)])
+
+
+class _DictionaryColumn:
+    """Low-cardinality strings (brand, category, unit) as int32 codes into a list of distinct values"""
+
+    def __init__(self):
+        self.codes = array('i')
+        self.values: List[str] = []
+        self.index: Dict[str, int] = {}
+
+    def append(self, value: str):
+        code = self.index.get(value)
+        if code is None:
+            code = self.index[value] = len(self.values)
+            self.values.append(sys.intern(value))
+        self.codes.append(code)
+
+    def __getitem__(self, index: int) -> str:
+        return self.values[self.codes[index]]
+
+    def nbytes(self) -> int:
+        return self.codes.itemsize * len(self.codes) + sum(len(value) for value in self.values)
+
+    def to_arrow(self, length: int):
+        pa = _pyarrow()
+        indices = pa.Array.from_buffers(pa.int32(), length, [None, pa.py_buffer(self.codes)])
+        return pa.DictionaryArray.from_arrays(indices, pa.array(self.values, type=pa.string()))
+
+
+class _NumericColumn:
+    """Nullable numbers as a typed array plus an Arrow-style validity bitmap"""
+
+    def __init__(self, typecode: str):
+        self.typecode = typecode
+        self.values = array(typecode)
+        self.validity = bytearray()
+        self.null_count = 0
+
+    def append(self, value):
+        position = len(self.values)
+        if position % 8 == 0:
+            self.validity.append(0)
+        if value is None:
+            self.values.append(0)
+            self.null_count += 1
+        else:
+            self.values.append(value)
+            self.validity[position // 8] |= 1 << (position % 8)
+
+    @classmethod
+    def from_values(cls, typecode: str, values) -> '_NumericColumn':
+        """Column from a list (None = missing) or a NumPy array (NaN, or -1 for counts = missing)"""
+        column = cls(typecode)
+        if not hasattr(values, 'dtype'):
+            for value in values:
+                column.append(value)
+            return column
+        import numpy as np  # Installed, since parse_batch returned arrays
+        valid = values >= 0 if values.dtype.kind == 'i' else ~np.isnan(values)
+        data = np.where(valid, values, 0).astype(np.int64 if typecode == 'q' else np.float64)
+        column.values.frombytes(data.tobytes())
+        column.validity = bytearray(np.packbits(valid, bitorder='little').tobytes())
+        column.null_count = int(len(values) - np.count_nonzero(valid))
+        return column
+
+    def __getitem__(self, index: int):
+        if not self.validity[index // 8] & (1 << (index % 8)):
+            return None
+        return self.values[index]
+
+    def nbytes(self) -> int:
+        return self.values.itemsize * len(self.values) + len(self.validity)
+
+    def to_arrow(self, length: int):
+        pa = _pyarrow()
+        arrow_type = pa.int64() if self.typecode == 'q' else pa.float64()
+        validity = pa.py_buffer(self.validity) if self.null_count else None
+        return pa.Array.from_buffers(arrow_type, length, [validity, pa.py_buffer(self.values)], null_count=self.null_count)
+
+
+# Column name -> column factory, in output order
+COLUMNS = {
+    'url': _StringColumn,
+    'brand': _DictionaryColumn,
+    'product_name': _StringColumn,
+    'packaging': _StringColumn,
+    'sku': _StringColumn,
+    'image_url': _StringColumn,
+    'description': _StringColumn,
+    'price': _StringColumn,
+    'category': _DictionaryColumn,
+    'price_cents': lambda: _NumericColumn('q'),
+    'pack_count': lambda: _NumericColumn('q'),
+    'pack_unit_quantity': lambda: _NumericColumn('d'),
+    'pack_unit': _DictionaryColumn,
+    'unit_price_cents': lambda: _NumericColumn('d'),
+}
+
+
+class ProductBatch:
+    """
+    Column-oriented container of products
+
+    Strings live in one contiguous buffer per column, brand/category/unit as dictionary
+    codes and numbers in typed arrays, so a batch costs a few bytes per field instead
+    of a Python object per record. Nested data (categories, provenance, timings) is kept
+    as compact JSON and only decoded when rows are read back as ProductData.
+    """
+
+    def __init__(self):
+        self.columns = {name: factory() for name, factory in COLUMNS.items()}
+        self.extras = _StringColumn()
+        self.length = 0
+
+    @classmethod
+    def from_products(cls, products: Iterable[ProductData]) -> 'ProductBatch':
+        batch = cls()
+        batch.extend(products)
+        return batch
+
+    def append(self, product: ProductData):
+        for name, column in self.columns.items():
+            column.append(getattr(product, name))
+        extras = {}
+        if product.categories:
+            extras['categories'] = product.categories
+        if product.field_sources:
+            extras['provenance'] = product.field_sources
+        if product.timings:
+            extras['timings'] = product.timings
+        self.extras.append(json.dumps(extras, separators=(',', ':')) if extras else '')
+        self.length += 1
+
+    def extend(self, products: Iterable[ProductData]):
+        for product in products:
+            self.append(product)
+
+    def parse_fields(self):
+        """
+        Fill the typed columns (price_cents, pack_*, unit_price_cents) from the packaging
+        and price columns in one parse_batch pass, vectorized when NumPy is installed
+        """
+        if not self.length:
+            return
+        parsed = parse_batch(self.column('packaging'), self.column('price'))
+        quantity = parsed.pack_unit_quantity
+        if hasattr(quantity, 'round'):
+            quantity = quantity.round(6)
+        else:
+            quantity = [round(value, 6) if value is not None else None for value in quantity]
+        self.columns['pack_count'] = _NumericColumn.from_values('q', parsed.pack_count)
+        self.columns['pack_unit_quantity'] = _NumericColumn.from_values('d', quantity)
+        self.columns['price_cents'] = _NumericColumn.from_values('q', parsed.price_cents)
+        self.columns['unit_price_cents'] = _NumericColumn.from_values('d', parsed.unit_price_cents)
+        units = _DictionaryColumn()
+        for unit in parsed.pack_unit:
+            units.append(unit)
+        self.columns['pack_unit'] = units
+
+    def replace_strings(self, name: str, values: Sequence[str]):
+        """Swap a plain string column for new values (e.g. formatted descriptions)"""
+        column = _StringColumn()
+        for value in values:
+            column.append(value)
+        self.columns[name] = column
+
+    def __len__(self) -> int:
+        return self.length
+
+    def __bool__(self) -> bool:
+        return self.length > 0
+
+    def row(self, index: int) -> ProductData:
+        """Materialize one row as a ProductData"""
+        if not 0 <= index < self.length:
+            raise IndexError(index)
+        product = ProductData(**{name: column[index] for name, column in self.columns.items()})
+        extras = self.extras[index]
+        if extras:
+            extras = json.loads(extras)
+            product.categories = extras.get('categories', [])
+            product.field_sources = extras.get('provenance', {})
+            product.timings = extras.get('timings', {})
+        return product
+
+    def __getitem__(self, index: int) -> ProductData:
+        return self.row(index if index >= 0 else self.length + index)
+
+    def __iter__(self) -> Iterator[ProductData]:
+        for index in range(self.length):
+            yield self.row(index)
+
+    def column(self, name: str) -> list:
+        """Values of one column as a Python list"""
+        column = self.columns[name]
+        return [column[index] for index in range(self.length)]
+
+    def nbytes(self) -> int:
+        """Approximate memory held by the column buffers"""
+        return sum(column.nbytes() for column in self.columns.values()) + self.extras.nbytes()
+
+    def to_arrow(self, columns: Optional[List[str]] = None):
+        """
+        Wrap the columns as a pyarrow RecordBatch without copying the string/number buffers
+
+        The Arrow arrays are views of the batch's buffers; appending to the batch while
+        they are alive raises BufferError.
+        """
+        pa = _pyarrow()
+        names = columns or list(self.columns)
+        return pa.RecordBatch.from_arrays([self.columns[name].to_arrow(self.length) for name in names], names=names)
@@ -3,18 +3,19 @@ Product scraping coordinator for the Sysco scraper
 Coordinates individual product extraction and category URL collection
 """
 
-from typing import List
+from typing import List, Optional
 from playwright.async_api import Page
 from .models import ProductData
 from .extractors import ProductExtractor, CategoryExtractor
+from .network_accounting import NetworkAccounting
 
 
 class ProductScraper:
     """Coordinates product data extraction using specialized extractors"""
     
-    def __init__(self, page: Page):
+    def __init__(self, page: Page, network: Optional[NetworkAccounting] = None):
         self.page = page
-        self.product_extractor = ProductExtractor(page)
+        self.product_extractor = ProductExtractor(page, network)
         self.category_extractor = CategoryExtractor(page)
     
     async def scrape_product(self, product_url: str, category: str) -> ProductData:
@@ -0,0 +1,192 @@
+"""
+Process resource usage helpers for the Sysco scraper
+Reads RSS/PSS of the scraper and its browser child processes without extra dependencies
+"""
+
+import glob
+import os
+from typing import Dict, List, Optional
+
+try:
+    import psutil  # Optional, used when /proc is not available (macOS, Windows)
+except ImportError:
+    psutil = None
+
+
+PROC_ROOT = '/proc'
+
+
+def _proc_available() -> bool:
+    return os.path.isdir(os.path.join(PROC_ROOT, str(os.getpid())))
+
+
+def _read_status(pid: int) -> Dict[str, str]:
+    """Parse /proc/<pid>/status into a dict"""
+    status = {}
+    with open(os.path.join(PROC_ROOT, str(pid), 'status'), encoding='utf-8') as f:
+        for line in f:
+            key, _, value = line.partition(':')
+            status[key] = value.strip()
+    return status
+
+
+def _direct_children(pid: int) -> Optional[List[int]]:
+    """Children of pid from /proc/<pid>/task/*/children (None if the kernel doesn't expose it)"""
+    files = glob.glob(os.path.join(PROC_ROOT, str(pid), 'task', '*', 'children'))
+    if not files:
+        return None
+    children = []
+    for path in files:
+        try:
+            with open(path, encoding='utf-8') as f:
+                children.extend(int(child) for child in f.read().split())
+        except (OSError, ValueError):
+            continue  # Thread exited while reading
+    return children
+
+
+def child_pids(pid: Optional[int] = None) -> List[int]:
+    """All descendant process IDs of pid (default: this process)"""
+    pid = pid or os.getpid()
+
+    if _proc_available() and _direct_children(pid) is not None:
+        # Walk the tree through the children files instead of scanning all of /proc
+        descendants, stack = [], [pid]
+        while stack:
+            for child in _direct_children(stack.pop()) or []:
+                descendants.append(child)
+                stack.append(child)
+        return descendants
+
+    if _proc_available():
+        parents: Dict[int, List[int]] = {}
+        for entry in os.listdir(PROC_ROOT):
+            if not entry.isdigit():
+                continue
+            try:
+                ppid = int(_read_status(int(entry)).get('PPid', '0'))
+            except (OSError, ValueError):
+                continue  # Process exited while scanning
+            parents.setdefault(ppid, []).append(int(entry))
+
+        descendants, stack = [], [pid]
+        while stack:
+            for child in parents.get(stack.pop(), []):
+                descendants.append(child)
+                stack.append(child)
+        return descendants
+
+    if psutil:
+        try:
+            return [child.pid for child in psutil.Process(pid).children(recursive=True)]
+        except psutil.Error:
+            return []
+    return []
+
+
+def process_rss_bytes(pid: Optional[int] = None) -> int:
+    """Resident set size of a single process in bytes (0 if unknown)"""
+    pid = pid or os.getpid()
+    try:
+        if _proc_available():
+            rss_kb = _read_status(pid).get('VmRSS', '0 kB').split()[0]
+            return int(rss_kb) * 1024
+        if psutil:
+            return psutil.Process(pid).memory_info().rss
+    except Exception:
+        pass  # Process exited or is not accessible
+    return 0
+
+
+def process_pss_bytes(pid: int) -> int:
+    """
+    Proportional set size of a process in bytes, falling back to RSS where PSS is unavailable
+
+    PSS splits shared pages between the processes mapping them, so summing it over the
+    browser's processes doesn't count shared libraries and shared memory once per process.
+    The RSS fallback (macOS, Windows, kernels without smaps_rollup) overstates the total.
+    """
+    try:
+        with open(os.path.join(PROC_ROOT, str(pid), 'smaps_rollup'), encoding='utf-8') as f:
+            for line in f:
+                if line.startswith('Pss:'):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    return process_rss_bytes(pid)
+
+
+def _cmdline(pid: int) -> str:
+    try:
+        if _proc_available():
+            with open(os.path.join(PROC_ROOT, str(pid), 'cmdline'), 'rb') as f:
+                return f.read().replace(b'\0', b' ').decode('utf-8', 'replace')
+        if psutil:
+            return ' '.join(psutil.Process(pid).cmdline())
+    except Exception:
+        pass  # Process exited or is not accessible
+    return ''
+
+
+def playwright_driver_pids() -> List[int]:
+    """Direct children of this process running the Playwright driver (the browsers run below it)"""
+    if _proc_available():
+        children = _direct_children(os.getpid())
+        if children is None:
+            children = [pid for pid in child_pids() if _read_ppid(pid) == os.getpid()]
+    elif psutil:
+        try:
+            children = [child.pid for child in psutil.Process().children()]
+        except psutil.Error:
+            children = []
+    else:
+        children = []
+    return [pid for pid in children if 'playwright' in _cmdline(pid).lower()]
+
+
+def _read_ppid(pid: int) -> int:
+    try:
+        return int(_read_status(pid).get('PPid', '0'))
+    except (OSError, ValueError):
+        return 0
+
+
+def browser_pids(drivers: Optional[List[int]] = None) -> List[int]:
+    """
+    The Playwright driver(s) and their descendants
+
+    Pass cached driver PIDs to skip looking them up. Falls back to every child
+    process when no driver can be identified.
+    """
+    drivers = drivers if drivers is not None else playwright_driver_pids()
+    if not drivers:
+        return child_pids()
+    pids = []
+    for driver in drivers:
+        pids.append(driver)
+        pids.extend(child_pids(driver))
+    return pids
+
+
+def browser_memory_bytes(pids: List[int]) -> int:
+    """Combined PSS (see process_pss_bytes) of the given browser processes"""
+    return sum(process_pss_bytes(pid) for pid in pids)
+
+
+def browser_rss_bytes() -> int:
+    """Combined RSS of all child processes (Playwright driver and browser processes)"""
+    return sum(process_rss_bytes(pid) for pid in child_pids())
+
+
+def open_fd_count() -> int:
+    """Number of open file descriptors/handles of this process (0 if unknown)"""
+    fd_dir = os.path.join(PROC_ROOT, str(os.getpid()), 'fd')
+    try:
+        if os.path.isdir(fd_dir):
+            return len(os.listdir(fd_dir))
+        if psutil:
+            process = psutil.Process()
+            return process.num_fds() if hasattr(process, 'num_fds') else process.num_handles()
+    except Exception:
+        pass
+    return 0
@@ -0,0 +1,186 @@
+"""
+Playwright RPC accounting for the Sysco scraper
+A thin proxy around the Page handed to the extractors and the navigator that counts
+and times every browser round trip by method and call site, per product and per run
+"""
+
+import contextvars
+import inspect
+import logging
+import os
+import sys
+import time
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+from . import metrics
+
+try:
+    from playwright.async_api import ElementHandle, Frame, FrameLocator, JSHandle, Keyboard, Locator, Mouse
+    _PROXIED_TYPES: Tuple[type, ...] = (ElementHandle, Frame, FrameLocator, JSHandle, Keyboard, Locator, Mouse)
+except ImportError:  # Without Playwright only the page itself is proxied
+    _PROXIED_TYPES = ()
+
+logger = logging.getLogger(__name__)
+
+# Products with the most round trips kept for the summary
+HEAVIEST_PRODUCTS = 10
+
+# Product whose round trips the current task is making (set by begin_product)
+_current_product: contextvars.ContextVar[Optional['ProductRPC']] = contextvars.ContextVar('rpc_product', default=None)
+
+
+class ProductRPC:
+    """Round trips of one product"""
+
+    __slots__ = ('label', 'calls', 'seconds', 'token')
+
+    def __init__(self, label: str):
+        self.label = label
+        self.calls = 0
+        self.seconds = 0.0
+        self.token = None
+
+
+class RPCAccounting:
+    """
+    Counts and times browser round trips by method and call site
+
+    Calls are attributed to the product of the current task through a context
+    variable, so concurrent products on a shared page are counted separately.
+    Call sites are the extractor/navigator line that made the call.
+    """
+
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self.calls = 0
+        self.seconds = 0.0
+        self.by_method: Dict[str, List[float]] = defaultdict(lambda: [0, 0.0])
+        self.by_site: Dict[Tuple[str, str], List[float]] = defaultdict(lambda: [0, 0.0])
+        self.products = 0
+        self.product_calls = 0
+        self.heaviest: List[Tuple[int, float, str]] = []
+
+    # --- Wrapping ---------------------------------------------------------
+
+    def wrap(self, target):
+        """Instrumented view of a Page (or handle); the target itself when disabled"""
+        if not self.enabled or target is None or isinstance(target, InstrumentedObject):
+            return target
+        return InstrumentedObject(target, self)
+
+    def _wrap_result(self, result):
+        if _PROXIED_TYPES and isinstance(result, _PROXIED_TYPES):
+            return InstrumentedObject(result, self)
+        if isinstance(result, list) and result and _PROXIED_TYPES and isinstance(result[0], _PROXIED_TYPES):
+            return [InstrumentedObject(item, self) for item in result]
+        return result
+
+    def record(self, method: str, site: str, seconds: float):
+        self.calls += 1
+        self.seconds += seconds
+        totals = self.by_method[method]
+        totals[0] += 1
+        totals[1] += seconds
+        totals = self.by_site[(site, method)]
+        totals[0] += 1
+        totals[1] += seconds
+        product = _current_product.get()
+        if product is not None:
+            product.calls += 1
+            product.seconds += seconds
+
+    # --- Per-product windows ----------------------------------------------
+
+    def begin_product(self, label: str) -> Optional[ProductRPC]:
+        if not self.enabled:
+            return None
+        product = ProductRPC(label)
+        product.token = _current_product.set(product)
+        return product
+
+    def end_product(self, product: Optional[ProductRPC]):
+        """Close a product window: per-product metrics and the heaviest list"""
+        if product is None:
+            return
+        _current_product.reset(product.token)
+        self.products += 1
+        self.product_calls += product.calls
+        metrics.PRODUCT_RPC_CALLS.observe(product.calls)
+        metrics.PRODUCT_RPC_SECONDS.observe(product.seconds)
+        self.heaviest.append((product.calls, round(product.seconds, 3), product.label))
+        if len(self.heaviest) > HEAVIEST_PRODUCTS * 4:
+            self.heaviest = sorted(self.heaviest, reverse=True)[:HEAVIEST_PRODUCTS]
+
+    # --- Reporting --------------------------------------------------------
+
+    def summary(self, top: int = 15) -> dict:
+        """Round trips per method, the chattiest call sites and the heaviest products"""
+        sites = sorted(self.by_site.items(), key=lambda item: item[1][1], reverse=True)[:top]
+        methods = sorted(self.by_method.items(), key=lambda item: item[1][1], reverse=True)
+        return {
+            'enabled': self.enabled,
+            'calls': self.calls,
+            'seconds': round(self.seconds, 3),
+            'products': self.products,
+            'mean_calls_per_product': round(self.product_calls / self.products, 1) if self.products else 0.0,
+            'by_method': {method: {'calls': int(calls), 'seconds': round(seconds, 3)}
+                          for method, (calls, seconds) in methods},
+            'chattiest_sites': [{'site': site, 'method': method, 'calls': int(calls), 'seconds': round(seconds, 3),
+                                 'mean_ms': round(seconds / calls * 1000, 2) if calls else 0.0}
+                                for (site, method), (calls, seconds) in sites],
+            'heaviest_products': [{'label': label, 'calls': calls, 'seconds': seconds}
+                                  for calls, seconds, label in sorted(self.heaviest, reverse=True)[:HEAVIEST_PRODUCTS]],
+        }
+
+
+class InstrumentedObject:
+    """
+    Proxy that times awaited methods of a Playwright object
+
+    Attribute reads pass through; coroutine methods are timed and charged to the
+    caller's file:function:line; handles and locators they return (or that sync
+    methods such as locator() return) are proxied as well.
+    """
+
+    __slots__ = ('_target', '_accounting', '_kind')
+
+    def __init__(self, target, accounting: RPCAccounting):
+        object.__setattr__(self, '_target', target)
+        object.__setattr__(self, '_accounting', accounting)
+        object.__setattr__(self, '_kind', type(target).__name__)
+
+    def __getattr__(self, name: str):
+        value = getattr(self._target, name)
+        accounting = self._accounting
+        if name.startswith('_') or not callable(value):
+            return accounting._wrap_result(value)  # e.g. page.keyboard, page.mouse
+        method = f"{self._kind}.{name}"
+
+        if inspect.iscoroutinefunction(value):
+            async def timed(*args, **kwargs):
+                caller = sys._getframe(1).f_code
+                site = f"{os.path.basename(caller.co_filename)}:{caller.co_name}:{sys._getframe(1).f_lineno}"
+                args = [arg._target if isinstance(arg, InstrumentedObject) else arg for arg in args]
+                started = time.perf_counter()
+                try:
+                    result = await value(*args, **kwargs)
+                finally:
+                    accounting.record(method, site, time.perf_counter() - started)
+                return accounting._wrap_result(result)
+            return timed
+
+        def passthrough(*args, **kwargs):
+            return accounting._wrap_result(value(*args, **kwargs))
+        return passthrough
+
+    def __setattr__(self, name: str, value):
+        setattr(self._target, name, value)
+
+    def __eq__(self, other):
+        return self._target == (other._target if isinstance(other, InstrumentedObject) else other)
+
+    def __hash__(self):
+        return hash(self._target)
+
+    def __repr__(self) -> str:
+        return f"<Instrumented {self._target!r}>"
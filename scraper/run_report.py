@@ -0,0 +1,248 @@
+"""
+Run reports for the Sysco scraper
+A JSON report per run (config, phases, per-category counts, throughput, latency,
+retries, failures, field coverage, bytes) and a trend comparison across runs
+
+    python -m scraper.run_report compare                # last 10 runs in output/reports
+    python -m scraper.run_report compare --last 5 --tolerance 0.15
+"""
+
+import argparse
+import glob
+import json
+import logging
+import os
+import statistics
+import sys
+import time
+from array import array
+from collections import Counter
+from dataclasses import asdict
+from typing import Dict, List, Optional, Tuple
+from .models import ProductData, ScrapingConfig
+
+logger = logging.getLogger(__name__)
+
+REPORT_VERSION = 1
+
+# Fields whose fill rate is tracked (url and category are always set on valid products)
+COVERAGE_FIELDS = ['brand', 'product_name', 'packaging', 'sku', 'image_url', 'description', 'price']
+
+# Trend metric -> True if higher is better
+TREND_METRICS = {
+    'products_per_minute': True,
+    'p95_seconds': False,
+    'field_coverage': True,
+    'failure_rate': False,
+}
+
+
+def percentile(values, pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    position = (len(ordered) - 1) * pct / 100
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+class RunReport:
+    """Collects per-run numbers while scraping; `build()` returns the JSON-ready report"""
+
+    def __init__(self, config: ScrapingConfig, mode: str):
+        self.config = config
+        self.mode = mode
+        self.started_at = time.time()
+        self.success = False
+        self.phases: Dict[str, float] = {}
+        self.scraped: Counter = Counter()    # Category -> valid products
+        self.failed: Counter = Counter()     # Category -> products given up on
+        self.failures: Counter = Counter()   # Reason -> final failures
+        self.retries: Counter = Counter()    # Reason -> attempts that were retried
+        self.filled: Counter = Counter()     # Field -> valid products with a value
+        self.latencies = array('d')          # Seconds per valid product
+
+    def phase(self, name: str, seconds: float):
+        self.phases[name] = round(seconds, 3)
+
+    def product_ok(self, product: ProductData, category: str, seconds: float):
+        self.scraped[category] += 1
+        self.latencies.append(seconds)
+        for name in COVERAGE_FIELDS:
+            if getattr(product, name):
+                self.filled[name] += 1
+
+    def product_failed(self, category: str, reason: str, final: bool = True):
+        if final:
+            self.failed[category] += 1
+            self.failures[reason] += 1
+        else:
+            self.retries[reason] += 1
+
+    def build(self, extra: Optional[dict] = None) -> dict:
+        """The report; `extra` adds component summaries (network, supervisor, traces, ...)"""
+        finished_at = time.time()
+        products = sum(self.scraped.values())
+        failed = sum(self.failed.values())
+        scraping_seconds = self.phases.get('scraping', finished_at - self.started_at)
+        coverage = {name: round(self.filled[name] / products, 4) if products else 0.0 for name in COVERAGE_FIELDS}
+        categories = sorted(set(self.scraped) | set(self.failed))
+        report = {
+            'version': REPORT_VERSION,
+            'mode': self.mode,
+            'started_at': time.strftime('%Y-%m-%dT%H:%M:%S', time.localtime(self.started_at)),
+            'duration_seconds': round(finished_at - self.started_at, 3),
+            'success': bool(self.success),
+            'config': asdict(self.config),
+            'phases': dict(self.phases),
+            'products': products,
+            'failed': failed,
+            'categories': {category: {'scraped': self.scraped[category], 'failed': self.failed[category]}
+                           for category in categories},
+            'throughput': {
+                'products_per_minute': round(products / scraping_seconds * 60, 3) if scraping_seconds else 0.0,
+                'failure_rate': round(failed / (products + failed), 4) if products + failed else 0.0,
+            },
+            'latency': {
+                'mean_seconds': round(statistics.fmean(self.latencies), 3) if self.latencies else 0.0,
+                'p50_seconds': round(percentile(self.latencies, 50), 3),
+                'p90_seconds': round(percentile(self.latencies, 90), 3),
+                'p95_seconds': round(percentile(self.latencies, 95), 3),
+                'p99_seconds': round(percentile(self.latencies, 99), 3),
+                'max_seconds': round(max(self.latencies), 3) if self.latencies else 0.0,
+            },
+            'retries': dict(self.retries),
+            'failures': dict(self.failures),
+            'field_coverage': coverage,
+        }
+        report.update(extra or {})
+        return report
+
+    def write(self, extra: Optional[dict] = None) -> str:
+        """Write reports/run-<timestamp>.json under the output directory; returns the path"""
+        directory = os.path.join(self.config.output_dir, "reports")
+        os.makedirs(directory, exist_ok=True)
+        stamp = time.strftime('%Y%m%d-%H%M%S', time.localtime(self.started_at))
+        path = os.path.join(directory, f"run-{stamp}-{os.getpid()}.json")
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.build(extra), f, indent=2, default=str)
+        return path
+
+
+# --- Cross-run comparison -------------------------------------------------
+
+def load_reports(directory: str, last: int) -> List[dict]:
+    """The last N reports in a directory, oldest first"""
+    reports = []
+    for path in sorted(glob.glob(os.path.join(directory, "run-*.json")))[-last:]:
+        try:
+            with open(path, encoding='utf-8') as f:
+                report = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"⚠️ Skipping unreadable report {path}: {e}")
+            continue
+        report['_path'] = path
+        reports.append(report)
+    return reports
+
+
+def trend_values(report: dict) -> Dict[str, float]:
+    coverage = report.get('field_coverage') or {}
+    return {
+        'products_per_minute': report.get('throughput', {}).get('products_per_minute', 0.0),
+        'p95_seconds': report.get('latency', {}).get('p95_seconds', 0.0),
+        'field_coverage': round(statistics.fmean(coverage.values()), 4) if coverage else 0.0,
+        'failure_rate': report.get('throughput', {}).get('failure_rate', 0.0),
+    }
+
+
+def find_regressions(reports: List[dict], tolerance: float,
+                     coverage_tolerance: float) -> Tuple[List[str], List[dict]]:
+    """
+    Compare the newest run with the median of the earlier successful runs in the same mode
+
+    A newest run that failed or produced nothing is itself a regression. Throughput and
+    p95 latency are relative (tolerance), field coverage and failure rate absolute
+    (coverage_tolerance), since they are already fractions. Returns the regressions
+    and the runs the newest one was compared with.
+    """
+    if not reports:
+        return [], []
+    latest = reports[-1]
+    if not latest.get('success'):
+        return [f"latest run did not succeed ({latest.get('products', 0)} products, "
+                 f"{latest.get('failed', 0)} failed)"], []
+    if not latest.get('products'):
+        return ["latest run scraped 0 products"], []
+    history = [report for report in reports[:-1]
+               if report.get('success') and report.get('products') and report.get('mode') == latest.get('mode')]
+    if not history:
+        return [], []
+    current = trend_values(latest)
+    regressions = []
+    for metric, higher_is_better in TREND_METRICS.items():
+        baseline = statistics.median(trend_values(report)[metric] for report in history)
+        change = current[metric] - baseline
+        worse = -change if higher_is_better else change
+        if metric in ('field_coverage', 'failure_rate'):
+            if worse > coverage_tolerance:
+                regressions.append(f"{metric} {baseline:.1%} -> {current[metric]:.1%}")
+        elif baseline and worse / baseline > tolerance:
+            regressions.append(f"{metric} {baseline:.2f} -> {current[metric]:.2f} ({change / baseline:+.0%})")
+    return regressions, history
+
+
+def print_trend(reports: List[dict]):
+    print(f"{'started':<21}{'mode':<12}{'ok':>3}{'products':>9}{'prod/min':>10}{'p50 s':>8}{'p95 s':>8}"
+          f"{'coverage':>10}{'failed':>8}{'retries':>8}{'MB':>8}")
+    for report in reports:
+        values = trend_values(report)
+        network_mb = (report.get('network') or {}).get('total_bytes', 0) / 1024 / 1024
+        print(f"{report.get('started_at', '?'):<21}{report.get('mode', '?'):<12}{'✓' if report.get('success') else '✗':>3}"
+              f"{report.get('products', 0):>9}{values['products_per_minute']:>10.1f}"
+              f"{report.get('latency', {}).get('p50_seconds', 0.0):>8.2f}{values['p95_seconds']:>8.2f}"
+              f"{values['field_coverage']:>10.1%}{report.get('failed', 0):>8}"
+              f"{sum((report.get('retries') or {}).values()):>8}{network_mb:>8.1f}")
+
+
+def compare_command(args: argparse.Namespace) -> int:
+    reports = load_reports(args.reports_dir, args.last)
+    if not reports:
+        print(f"❌ No run reports in {args.reports_dir}")
+        return 1
+    print_trend(reports)
+    regressions, history = find_regressions(reports, args.tolerance, args.coverage_tolerance)
+    print()
+    for regression in regressions:
+        print(f"❌ REGRESSION {regression}")
+    if regressions:
+        return 1
+    if not history:
+        print(f"ℹ️ Nothing to compare with: no earlier successful run in mode '{reports[-1].get('mode')}'")
+        return 0
+    print(f"✅ No regressions in the latest run (vs the median of {len(history)} earlier "
+          f"'{reports[-1].get('mode')}' run(s))")
+    return 0
+
+
+def add_compare_arguments(parser: argparse.ArgumentParser):
+    parser.add_argument('--reports-dir', default=os.path.join(os.getenv('OUTPUT_DIR', 'output'), 'reports'),
+                        help="Directory with run-*.json reports (default <OUTPUT_DIR>/reports)")
+    parser.add_argument('--last', type=int, default=10, help="Number of most recent runs to show (default 10)")
+    parser.add_argument('--tolerance', type=float, default=0.2,
+                        help="Relative throughput/p95 regression that fails the comparison (default 0.2)")
+    parser.add_argument('--coverage-tolerance', type=float, default=0.05,
+                        help="Absolute drop in field coverage or rise in failure rate that fails (default 0.05)")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Sysco scraper run reports")
+    commands = parser.add_subparsers(dest='command', required=True)
+    add_compare_arguments(commands.add_parser('compare', help="Show trends across recent runs and flag regressions"))
+    args = parser.parse_args(argv)
+    return compare_command(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,11 @@
+"""
+Streaming output sinks for the Sysco scraper
+"""
+
+from .base import ProductSink
+from .csv_sink import StreamingCSVSink
+from .parquet_sink import ParquetSink
+from .jsonl_sink import JSONLSink, StdoutNDJSONSink
+from .manager import SinkManager
+
+__all__ = ['ProductSink', 'StreamingCSVSink', 'ParquetSink', 'JSONLSink', 'StdoutNDJSONSink', 'SinkManager']
@@ -0,0 +1,50 @@
+"""
+Base class for streaming product sinks
+Sinks receive records in small batches as workers finish them instead of one big list at the end
+"""
+
+from typing import List
+from ..models import ProductData
+from ..product_batch import ProductBatch
+
+
+class ProductSink:
+    """Interface shared by all output sinks"""
+
+    name = "sink"
+
+    def __init__(self):
+        self.records_written = 0
+        self.closed = False
+
+    def open(self):
+        """Prepare output (create directories, open files, connect)"""
+
+    def write(self, product: ProductData):
+        """Accept one finished product"""
+        raise NotImplementedError
+
+    def write_batch(self, batch: ProductBatch):
+        """Accept a columnar batch; sinks that can use the columns directly override this"""
+        for product in batch:
+            self.write(product)
+
+    def flush(self):
+        """Push buffered records to durable storage"""
+
+    def close(self, success: bool = True) -> bool:
+        """
+        Flush and finalize output
+
+        Args:
+            success: False when the run aborted; sinks keep partial output instead of publishing it
+
+        Returns:
+            True if the output was finalized
+        """
+        self.closed = True
+        return success
+
+    def output_paths(self) -> List[str]:
+        """Files (or databases) this sink produced"""
+        return []
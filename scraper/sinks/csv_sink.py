@@ -0,0 +1,143 @@
+"""
+Streaming CSV sink
+Writes records in buffered batches with periodic flush/fsync and size-based file rotation
+"""
+
+import csv
+import logging
+import os
+import time
+from typing import List, Optional
+from ..models import ProductData, ScrapingConfig
+from ..csv_exporter import CSV_FIELDNAMES
+from .base import ProductSink
+
+logger = logging.getLogger(__name__)
+
+
+class StreamingCSVSink(ProductSink):
+    """CSV output that grows as products are scraped, so memory stays flat and a crash keeps flushed rows"""
+
+    name = "csv"
+
+    def __init__(self, config: ScrapingConfig, batch_size: int = 200, flush_interval: float = 5.0,
+                 fsync: bool = True, max_bytes: Optional[int] = None, max_rows: Optional[int] = None):
+        super().__init__()
+        self.config = config
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.fsync = fsync
+        self.max_bytes = max_bytes
+        self.max_rows = max_rows
+        self.fieldnames = CSV_FIELDNAMES
+
+        self.buffer: List[dict] = []
+        self.file = None
+        self.writer = None
+        self.part_index = 0
+        self.part_rows = 0
+        self.last_flush = time.monotonic()
+        self.finished_paths: List[str] = []
+
+    @property
+    def rotating(self) -> bool:
+        return bool(self.max_bytes or self.max_rows)
+
+    def _final_path(self, index: int) -> str:
+        """Published file name; rotated files get a numbered suffix"""
+        if not self.rotating:
+            return self.config.output_path
+        stem, ext = os.path.splitext(self.config.output_path)
+        return f"{stem}-{index:05d}{ext or '.csv'}"
+
+    def _temp_path(self, index: int) -> str:
+        return self._final_path(index) + ".part"
+
+    def open(self):
+        """Create the output directory and the first part file"""
+        os.makedirs(self.config.output_dir, exist_ok=True)
+        self._open_part()
+
+    def _open_part(self):
+        self.part_index += 1
+        self.part_rows = 0
+        self.file = open(self._temp_path(self.part_index), 'w', newline='', encoding='utf-8')
+        self.writer = csv.DictWriter(self.file, fieldnames=self.fieldnames)
+        self.writer.writeheader()
+
+    def write(self, product: ProductData):
+        """Buffer one product; the batch is written once it is full or the flush interval passed"""
+        if not product.is_valid():
+            return
+        self.buffer.append(product.to_dict())
+        if len(self.buffer) >= self.batch_size or time.monotonic() - self.last_flush >= self.flush_interval:
+            self.flush()
+
+    def flush(self):
+        """Write buffered rows, flush and fsync, and rotate if the current file is full"""
+        if self.file is None:
+            return
+        for row in self.buffer:
+            self.writer.writerow(row)
+            self.part_rows += 1
+            self.records_written += 1
+            if self._part_full():
+                self._sync()
+                self._finish_part()
+                self._open_part()
+        self.buffer.clear()
+        self._sync()
+        self.last_flush = time.monotonic()
+
+    def _part_full(self) -> bool:
+        if self.max_rows and self.part_rows >= self.max_rows:
+            return True
+        return bool(self.max_bytes) and self.file.tell() >= self.max_bytes
+
+    def _sync(self):
+        self.file.flush()
+        if self.fsync:
+            os.fsync(self.file.fileno())
+
+    def _finish_part(self):
+        """Close the current part and atomically publish it under its final name"""
+        self.file.close()
+        final_path = self._final_path(self.part_index)
+        os.replace(self._temp_path(self.part_index), final_path)
+        self.finished_paths.append(final_path)
+        self.file = None
+
+    def close(self, success: bool = True) -> bool:
+        """Flush remaining rows; publish the file on success, keep the .part file otherwise"""
+        if self.closed:
+            return success
+        self.closed = True
+        if self.file is None:
+            return False
+
+        try:
+            self.flush()
+            if not success:
+                self.file.close()
+                logger.warning(f"⚠️ Run did not finish, partial CSV kept at {self._temp_path(self.part_index)}")
+                return False
+
+            if self.part_rows == 0:
+                # Nothing written, or rotation just opened an empty part; drop it
+                self.file.close()
+                os.remove(self._temp_path(self.part_index))
+            else:
+                self._finish_part()
+
+            if self.records_written == 0:
+                logger.info("No products to save")
+                return False
+
+            logger.info(f"Successfully saved {self.records_written} products to {', '.join(self.finished_paths)}")
+            return True
+        except Exception as e:
+            logger.error(f"Error finalizing CSV output: {e}")
+            return False
+
+    def output_paths(self) -> List[str]:
+        return list(self.finished_paths)
@@ -0,0 +1,140 @@
+"""
+JSON Lines sinks
+Compressed JSONL files and NDJSON streaming to stdout, one nested record per product
+"""
+
+import gzip
+import json
+import logging
+import os
+import sys
+import time
+import zlib
+from typing import List, Optional, TextIO
+from ..models import ProductData, ScrapingConfig
+from .base import ProductSink
+
+try:
+    import zstandard
+except ImportError:  # Optional dependency, only needed for .jsonl.zst output
+    zstandard = None
+
+logger = logging.getLogger(__name__)
+
+
+COMPRESSION_SUFFIX = {'gzip': '.gz', 'zstd': '.zst', 'none': ''}
+
+
+def encode_record(product: ProductData) -> str:
+    """Serialize one product as a compact JSON line"""
+    return json.dumps(product.to_record(), ensure_ascii=False, separators=(',', ':')) + '\n'
+
+
+class JSONLSink(ProductSink):
+    """JSONL file written through a streaming gzip/zstd compressor with periodic flushes"""
+
+    name = "jsonl"
+
+    def __init__(self, config: ScrapingConfig, compression: str = 'gzip', flush_interval: float = 5.0,
+                 path: Optional[str] = None):
+        super().__init__()
+        if compression not in COMPRESSION_SUFFIX:
+            raise ValueError(f"Unknown compression '{compression}' (use gzip, zstd or none)")
+        if compression == 'zstd' and zstandard is None:
+            raise ImportError("zstd compression requires the zstandard package (pip install zstandard)")
+        self.config = config
+        self.compression = compression
+        self.flush_interval = flush_interval
+        stem, _ = os.path.splitext(config.output_path)
+        self.path = path or f"{stem}.jsonl{COMPRESSION_SUFFIX[compression]}"
+
+        self.raw_file = None
+        self.stream = None
+        self.last_flush = time.monotonic()
+
+    @property
+    def temp_path(self) -> str:
+        return self.path + ".part"
+
+    def open(self):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.raw_file = open(self.temp_path, 'wb')
+        if self.compression == 'gzip':
+            self.stream = gzip.GzipFile(fileobj=self.raw_file, mode='wb', compresslevel=6)
+        elif self.compression == 'zstd':
+            self.stream = zstandard.ZstdCompressor(level=3).stream_writer(self.raw_file, closefd=False)
+        else:
+            self.stream = self.raw_file
+
+    def write(self, product: ProductData):
+        if not product.is_valid():
+            return
+        self.stream.write(encode_record(product).encode('utf-8'))
+        self.records_written += 1
+        if time.monotonic() - self.last_flush >= self.flush_interval:
+            self.flush()
+
+    def flush(self):
+        """Emit a sync point so everything written so far can be decompressed after a crash"""
+        if self.stream is None:
+            return
+        if self.compression == 'gzip':
+            self.stream.flush(zlib.Z_SYNC_FLUSH)
+        elif self.compression == 'zstd':
+            self.stream.flush(zstandard.FLUSH_BLOCK)
+        self.raw_file.flush()
+        os.fsync(self.raw_file.fileno())
+        self.last_flush = time.monotonic()
+
+    def close(self, success: bool = True) -> bool:
+        if self.closed:
+            return success
+        self.closed = True
+        if self.stream is None:
+            return False
+        try:
+            if self.stream is not self.raw_file:
+                self.stream.close()
+            self.raw_file.flush()
+            os.fsync(self.raw_file.fileno())
+            self.raw_file.close()
+            if not success:
+                logger.warning(f"⚠️ Run did not finish, partial JSONL kept at {self.temp_path}")
+                return False
+            os.replace(self.temp_path, self.path)
+            logger.info(f"Successfully saved {self.records_written} products to {self.path}")
+            return True
+        except Exception as e:
+            logger.error(f"Error finalizing JSONL output: {e}")
+            return False
+
+    def output_paths(self) -> List[str]:
+        return [self.path] if self.closed and os.path.exists(self.path) else []
+
+
+class StdoutNDJSONSink(ProductSink):
+    """Streams each record to stdout as soon as it is produced, for piping into other tools"""
+
+    name = "stdout"
+
+    def __init__(self, stream: Optional[TextIO] = None):
+        super().__init__()
+        # The real stdout, even while log output is redirected to stderr
+        self.stream = stream or sys.__stdout__
+
+    def write(self, product: ProductData):
+        if self.closed or not product.is_valid():
+            return
+        try:
+            self.stream.write(encode_record(product))
+            self.stream.flush()
+            self.records_written += 1
+        except BrokenPipeError:
+            # Downstream consumer went away; stop writing but keep scraping into other sinks
+            self.closed = True
+
+    def close(self, success: bool = True) -> bool:
+        self.closed = True
+        return success
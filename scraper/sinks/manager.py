@@ -0,0 +1,260 @@
+"""
+Sink fan-out manager
+Collects finished records into columnar batches and hands each batch to all configured sinks,
+each on its own writer thread behind a bounded queue
+"""
+
+import asyncio
+import logging
+import queue
+import threading
+import time
+from typing import Dict, List, Optional
+from ..data_formatter import DataFormatter
+from ..models import ProductData
+from ..product_batch import ProductBatch
+from .base import ProductSink
+from .. import spans
+
+logger = logging.getLogger(__name__)
+
+
+_STOP = object()
+
+
+class _SinkWorker:
+    """Writer thread plus bounded queue for one sink"""
+
+    def __init__(self, sink: ProductSink, queue_size: int):
+        self.sink = sink
+        self.queue: "queue.Queue" = queue.Queue(maxsize=queue_size)
+        self.error: Optional[BaseException] = None
+        self.backpressure_waits = 0
+        self.thread = threading.Thread(target=self._run, name=f"sink-{sink.name}", daemon=True)
+
+    def _run(self):
+        while True:
+            item = self.queue.get()
+            if item is _STOP:
+                break
+            if self.error is not None:
+                # Failed sink: keep draining so producers never block on it
+                if isinstance(item, threading.Event):
+                    item.set()
+                continue
+            try:
+                if isinstance(item, threading.Event):
+                    self.sink.flush()
+                    item.set()
+                else:
+                    with spans.span('sink_write', category='sink', sink=self.sink.name, rows=len(item)):
+                        self.sink.write_batch(item)
+            except Exception as e:
+                self.error = e
+                logger.error(f"❌ Sink '{self.sink.name}' failed and was disabled: {e}")
+                if isinstance(item, threading.Event):
+                    item.set()
+
+
+class SinkManager:
+    """Fans each finished record out to every sink without blocking the event loop"""
+
+    def __init__(self, sinks: List[ProductSink], queue_size: int = 1000, batch_size: int = 64,
+                 max_batch_seconds: float = 1.0, formatter: Optional[DataFormatter] = None):
+        # queue_size is in records; each queue holds whole batches
+        self.batch_size = max(1, batch_size)
+        self.max_batch_seconds = max_batch_seconds
+        self.pending_since = time.monotonic()
+        self.workers = [_SinkWorker(sink, max(1, queue_size // self.batch_size)) for sink in sinks]
+        self.pending = ProductBatch()
+        self.records_submitted = 0
+        self.closed = False
+        # Raw descriptions are formatted per batch, off the event loop
+        self.formatter = formatter or DataFormatter()
+        self._timer: Optional[asyncio.Task] = None
+        # One dispatch at a time, so batches reach the sinks in submission order. The batch being
+        # handed over stays in _in_flight (with the workers still owed it) until every queue took it
+        self._dispatch_lock = asyncio.Lock()
+        self._in_flight: Optional[ProductBatch] = None
+        self._in_flight_ready = False
+        self._in_flight_workers: List[_SinkWorker] = []
+
+    @property
+    def sinks(self) -> List[ProductSink]:
+        return [worker.sink for worker in self.workers]
+
+    def open(self):
+        """Open every sink and start the writer threads (and the batch timer when called from a loop)"""
+        for worker in self.workers:
+            worker.sink.open()
+            worker.thread.start()
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return  # Used outside a loop: partial batches go out on flush/close
+        self._timer = loop.create_task(self._batch_timer(), name="sink-batch-timer")
+
+    async def submit(self, product: ProductData):
+        """
+        Add a record to the current batch and hand the batch to every sink once it is
+        full or its oldest record has waited max_batch_seconds
+
+        When a sink's queue is full the caller waits (without blocking the event loop)
+        until the writer catches up, which slows the scraping workers down to the
+        speed of the slowest sink.
+        """
+        if not product.is_valid():
+            return
+        if not self.pending:
+            self.pending_since = time.monotonic()
+        self.pending.append(product)
+        self.records_submitted += 1
+        if (len(self.pending) < self.batch_size and
+                time.monotonic() - self.pending_since < self.max_batch_seconds):
+            return
+        await self._dispatch()
+
+    async def _dispatch(self):
+        """Hand the current batch to every sink, waiting on full queues without blocking the loop"""
+        async with self._dispatch_lock:
+            if self._in_flight is None:
+                if not self.pending:
+                    return
+                self._take_pending()
+            batch = self._in_flight
+            if not self._in_flight_ready:
+                batch.parse_fields()
+                with spans.span('formatting', category='sink', stage='description', rows=len(batch)):
+                    descriptions = await self.formatter.format_descriptions_async(batch.column('description'))
+                batch.replace_strings('description', descriptions)
+                self._in_flight_ready = True
+            while self._in_flight_workers:
+                worker = self._in_flight_workers[0]
+                try:
+                    worker.queue.put_nowait(batch)
+                except queue.Full:
+                    # Backpressure: visible as a span on the submitting worker's lane
+                    with spans.span('sink_backpressure', category='sink', sink=worker.sink.name):
+                        delay = 0.005
+                        while True:
+                            worker.backpressure_waits += 1
+                            await asyncio.sleep(delay)
+                            delay = min(delay * 2, 0.25)
+                            try:
+                                worker.queue.put_nowait(batch)
+                                break
+                            except queue.Full:
+                                pass
+                self._in_flight_workers.pop(0)
+            self._in_flight = None
+
+    def _take_pending(self):
+        self._in_flight, self.pending = self.pending, ProductBatch()
+        self._in_flight_ready = False
+        self._in_flight_workers = list(self.workers)
+
+    async def _batch_timer(self):
+        """Dispatch a partial batch once it is max_batch_seconds old, even if no record follows"""
+        interval = max(self.max_batch_seconds / 2, 0.05)
+        while True:
+            await asyncio.sleep(interval)
+            if self.pending and time.monotonic() - self.pending_since >= self.max_batch_seconds:
+                await self._dispatch()
+
+    def _cancel_timer(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+    async def _stop_timer(self):
+        """Cancel the batch timer and wait until it has stopped"""
+        timer, self._timer = self._timer, None
+        if timer is None:
+            return
+        timer.cancel()
+        try:
+            await timer
+        except asyncio.CancelledError:
+            pass
+
+    def prepare(self, batch: ProductBatch):
+        """Typed pack/price fields and formatted descriptions for a batch (blocking)"""
+        batch.parse_fields()
+        batch.replace_strings('description', self.formatter.format_descriptions_batch(batch.column('description')))
+
+    def _dispatch_pending(self):
+        """Finish an interrupted hand-over, then hand the partially filled batch to the sinks (blocking)"""
+        while self._in_flight is not None or self.pending:
+            if self._in_flight is None:
+                self._take_pending()
+            batch = self._in_flight
+            if not self._in_flight_ready:
+                self.prepare(batch)
+                self._in_flight_ready = True
+            while self._in_flight_workers:
+                worker = self._in_flight_workers.pop(0)
+                if worker.thread.is_alive():
+                    worker.queue.put(batch)
+            self._in_flight = None
+
+    def queue_depths(self) -> Dict[str, int]:
+        """Batches waiting per sink"""
+        return {worker.sink.name: worker.queue.qsize() for worker in self.workers}
+
+    def flush(self):
+        """Block until every sink has written and flushed all records queued so far"""
+        self._dispatch_pending()
+        events = []
+        for worker in self.workers:
+            if worker.thread.is_alive():
+                event = threading.Event()
+                worker.queue.put(event)
+                events.append(event)
+        for event in events:
+            event.wait()
+
+    def close(self, success: bool = True) -> bool:
+        """
+        Drain all queues, stop the writer threads and finalize every sink together
+
+        Returns:
+            True only if every sink published its output
+        """
+        if self.closed:
+            return success
+        self.closed = True
+        start_time = time.time()
+
+        self._cancel_timer()
+        self._dispatch_pending()
+        for worker in self.workers:
+            if worker.thread.is_alive():
+                worker.queue.put(_STOP)
+        for worker in self.workers:
+            if worker.thread.is_alive():
+                worker.thread.join()
+
+        self.formatter.close()
+
+        all_ok = True
+        for worker in self.workers:
+            ok = worker.sink.close(success=success and worker.error is None)
+            all_ok = all_ok and ok and worker.error is None
+
+        waits = sum(worker.backpressure_waits for worker in self.workers)
+        logger.info(f"💾 Sinks closed in {time.time() - start_time:.2f}s "
+              f"({self.records_submitted} records, {waits} backpressure waits)")
+        return success and all_ok
+
+    async def aclose(self, success: bool = True) -> bool:
+        """close() without blocking the event loop"""
+        # Tasks can only be cancelled from the loop's thread. A hand-over the timer was in the
+        # middle of stays in _in_flight and is finished by close()
+        await self._stop_timer()
+        async with self._dispatch_lock:
+            pass  # Let a dispatch started by submit() hand its batch over first
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self.close, success)
+
+    def output_paths(self) -> List[str]:
+        return [path for sink in self.sinks for path in sink.output_paths()]
@@ -0,0 +1,176 @@
+"""
+Partitioned Parquet sink
+Writes typed, dictionary-encoded Arrow record batches partitioned by run date and category
+"""
+
+import datetime
+import logging
+import os
+import uuid
+from typing import Dict, List, Optional
+from urllib.parse import quote
+from ..models import ProductData, ScrapingConfig
+from ..product_batch import ProductBatch
+from .base import ProductSink
+
+# pyarrow modules, imported when the first sink is created (optional dependency, and slow
+# to import for commands that never write Parquet)
+pa = None
+pc = None
+pq = None
+
+logger = logging.getLogger(__name__)
+
+
+def _load_pyarrow():
+    global pa, pc, pq
+    if pa is not None:
+        return
+    try:
+        import pyarrow
+        import pyarrow.compute
+        import pyarrow.parquet
+    except ImportError:
+        raise ImportError("Parquet output requires pyarrow (pip install pyarrow)") from None
+    pa, pc, pq = pyarrow, pyarrow.compute, pyarrow.parquet
+
+
+def parquet_schema():
+    """Typed schema of the product files (run_date and category live in the partition path)"""
+    _load_pyarrow()
+    dictionary_string = pa.dictionary(pa.int32(), pa.string())
+    return pa.schema([
+        ('sku', pa.string()),
+        ('brand', dictionary_string),
+        ('product_name', pa.string()),
+        ('packaging', pa.string()),
+        ('pack_count', pa.int64()),
+        ('pack_unit_quantity', pa.float64()),
+        ('pack_unit', dictionary_string),
+        ('price', pa.string()),
+        ('price_cents', pa.int64()),
+        ('unit_price_cents', pa.float64()),
+        ('image_url', pa.string()),
+        ('description', pa.string()),
+        ('url', pa.string()),
+        ('scraped_at', pa.timestamp('s', tz='UTC')),
+    ])
+
+
+class ParquetSink(ProductSink):
+    """
+    Columnar output for analytics
+
+    Layout: <output_dir>/parquet/run_date=YYYY-MM-DD/category=<name>/part-<run>.parquet
+    (Hive-style, so pyarrow.dataset / DuckDB / Spark prune partitions on date and category)
+    """
+
+    name = "parquet"
+
+    def __init__(self, config: ScrapingConfig, row_group_size: int = 10000,
+                 run_date: Optional[datetime.date] = None):
+        super().__init__()
+        _load_pyarrow()
+        self.config = config
+        self.row_group_size = row_group_size
+        self.run_date = run_date or datetime.datetime.now(datetime.timezone.utc).date()
+        self.run_id = uuid.uuid4().hex[:8]
+        self.root = os.path.join(config.output_dir, 'parquet')
+        self.schema = parquet_schema()
+
+        # Per-category Arrow batches waiting for a full row group, and open writers
+        self.buffers: Dict[str, List["pa.RecordBatch"]] = {}
+        self.buffered_rows: Dict[str, int] = {}
+        self.writers: Dict[str, "pq.ParquetWriter"] = {}
+        self.paths: Dict[str, str] = {}
+
+    def _partition_dir(self, category: str) -> str:
+        return os.path.join(
+            self.root,
+            f"run_date={self.run_date.isoformat()}",
+            f"category={quote(category or 'Uncategorized', safe='')}"
+        )
+
+    def open(self):
+        os.makedirs(self.root, exist_ok=True)
+
+    def write(self, product: ProductData):
+        """Buffer one product in its category partition"""
+        if product.is_valid():
+            self.write_batch(ProductBatch.from_products([product]))
+
+    def write_batch(self, batch: ProductBatch):
+        """Split a columnar batch by category (zero-copy Arrow view) and buffer each part"""
+        if not batch:
+            return
+        columns = [field.name for field in self.schema if field.name != 'scraped_at'] + ['category']
+        arrow_batch = batch.to_arrow(columns)
+        scraped_at = pa.array([datetime.datetime.now(datetime.timezone.utc)] * len(batch),
+                              type=self.schema.field('scraped_at').type)
+        arrow_batch = arrow_batch.append_column(self.schema.field('scraped_at'), scraped_at)
+
+        categories = batch.columns['category'].values
+        for code, category in enumerate(categories):
+            if len(categories) == 1:
+                part = arrow_batch
+            else:
+                part = arrow_batch.filter(pc.equal(arrow_batch.column('category').indices, code))
+                if not part.num_rows:
+                    continue
+            # Views share the ProductBatch buffers, which stay alive (and can no longer grow) meanwhile
+            self.buffers.setdefault(category, []).append(part.drop_columns(['category']))
+            self.buffered_rows[category] = self.buffered_rows.get(category, 0) + part.num_rows
+            if self.buffered_rows[category] >= self.row_group_size:
+                self._write_row_group(category)
+
+    def _write_row_group(self, category: str):
+        """Append one category's buffered batches as a row group"""
+        tables = self.buffers.get(category)
+        if not tables:
+            return
+
+        table = pa.Table.from_batches(tables).cast(self.schema)
+        writer = self.writers.get(category)
+        if writer is None:
+            directory = self._partition_dir(category)
+            os.makedirs(directory, exist_ok=True)
+            path = os.path.join(directory, f"part-{self.run_id}.parquet")
+            writer = pq.ParquetWriter(
+                path + ".part", self.schema,
+                compression='zstd',
+                use_dictionary=['brand', 'pack_unit'],
+                write_statistics=True
+            )
+            self.writers[category] = writer
+            self.paths[category] = path
+
+        writer.write_table(table, row_group_size=self.row_group_size)
+        self.records_written += table.num_rows
+        self.buffers[category] = []
+        self.buffered_rows[category] = 0
+
+    def flush(self):
+        """Write all partially filled buffers as (smaller) row groups"""
+        for category in list(self.buffers):
+            self._write_row_group(category)
+
+    def close(self, success: bool = True) -> bool:
+        """Close writers and publish the files atomically on success"""
+        if self.closed:
+            return success
+        self.closed = True
+        try:
+            self.flush()
+            for category, writer in self.writers.items():
+                writer.close()
+                if success:
+                    os.replace(self.paths[category] + ".part", self.paths[category])
+            if success and self.writers:
+                logger.info(f"Successfully saved {self.records_written} products to Parquet under {self.root}")
+            return success and bool(self.writers)
+        except Exception as e:
+            logger.error(f"Error finalizing Parquet output: {e}")
+            return False
+
+    def output_paths(self) -> List[str]:
+        return list(self.paths.values())
@@ -0,0 +1,255 @@
+"""
+Snapshot diff / change-data-capture between two scraper runs
+Streaming hash join keyed on SKU with per-row content hashes and bounded memory
+"""
+
+import argparse
+import gzip
+import hashlib
+import json
+import logging
+import os
+import shutil
+import sys
+import tempfile
+import time
+import zlib
+from typing import Dict, Iterator, List, Optional, TextIO, Tuple
+from .snapshots import iter_records, snapshot_files
+
+logger = logging.getLogger(__name__)
+
+
+# Fields compared for changes
+DIFF_FIELDS = ['brand', 'product_name', 'packaging', 'price', 'category', 'image_url', 'description', 'url']
+
+# Roughly how many bytes of spilled rows one partition may hold in memory
+DEFAULT_PARTITION_BYTES = 64 * 1024 * 1024
+
+# Times an oversized partition is re-split before it is joined anyway (e.g. one key repeated a lot)
+MAX_SPLIT_DEPTH = 3
+
+# Duplicate keys listed in the summary
+DUPLICATE_SAMPLE = 10
+
+
+def row_key(row: Dict[str, str]) -> str:
+    """Join key: SKU/SUPC, falling back to URL for rows without one"""
+    return row.get('sku') or f"url:{row.get('url', '')}"
+
+
+def row_hash(row: Dict[str, str]) -> str:
+    """Content hash of the compared fields"""
+    payload = '\x1f'.join([row.get(field) or '' for field in DIFF_FIELDS])
+    return hashlib.blake2b(payload.encode('utf-8'), digest_size=8).hexdigest()
+
+
+def partition_index(key: str, partitions: int, depth: int = 0) -> int:
+    """Partition of a key; each re-split level uses an independent hash"""
+    if partitions <= 1:
+        return 0
+    if depth == 0:
+        return zlib.crc32(key.encode('utf-8')) % partitions
+    digest = hashlib.blake2b(key.encode('utf-8'), digest_size=8, person=f"split{depth}".encode()).digest()
+    return int.from_bytes(digest, 'little') % partitions
+
+
+def iter_snapshot(path: str) -> Iterator[Dict[str, str]]:
+    """Stream rows of a snapshot as strings (any format snapshots.iter_records reads)"""
+    for record in iter_records(path):
+        yield {key: '' if value is None else value if isinstance(value, str) else json.dumps(value, default=str)
+               for key, value in record.items()}
+
+
+class SnapshotDiff:
+    """Compares two snapshots and writes a JSONL change feed with field-level deltas"""
+
+    def __init__(self, partition_bytes: int = DEFAULT_PARTITION_BYTES, work_dir: Optional[str] = None):
+        self.partition_bytes = partition_bytes
+        self.work_dir = work_dir
+        self.stats = {'added': 0, 'removed': 0, 'changed': 0, 'unchanged': 0, 'old_rows': 0, 'new_rows': 0,
+                      'old_duplicates': 0, 'new_duplicates': 0, 'partitions': 0, 'resplits': 0}
+        self.duplicate_keys: Dict[str, List[str]] = {'old': [], 'new': []}  # First few per side
+
+    @staticmethod
+    def _snapshot_bytes(path: str) -> int:
+        """On-disk size of a snapshot (all rotated parts / dataset files)"""
+        total = 0
+        for part in snapshot_files(path):
+            if os.path.isdir(part):
+                total += sum(os.path.getsize(os.path.join(root, name))
+                             for root, _, names in os.walk(part) for name in names)
+            else:
+                total += os.path.getsize(part)
+        return total
+
+    def _partition_count(self, old_path: str, new_path: str) -> int:
+        """
+        Initial partition count from the snapshots' size on disk
+
+        Compressed snapshots spill more than that; partitions that come out too big are
+        re-split from their actual spilled size before the join (see _join).
+        """
+        size = self._snapshot_bytes(old_path) + self._snapshot_bytes(new_path)
+        return max(1, -(-size // self.partition_bytes))
+
+    def _spill(self, path: str, partitions: int, directory: str, prefix: str) -> Tuple[List[str], int]:
+        """
+        Hash-partition a snapshot by key into spill files
+
+        Each spill line is "key<TAB>hash<TAB>json-row", so unchanged rows can be
+        skipped later by comparing hashes without parsing the JSON.
+        """
+        paths = [os.path.join(directory, f"{prefix}-{i:04d}.tsv") for i in range(partitions)]
+        files = [open(p, 'w', encoding='utf-8') for p in paths]
+        rows = 0
+        try:
+            for row in iter_snapshot(path):
+                key = row_key(row).replace('\t', ' ')
+                files[partition_index(key, partitions)].write(f"{key}\t{row_hash(row)}\t{json.dumps(row, ensure_ascii=False)}\n")
+                rows += 1
+        finally:
+            for f in files:
+                f.close()
+        return paths, rows
+
+    @staticmethod
+    def _resplit(path: str, partitions: int, depth: int) -> List[str]:
+        """Split a spill file into smaller ones by a hash independent of the earlier levels'"""
+        paths = [f"{path[:-4]}.{i:02d}.tsv" for i in range(partitions)]
+        files = [open(p, 'w', encoding='utf-8') for p in paths]
+        try:
+            with open(path, encoding='utf-8') as source:
+                for line in source:
+                    files[partition_index(line.split('\t', 1)[0], partitions, depth)].write(line)
+        finally:
+            for f in files:
+                f.close()
+        os.remove(path)
+        return paths
+
+    def _join(self, old_part: str, new_part: str, out: TextIO, depth: int = 0):
+        """Join one partition, re-splitting it first while its spilled rows exceed the memory budget"""
+        size = os.path.getsize(old_part) + os.path.getsize(new_part)
+        if size <= self.partition_bytes or depth >= MAX_SPLIT_DEPTH:
+            self._diff_partition(old_part, new_part, out)
+            self.stats['partitions'] += 1
+            return
+        partitions = -(-size // self.partition_bytes) + 1  # Headroom for uneven keys
+        self.stats['resplits'] += 1
+        old_children = self._resplit(old_part, partitions, depth + 1)
+        new_children = self._resplit(new_part, partitions, depth + 1)
+        for old_child, new_child in zip(old_children, new_children):
+            self._join(old_child, new_child, out, depth + 1)
+
+    @staticmethod
+    def _read_partition(path: str) -> Iterator[Tuple[str, str, str]]:
+        with open(path, encoding='utf-8') as f:
+            for line in f:
+                key, digest, payload = line.rstrip('\n').split('\t', 2)
+                yield key, digest, payload
+
+    def diff(self, old_path: str, new_path: str, out: TextIO) -> Dict[str, int]:
+        """
+        Join two snapshots on SKU and write one JSON change event per line
+
+        Events: {"op": "added"|"removed"|"changed", "sku": ..., "changes": {field: [old, new]}}
+        """
+        start_time = time.time()
+        partitions = self._partition_count(old_path, new_path)
+        directory = tempfile.mkdtemp(prefix='snapshot-diff-', dir=self.work_dir)
+        try:
+            old_parts, self.stats['old_rows'] = self._spill(old_path, partitions, directory, 'old')
+            new_parts, self.stats['new_rows'] = self._spill(new_path, partitions, directory, 'new')
+
+            for old_part, new_part in zip(old_parts, new_parts):
+                self._join(old_part, new_part, out)
+        finally:
+            shutil.rmtree(directory, ignore_errors=True)
+
+        self.stats['seconds'] = round(time.time() - start_time, 3)
+        return self.stats
+
+    def _load_side(self, path: str, side: str) -> Dict[str, Tuple[str, str]]:
+        """Rows of one side of a partition by key; a repeated key keeps its last row"""
+        rows: Dict[str, Tuple[str, str]] = {}
+        for key, digest, payload in self._read_partition(path):
+            if key in rows:
+                # e.g. a product listed in several categories
+                self.stats[f'{side}_duplicates'] += 1
+                if len(self.duplicate_keys[side]) < DUPLICATE_SAMPLE and key not in self.duplicate_keys[side]:
+                    self.duplicate_keys[side].append(key)
+            rows[key] = (digest, payload)
+        return rows
+
+    def _diff_partition(self, old_part: str, new_part: str, out: TextIO):
+        """In-memory join of one partition, each key counted once per side"""
+        old_rows = self._load_side(old_part, 'old')
+        new_rows = self._load_side(new_part, 'new')
+
+        for key, (digest, payload) in new_rows.items():
+            previous = old_rows.pop(key, None)
+            if previous is None:
+                self._emit(out, 'added', key, new=json.loads(payload))
+                self.stats['added'] += 1
+            elif previous[0] == digest:
+                self.stats['unchanged'] += 1
+            else:
+                old_row, new_row = json.loads(previous[1]), json.loads(payload)
+                changes = {
+                    field: [old_row.get(field, ''), new_row.get(field, '')]
+                    for field in DIFF_FIELDS
+                    if old_row.get(field, '') != new_row.get(field, '')
+                }
+                self._emit(out, 'changed', key, changes=changes)
+                self.stats['changed'] += 1
+
+        for key, (_, payload) in old_rows.items():
+            self._emit(out, 'removed', key, old=json.loads(payload))
+            self.stats['removed'] += 1
+
+    @staticmethod
+    def _emit(out: TextIO, op: str, key: str, **payload):
+        event = {'op': op, 'sku': key}
+        event.update(payload)
+        out.write(json.dumps(event, ensure_ascii=False, separators=(',', ':')) + '\n')
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command line entry point: diff OLD NEW [-o changes.jsonl]"""
+    parser = argparse.ArgumentParser(description="Compare two scraper snapshots (CSV or JSONL)")
+    parser.add_argument('old', help="Previous run's snapshot")
+    parser.add_argument('new', help="Current run's snapshot")
+    parser.add_argument('-o', '--output', help="Change feed path (JSONL, .gz supported). Default: stdout")
+    parser.add_argument('--memory-mb', type=int, default=DEFAULT_PARTITION_BYTES // (1024 * 1024),
+                        help="Approximate memory budget per partition")
+    args = parser.parse_args(argv)
+
+    from .log import setup_logging, shutdown_logging
+    setup_logging('info')  # stderr, so the change feed can go to stdout
+    try:
+        differ = SnapshotDiff(partition_bytes=args.memory_mb * 1024 * 1024)
+        if args.output:
+            opener = gzip.open if args.output.endswith('.gz') else open
+            with opener(args.output, 'wt', encoding='utf-8') as out:
+                stats = differ.diff(args.old, args.new, out)
+        else:
+            stats = differ.diff(args.old, args.new, sys.stdout)
+
+        logger.info(f"📊 Diff: {stats['added']} added, {stats['removed']} removed, {stats['changed']} changed, "
+                    f"{stats['unchanged']} unchanged ({stats['old_rows']} -> {stats['new_rows']} rows, "
+                    f"{stats['partitions']} partition(s), {stats['resplits']} re-split(s), {stats['seconds']}s)")
+        for side in ('old', 'new'):
+            if stats[f'{side}_duplicates']:
+                logger.warning(f"⚠️ {stats[f'{side}_duplicates']} duplicate row(s) in the {side} snapshot, "
+                               f"last one kept per key (e.g. {', '.join(differ.duplicate_keys[side])})")
+    except (OSError, ImportError) as e:
+        logger.error(f"❌ {e}")
+        return 1
+    finally:
+        shutdown_logging()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,191 @@
+"""
+Offline snapshot tools for the Sysco scraper
+Reads finished outputs (CSV, JSONL, Parquet) back into products and writes them through
+the regular sinks, for format conversion and for re-deriving fields without a browser
+"""
+
+import csv
+import glob
+import gzip
+import io
+import json
+import logging
+import mmap
+import os
+from typing import TYPE_CHECKING, Callable, Iterator, List, Optional
+from .data_formatter import DataFormatter
+from .models import ProductData, ScrapingConfig
+from .parsing import apply_parsed_fields
+from .urls import canonicalize_url
+
+try:
+    import zstandard
+except ImportError:  # Optional dependency, only needed for .jsonl.zst input
+    zstandard = None
+
+if TYPE_CHECKING:
+    from .sinks import ProductSink
+
+logger = logging.getLogger(__name__)
+
+FORMATS = ['csv', 'jsonl', 'parquet']
+
+# Text fields re-cleaned by re-extract (description keeps its formatting, which is not idempotent)
+CLEANED_FIELDS = ['brand', 'product_name', 'packaging', 'sku', 'price']
+
+
+def snapshot_format(path: str) -> str:
+    """csv, jsonl or parquet, from the file name (a directory is a Parquet dataset)"""
+    if os.path.isdir(path):
+        return 'parquet'
+    name = path
+    for suffix in ('.gz', '.zst'):
+        if name.endswith(suffix):
+            name = name[:-len(suffix)]
+    if name.endswith('.jsonl') or name.endswith('.ndjson'):
+        return 'jsonl'
+    if name.endswith('.parquet'):
+        return 'parquet'
+    return 'csv'
+
+
+def _open_text(path: str):
+    if path.endswith('.gz'):
+        return gzip.open(path, 'rt', encoding='utf-8', newline='')
+    if path.endswith('.zst'):
+        if zstandard is None:
+            raise ImportError("Reading .zst files requires the zstandard package (pip install zstandard)")
+        raw = open(path, 'rb')
+        return io.TextIOWrapper(zstandard.ZstdDecompressor().stream_reader(raw, closefd=True), encoding='utf-8')
+    return open(path, 'r', encoding='utf-8', newline='')
+
+
+def _mapped_lines(path: str) -> Iterator[str]:
+    """Decoded lines of an uncompressed file, read through mmap instead of a read buffer"""
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            for line in iter(mapped.readline, b''):
+                yield line.decode('utf-8')
+
+
+def _iter_lines(path: str) -> Iterator[str]:
+    """Lines of a text snapshot: compressed files are streamed, plain ones memory-mapped"""
+    if path.endswith(('.gz', '.zst')):
+        with _open_text(path) as f:
+            yield from f
+    else:
+        yield from _mapped_lines(path)
+
+
+def _iter_parquet(path: str) -> Iterator[dict]:
+    try:
+        import pyarrow.dataset as ds
+    except ImportError:
+        raise ImportError("Reading Parquet requires pyarrow (pip install pyarrow)") from None
+    dataset = ds.dataset(path, format='parquet', partitioning='hive')
+    for batch in dataset.to_batches():
+        yield from batch.to_pylist()
+
+
+def _iter_jsonl(path: str) -> Iterator[dict]:
+    for line in _iter_lines(path):
+        if line.strip():
+            yield json.loads(line)
+
+
+def _iter_csv(path: str) -> Iterator[dict]:
+    yield from csv.DictReader(_iter_lines(path))
+
+
+def snapshot_files(path: str) -> List[str]:
+    """
+    Files making up a snapshot: the path itself, or the parts of a rotated CSV
+    (sysco_products.csv -> sysco_products-00001.csv, -00002.csv, ...)
+    """
+    if os.path.exists(path):
+        return [path]
+    stem, ext = os.path.splitext(path)
+    parts = sorted(glob.glob(f"{glob.escape(stem)}-[0-9][0-9][0-9][0-9][0-9]{ext or '.csv'}"))
+    if not parts:
+        raise FileNotFoundError(f"No snapshot at {path}")
+    return parts
+
+
+def iter_records(path: str) -> Iterator[dict]:
+    """Stream the raw records of a CSV (plain, .gz or rotated), JSONL (.gz/.zst) or Parquet snapshot"""
+    readers = {'csv': _iter_csv, 'jsonl': _iter_jsonl, 'parquet': _iter_parquet}
+    for part in snapshot_files(path):
+        yield from readers[snapshot_format(part)](part)
+
+
+def iter_products(path: str) -> Iterator[ProductData]:
+    """Stream the products of a snapshot (see iter_records)"""
+    for record in iter_records(path):
+        yield ProductData.from_record(record)
+
+
+def open_sink(path: str, fmt: str, compression: str = 'gzip') -> "ProductSink":
+    """
+    Sink writing one output file; for Parquet `path` is the dataset directory
+    (files land in <path>/parquet/run_date=.../category=...)
+    """
+    # Imported here: the sinks pull in the columnar batch code, which the readers don't need
+    from .sinks import JSONLSink, ParquetSink, StreamingCSVSink
+    directory, name = os.path.split(path)
+    config = ScrapingConfig(output_dir=directory or '.', output_file=name or 'sysco_products.csv')
+    if fmt == 'csv':
+        return StreamingCSVSink(config, fsync=False)
+    if fmt == 'jsonl':
+        return JSONLSink(config, compression=compression, path=path)
+    if fmt == 'parquet':
+        return ParquetSink(ScrapingConfig(output_dir=path))
+    raise ValueError(f"Unknown format '{fmt}' (use {', '.join(FORMATS)})")
+
+
+def convert(source: str, target: str, fmt: Optional[str] = None, compression: str = 'gzip',
+            transform: Optional[Callable[[ProductData], None]] = None) -> dict:
+    """
+    Copy a snapshot into another file/format, optionally modifying each product in place
+
+    Returns counts of products read and written (invalid products are dropped by the sinks).
+    """
+    fmt = fmt or snapshot_format(target)
+    sink = open_sink(target, fmt, compression)
+    sink.open()
+    read = 0
+    success = False
+    try:
+        for product in iter_products(source):
+            if transform:
+                transform(product)
+            sink.write(product)
+            read += 1
+        success = True
+    finally:
+        published = sink.close(success)
+    return {'read': read, 'written': sink.records_written, 'published': published,
+            'paths': sink.output_paths() or [target]}
+
+
+class ReExtractor:
+    """Re-derives a product's fields from its stored text with the current cleaning and parsing code"""
+
+    def __init__(self, base_url: str = "https://shop.sysco.com"):
+        self.base_url = base_url
+        self.formatter = DataFormatter()
+        self.changed = 0
+
+    def __call__(self, product: ProductData):
+        before = product.to_dict()
+        for name in CLEANED_FIELDS:
+            setattr(product, name, self.formatter.clean_text_field(getattr(product, name)))
+        if product.url:
+            product.url = canonicalize_url(product.url, self.base_url)
+        if product.image_url:
+            product.image_url = canonicalize_url(product.image_url, self.base_url)
+        apply_parsed_fields(product)
+        product.intern_strings()
+        if product.to_dict() != before:
+            self.changed += 1
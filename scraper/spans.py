@@ -0,0 +1,147 @@
+"""
+Per-product span tracing for the Sysco scraper
+Lightweight timed spans per product and stage (queue wait, navigation, readiness wait,
+extraction, formatting, sink write) on per-worker lanes, exported as Chrome
+trace-event JSON for chrome://tracing, Perfetto or speedscope
+"""
+
+import contextvars
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Lane (worker) the current task records on; unset means the current thread's name
+_lane: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar('span_lane', default=None)
+
+_NOOP = nullcontext()
+
+
+class SpanRecorder:
+    """
+    Collects complete ("X") trace events in memory until the run ends
+
+    Disabled by default, in which case span() returns a shared no-op context manager.
+    Lanes are trace-viewer threads: concurrent products get the lowest free
+    worker-N lane, the queue worker uses its worker ID and sink writers their thread
+    name, so gaps in a lane are idle time and long spans ahead of others show
+    head-of-line blocking. Events past max_events are counted, not stored.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.max_events = 0
+        self.events: List[dict] = []
+        self.dropped = 0
+        self._origin = time.perf_counter()
+        self._lanes: Dict[str, int] = {}
+        self._busy_workers: set = set()
+        self._lock = threading.Lock()
+
+    def configure(self, enabled: bool, max_events: int = 500_000):
+        """Reset and (de)activate recording for a run"""
+        self.enabled = enabled
+        self.max_events = max_events
+        self.events = []
+        self.dropped = 0
+        self._origin = time.perf_counter()
+        self._lanes = {}
+        self._busy_workers = set()
+
+    def _lane_id(self, name: str) -> int:
+        lane_id = self._lanes.get(name)
+        if lane_id is None:
+            with self._lock:
+                lane_id = self._lanes.setdefault(name, len(self._lanes) + 1)
+        return lane_id
+
+    def add(self, name: str, category: str, start: float, end: float, args: Optional[dict] = None):
+        """Record a finished span from perf_counter() start/end"""
+        if len(self.events) >= self.max_events:
+            self.dropped += 1
+            return
+        lane = _lane.get() or threading.current_thread().name
+        event = {
+            'name': name,
+            'cat': category,
+            'ph': 'X',
+            'ts': round((start - self._origin) * 1e6, 1),
+            'dur': round((end - start) * 1e6, 1),
+            'pid': os.getpid(),
+            'tid': self._lane_id(lane),
+        }
+        if args:
+            event['args'] = args
+        self.events.append(event)
+
+    @contextmanager
+    def _span(self, name: str, category: str, args: dict):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, category, start, time.perf_counter(), args)
+
+    def span(self, name: str, category: str = 'stage', **args):
+        """`with RECORDER.span('navigation', url=url): ...` (no-op while disabled)"""
+        if not self.enabled:
+            return _NOOP
+        return self._span(name, category, args)
+
+    @contextmanager
+    def _worker(self, name: Optional[str]):
+        if name is None:
+            with self._lock:
+                index = 0
+                while index in self._busy_workers:
+                    index += 1
+                self._busy_workers.add(index)
+            lane = f"worker-{index}"
+        else:
+            lane = name
+        token = _lane.set(lane)
+        try:
+            yield lane
+        finally:
+            _lane.reset(token)
+            if name is None:
+                with self._lock:
+                    self._busy_workers.discard(index)
+
+    def worker(self, name: Optional[str] = None):
+        """Run the block on a named lane, or on the lowest free worker-N lane"""
+        if not self.enabled:
+            return _NOOP
+        return self._worker(name)
+
+    def export(self, path: str) -> Optional[str]:
+        """Write the Chrome trace-event JSON; None when nothing was recorded"""
+        if not self.events:
+            return None
+        pid = os.getpid()
+        metadata = [{'name': 'process_name', 'ph': 'M', 'pid': pid, 'args': {'name': 'sysco-scraper'}}]
+        for lane, lane_id in sorted(self._lanes.items(), key=lambda item: item[1]):
+            metadata.append({'name': 'thread_name', 'ph': 'M', 'pid': pid, 'tid': lane_id, 'args': {'name': lane}})
+            metadata.append({'name': 'thread_sort_index', 'ph': 'M', 'pid': pid, 'tid': lane_id,
+                             'args': {'sort_index': lane_id}})
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({
+                'traceEvents': metadata + self.events,
+                'displayTimeUnit': 'ms',
+                'otherData': {'events': len(self.events), 'dropped': self.dropped},
+            }, f)
+        return path
+
+
+# Process-wide recorder, configured by the orchestrator at the start of a run
+RECORDER = SpanRecorder()
+span = RECORDER.span
+worker = RECORDER.worker
@@ -0,0 +1,199 @@
+"""
+Browser supervision for the Sysco scraper
+Enforces hard per-product deadlines, recycles pages/contexts and recovers from browser crashes
+"""
+
+import asyncio
+import logging
+import time
+from typing import Awaitable, Callable, List, Optional, TypeVar
+from playwright.async_api import Page
+from .browser_manager import BrowserManager
+from .models import ScrapingConfig
+from .resource_usage import browser_memory_bytes, browser_pids, playwright_driver_pids
+
+logger = logging.getLogger(__name__)
+
+
+T = TypeVar('T')
+
+# Error messages Playwright raises once the page, context or browser is gone
+CRASH_MARKERS = (
+    'target closed',
+    'target page, context or browser has been closed',
+    'browser has been closed',
+    'browser has disconnected',
+    'connection closed',
+    'page crashed',
+)
+
+
+class SupervisedTaskError(Exception):
+    """A supervised task was aborted and should be requeued"""
+
+
+class TaskDeadlineExceeded(SupervisedTaskError):
+    """The task ran past its hard deadline and was cancelled"""
+
+
+class BrowserCrashed(SupervisedTaskError):
+    """The browser or page died while the task was running"""
+
+
+class BrowserSupervisor:
+    """Runs scraping tasks under a watchdog and keeps the browser healthy on long runs"""
+
+    def __init__(self, browser_manager: BrowserManager, config: ScrapingConfig,
+                 on_page_changed: Optional[Callable[[Page], None]] = None):
+        self.browser_manager = browser_manager
+        self.config = config
+        self.on_page_changed = on_page_changed
+
+        self.navigations_since_recycle = 0
+        self.deadline_hits = 0
+        self.page_recycles = 0
+        self.context_recycles = 0
+        self.browser_restarts = 0
+
+        # Playwright driver PIDs, looked up once and again after browser restarts
+        self._driver_pids: Optional[List[int]] = None
+        self._last_memory_check = time.monotonic()
+
+    @staticmethod
+    def is_crash_error(error: BaseException) -> bool:
+        """Check whether an exception means the page/browser is gone"""
+        message = str(error).lower()
+        return any(marker in message for marker in CRASH_MARKERS)
+
+    async def run(self, task: Callable[[], Awaitable[T]], label: str = "", recover: bool = True) -> T:
+        """
+        Run one unit of work (one product/listing) under a hard deadline
+
+        Args:
+            task: Zero-argument coroutine factory doing the work on the current page
+            label: Name used in log output
+            recover: Repair the page/browser right away. Pass False when other tasks
+                share the page (a dead browser then only raises BrowserCrashed);
+                call recover() once they are done instead
+
+        Returns:
+            The task's result
+
+        Raises:
+            TaskDeadlineExceeded: The task was stuck and got cancelled (page recycled)
+            BrowserCrashed: The browser died (browser respawned)
+        """
+        if not self.browser_manager.is_connected():
+            if not recover:
+                # The page is shared: leave the restart to the caller's single recover()
+                raise BrowserCrashed(f"browser not connected before '{label}'")
+            await self._recover_from_crash()
+
+        try:
+            result = await asyncio.wait_for(task(), timeout=self.config.product_deadline_seconds)
+        except asyncio.TimeoutError:
+            self.deadline_hits += 1
+            logger.info(f"⏰ Watchdog: '{label}' exceeded {self.config.product_deadline_seconds:.0f}s, cancelled")
+            if recover:
+                await self._replace_stuck_page()
+            raise TaskDeadlineExceeded(label)
+        except Exception as e:
+            if not self.browser_manager.is_connected() or self.is_crash_error(e):
+                logger.info(f"💥 Browser failure during '{label}': {e}")
+                if recover:
+                    await self._recover_from_crash()
+                raise BrowserCrashed(str(e)) from e
+            raise
+        finally:
+            self.navigations_since_recycle += 1
+
+        # Extractors swallow most errors, so check the browser is still alive after success too
+        if not self.browser_manager.is_connected():
+            if recover:
+                await self._recover_from_crash()
+            raise BrowserCrashed(f"browser disconnected during '{label}'")
+
+        return result
+
+    async def recover(self):
+        """Repair after aborted tasks: fresh page if the browser lives, otherwise respawn it"""
+        if self.browser_manager.is_connected():
+            await self._replace_stuck_page()
+        else:
+            await self._recover_from_crash()
+
+    async def maybe_recycle(self):
+        """Recycle the context after N navigations or when browser memory passes the limit"""
+        reason = None
+        if (self.config.recycle_after_navigations and
+                self.navigations_since_recycle >= self.config.recycle_after_navigations):
+            reason = f"{self.navigations_since_recycle} navigations"
+        elif self.config.browser_rss_limit_mb and self._memory_check_due():
+            memory_mb = await self._browser_memory_bytes() / (1024 * 1024)
+            if memory_mb > self.config.browser_rss_limit_mb:
+                reason = f"browser memory {memory_mb:.0f} MB > {self.config.browser_rss_limit_mb} MB"
+
+        if not reason:
+            return
+
+        logger.info(f"♻️ Recycling browser context ({reason})")
+        try:
+            page = await self.browser_manager.recycle_context()
+            self.context_recycles += 1
+        except Exception as e:
+            logger.warning(f"⚠️ Context recycle failed ({e}), restarting browser")
+            page = await self._restart_browser()
+        self.navigations_since_recycle = 0
+        self._page_changed(page)
+
+    def _memory_check_due(self) -> bool:
+        now = time.monotonic()
+        if now - self._last_memory_check < self.config.memory_check_seconds:
+            return False
+        self._last_memory_check = now
+        return True
+
+    def _sample_browser_memory(self) -> int:
+        if self._driver_pids is None:
+            self._driver_pids = playwright_driver_pids()
+        return browser_memory_bytes(browser_pids(self._driver_pids))
+
+    async def _browser_memory_bytes(self) -> int:
+        """PSS of the Playwright driver and browser processes, read off the event loop"""
+        return await asyncio.get_running_loop().run_in_executor(None, self._sample_browser_memory)
+
+    async def _replace_stuck_page(self):
+        """Swap the stuck page for a fresh one so pending calls on it are aborted"""
+        try:
+            page = await self.browser_manager.recycle_page()
+            self.page_recycles += 1
+            self._page_changed(page)
+        except Exception as e:
+            logger.warning(f"⚠️ Page recycle failed ({e}), restarting browser")
+            await self._recover_from_crash()
+
+    async def _recover_from_crash(self):
+        """Respawn the browser and re-apply the stored session"""
+        page = await self._restart_browser()
+        self.navigations_since_recycle = 0
+        self._page_changed(page)
+
+    async def _restart_browser(self) -> Page:
+        if self.browser_restarts >= self.config.max_browser_restarts:
+            raise RuntimeError(f"Browser restarted {self.browser_restarts} times, giving up")
+        self.browser_restarts += 1
+        self._driver_pids = None
+        return await self.browser_manager.restart_browser()
+
+    def _page_changed(self, page: Page):
+        if self.on_page_changed:
+            self.on_page_changed(page)
+
+    def summary(self) -> dict:
+        """Counters for the run summary"""
+        return {
+            'deadline_hits': self.deadline_hits,
+            'page_recycles': self.page_recycles,
+            'context_recycles': self.context_recycles,
+            'browser_restarts': self.browser_restarts,
+        }
@@ -0,0 +1,143 @@
+"""
+Time budget tracking for the Sysco scraper
+Predicts how much work fits into a fixed scraping window and decides when to stop admitting new products
+"""
+
+import logging
+import math
+import re
+import time
+from typing import List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+def parse_duration(value: str) -> float:
+    """
+    Parse a human friendly duration into seconds
+
+    Args:
+        value: Duration such as "2400", "40m", "1h30m" or "90s"
+
+    Returns:
+        Duration in seconds
+    """
+    text = str(value).strip().lower()
+    if not text:
+        raise ValueError("Empty duration")
+
+    try:
+        return float(text)
+    except ValueError:
+        pass
+
+    parts = re.findall(r'(\d+(?:\.\d+)?)\s*([hms])', text)
+    if not parts or ''.join(f"{num}{unit}" for num, unit in parts) != re.sub(r'\s+', '', text):
+        raise ValueError(f"Invalid duration: {value!r}")
+
+    multipliers = {'h': 3600, 'm': 60, 's': 1}
+    return sum(float(num) * multipliers[unit] for num, unit in parts)
+
+
+class TimeBudget:
+    """Tracks live throughput against a fixed deadline and controls work admission"""
+
+    def __init__(self, budget_seconds: float, reserve_seconds: float = 30.0,
+                 initial_estimate_seconds: float = 10.0, smoothing: float = 0.2):
+        self.budget_seconds = budget_seconds
+        self.reserve_seconds = reserve_seconds
+        self.smoothing = smoothing
+
+        self.start_time = time.monotonic()
+        self.deadline = self.start_time + budget_seconds
+
+        # Exponentially weighted estimates of per-product duration and its spread
+        self.avg_duration = initial_estimate_seconds
+        self.avg_deviation = initial_estimate_seconds / 2
+        self.samples = 0
+
+        # Coverage accounting
+        self.total_planned = 0
+        self.admitted = 0
+        self.completed = 0
+        self.skipped = 0
+        self.skipped_categories: List[str] = []  # Not even listed before the budget ran out
+        self.stopped_at: Optional[float] = None
+
+    def remaining(self) -> float:
+        """Seconds left before the deadline"""
+        return self.deadline - time.monotonic()
+
+    def elapsed(self) -> float:
+        """Seconds since the budget started"""
+        return time.monotonic() - self.start_time
+
+    def expired(self) -> bool:
+        """True once the usable part of the budget (excluding the export reserve) is gone"""
+        return self.remaining() <= self.reserve_seconds
+
+    def record_duration(self, seconds: float):
+        """Feed the duration of a finished product into the throughput estimate"""
+        self.completed += 1
+        if self.samples == 0:
+            self.avg_duration = seconds
+            self.avg_deviation = seconds / 2
+        else:
+            deviation = abs(seconds - self.avg_duration)
+            self.avg_duration += self.smoothing * (seconds - self.avg_duration)
+            self.avg_deviation += self.smoothing * (deviation - self.avg_deviation)
+        self.samples += 1
+
+    def estimated_duration(self) -> float:
+        """Conservative estimate of how long the next product will take"""
+        return self.avg_duration + 2 * self.avg_deviation
+
+    def predicted_capacity(self, concurrency: int = 1, in_flight: int = 0) -> int:
+        """Predict how many more products can be started and still finish before the reserve"""
+        usable = self.remaining() - self.reserve_seconds
+        if usable <= 0:
+            return 0
+        slots = math.floor(usable / max(self.estimated_duration(), 0.001)) * max(concurrency, 1)
+        return max(slots - in_flight, 0)
+
+    def should_admit(self, concurrency: int = 1, in_flight: int = 0) -> bool:
+        """Decide whether a new product may be started now"""
+        if self.stopped_at is not None:
+            return False
+
+        # Work queued behind in-flight tasks on the same workers has to wait for them first
+        queued_rounds = in_flight // max(concurrency, 1)
+        finish_estimate = (queued_rounds + 1) * self.estimated_duration()
+        if self.remaining() - finish_estimate < self.reserve_seconds:
+            self.stopped_at = self.elapsed()
+            logger.info(f"⏳ Time budget: stopping admission with {self.remaining():.1f}s left "
+                        f"(estimated {self.estimated_duration():.1f}s per product)")
+            return False
+
+        self.admitted += 1
+        return True
+
+    def mark_skipped(self, count: int = 1):
+        """Record products that were not started because the budget ran out"""
+        self.skipped += count
+
+    def mark_categories_skipped(self, categories: List[str]):
+        """Record categories whose product URLs were never collected (their size is unknown)"""
+        self.skipped_categories.extend(categories)
+
+    def coverage(self) -> dict:
+        """Summarize how much of the planned work was covered"""
+        planned = self.total_planned or (self.admitted + self.skipped)
+        return {
+            'budget_seconds': self.budget_seconds,
+            'elapsed_seconds': self.elapsed(),
+            'planned': planned,
+            'admitted': self.admitted,
+            'completed': self.completed,
+            'skipped': self.skipped,
+            'skipped_categories': list(self.skipped_categories),
+            'skipped_category_count': len(self.skipped_categories),
+            'coverage_pct': (self.admitted / planned * 100) if planned else 0.0,
+            'stopped_admission_at': self.stopped_at,
+            'avg_product_seconds': self.avg_duration,
+        }
@@ -0,0 +1,200 @@
+"""
+Tail-sampled Playwright tracing for the Sysco scraper
+Records every product into a throw-away trace chunk and only writes the chunk
+to disk when the product turned out slow or failed
+"""
+
+import json
+import logging
+import os
+import re
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import List, Optional
+from .models import ScrapingConfig
+
+logger = logging.getLogger(__name__)
+
+# Products observed before the latency percentile is trusted (until then the floor applies)
+WARMUP_SAMPLES = 20
+
+
+class TraceSample:
+    """Outcome of one sampled product; set failed=True for results that are not usable"""
+
+    def __init__(self, label: str):
+        self.label = label
+        self.failed = False
+        self.reason = ""
+        self.seconds = 0.0
+        self.path: Optional[str] = None
+
+
+class TraceSampler:
+    """
+    Tail-based trace sampling on the working browser context
+
+    Tracing runs continuously, one chunk per product. A chunk is persisted when the
+    product fails or takes longer than the configured percentile of recent healthy
+    products (never below trace_min_seconds); otherwise it is dropped unwritten.
+    Saved traces are capped by count and size: the fastest non-failure trace is
+    evicted first. Open a trace with `playwright show-trace <file>`.
+    """
+
+    def __init__(self, config: ScrapingConfig):
+        self.enabled = config.trace_sampling
+        self.percentile = config.trace_percentile
+        self.min_seconds = config.trace_min_seconds
+        self.max_traces = config.trace_max_count
+        self.max_bytes = int(config.trace_max_mb * 1024 * 1024)
+        self.directory = os.path.join(config.output_dir, "traces")
+
+        self.context = None
+        self.chunk_context = None  # Context the open chunk belongs to
+        self.chunk_label = ""
+        self.durations = deque(maxlen=500)  # Recent healthy product times
+        self.kept: List[dict] = []
+        self.evicted = 0
+        self.sampled = 0
+
+    async def attach(self, context):
+        """Start tracing on a (new) browser context"""
+        if not self.enabled:
+            return
+        self.context = context
+        self.chunk_context = None
+        try:
+            await context.tracing.start(screenshots=True, snapshots=True)
+        except Exception as e:
+            logger.warning(f"⚠️ Could not start tracing, trace sampling disabled: {e}")
+            self.context = None
+
+    async def detach(self, keep: bool = True):
+        """
+        The context is about to be replaced or closed
+
+        A chunk still open at this point belongs to a product that was aborted, so it
+        is saved (keep=False drops it, e.g. on normal shutdown).
+        """
+        if self.chunk_context is not None and self.chunk_context is self.context:
+            sample = TraceSample(self.chunk_label)
+            sample.failed, sample.reason = True, "aborted"
+            await self._stop_chunk(sample, keep)
+        self.context = None
+        self.chunk_context = None
+
+    def threshold(self) -> float:
+        """Latency (seconds) above which a healthy product's trace is kept"""
+        if len(self.durations) < WARMUP_SAMPLES:
+            return self.min_seconds
+        ordered = sorted(self.durations)
+        index = min(int(len(ordered) * self.percentile / 100), len(ordered) - 1)
+        return max(ordered[index], self.min_seconds)
+
+    @asynccontextmanager
+    async def sample(self, label: str):
+        """
+        Trace one product: `async with sampler.sample(url) as sample: ...`
+
+        Exceptions mark the sample failed and are re-raised. Products that overlap
+        an open chunk (async mode on a shared page) are timed but not traced separately.
+        """
+        sample = TraceSample(label)
+        started = await self._start_chunk(label)
+        start_time = time.monotonic()
+        try:
+            yield sample
+        except BaseException as e:
+            sample.failed = True
+            sample.reason = sample.reason or type(e).__name__
+            raise
+        finally:
+            sample.seconds = time.monotonic() - start_time
+            await self._finish(sample, started)
+
+    async def _start_chunk(self, label: str) -> bool:
+        if self.context is None or self.chunk_context is not None:
+            return False
+        try:
+            await self.context.tracing.start_chunk(title=label[:200])
+            self.chunk_context = self.context
+            self.chunk_label = label
+            return True
+        except Exception as e:
+            logger.debug(f"Could not start trace chunk: {e}")
+            return False
+
+    async def _finish(self, sample: TraceSample, started: bool):
+        slow = sample.seconds >= self.threshold()
+        if not sample.failed:
+            self.durations.append(sample.seconds)
+        if not started:
+            return
+        if self.chunk_context is None or self.chunk_context is not self.context:
+            return  # Context was replaced mid-product; detach() already handled the chunk
+        if sample.failed:
+            sample.reason = sample.reason or "failed"
+        elif slow:
+            sample.reason = "slow"
+        await self._stop_chunk(sample, keep=sample.failed or slow)
+
+    async def _stop_chunk(self, sample: TraceSample, keep: bool):
+        context, self.chunk_context = self.chunk_context, None
+        try:
+            if not keep:
+                await context.tracing.stop_chunk()  # Discarded without writing
+                return
+            path = self._trace_path(sample)
+            os.makedirs(self.directory, exist_ok=True)
+            await context.tracing.stop_chunk(path=path)
+        except Exception as e:
+            logger.debug(f"Could not stop trace chunk: {e}")
+            return
+        sample.path = path
+        self.sampled += 1
+        self.kept.append({
+            'path': path,
+            'label': sample.label,
+            'reason': sample.reason,
+            'seconds': round(sample.seconds, 3),
+            'bytes': os.path.getsize(path) if os.path.exists(path) else 0,
+        })
+        logger.info(f"🧵 Saved {sample.reason} trace ({sample.seconds:.1f}s): {path}")
+        self._enforce_budget()
+
+    def _trace_path(self, sample: TraceSample) -> str:
+        slug = re.sub(r'[^A-Za-z0-9]+', '-', sample.label.split('?')[0].rstrip('/').rsplit('/', 1)[-1])[:60].strip('-')
+        stamp = time.strftime('%Y%m%d-%H%M%S')
+        return os.path.join(self.directory, f"{stamp}-{self.sampled:04d}-{sample.reason}-{slug or 'page'}.zip")
+
+    def _enforce_budget(self):
+        """Evict traces over the count/size caps: healthy-but-slow before failures, fastest first"""
+        while self.kept and (len(self.kept) > self.max_traces or
+                             sum(trace['bytes'] for trace in self.kept) > self.max_bytes):
+            victim = min(self.kept, key=lambda trace: (trace['reason'] != 'slow', trace['seconds']))
+            self.kept.remove(victim)
+            self.evicted += 1
+            try:
+                os.remove(victim['path'])
+            except OSError:
+                pass
+
+    def summary(self) -> dict:
+        """Saved traces for the run report"""
+        return {
+            'enabled': self.enabled,
+            'threshold_seconds': round(self.threshold(), 3),
+            'saved': len(self.kept),
+            'evicted': self.evicted,
+            'traces': [dict(trace) for trace in self.kept],
+        }
+
+    def write_index(self) -> Optional[str]:
+        """Write traces/index.json listing the saved traces (None when nothing was saved)"""
+        if not self.kept:
+            return None
+        path = os.path.join(self.directory, "index.json")
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.summary(), f, indent=2)
+        return path
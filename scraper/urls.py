@@ -0,0 +1,39 @@
+"""
+URL helpers for the Sysco scraper
+Canonicalization and product-link filtering for links collected from listing pages
+"""
+
+from typing import Iterable, List
+from urllib.parse import urljoin, urlsplit, urlunsplit
+
+
+# Path fragments that mark a link as a product page
+PRODUCT_PATH_MARKERS = ('/product/', '/item/', '/detail/', '/p/', '/app/catalog')
+
+
+def is_product_link(href: str) -> bool:
+    """True for hrefs that point at a product page"""
+    return any(marker in href for marker in PRODUCT_PATH_MARKERS)
+
+
+def canonicalize_url(href: str, base_url: str) -> str:
+    """
+    Absolute form of a link for de-duplication
+
+    Resolves relative links against the page URL, lowercases scheme and host and
+    drops the fragment; the query string is kept (it can select the product).
+    """
+    absolute = urljoin(base_url, href.strip())
+    parts = urlsplit(absolute)
+    if not parts.scheme:
+        return absolute
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path, parts.query, ''))
+
+
+def filter_product_links(hrefs: Iterable[str], base_url: str) -> List[str]:
+    """Canonical product URLs from raw hrefs, de-duplicated in first-seen order"""
+    seen = {}
+    for href in hrefs:
+        if href and is_product_link(href):
+            seen.setdefault(canonicalize_url(href, base_url), None)
+    return list(seen)
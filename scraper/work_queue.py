@@ -0,0 +1,486 @@
+"""
+Durable work queue for the Sysco scraper
+SQLite-backed queue of listing and product URLs with leases, so several scraper processes or hosts can share one crawl
+"""
+
+import asyncio
+import functools
+import json
+import logging
+import os
+import socket
+import sqlite3
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import AsyncIterator, Dict, Iterator, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+# Task kinds, in the order workers should pick them up
+KIND_LISTING = 'listing'
+KIND_PRODUCT = 'product'
+KIND_PRIORITY = {KIND_LISTING: 0, KIND_PRODUCT: 1}
+
+STATUS_PENDING = 'pending'
+STATUS_LEASED = 'leased'
+STATUS_DONE = 'done'
+STATUS_FAILED = 'failed'
+
+# Claim taken by the one worker that writes the combined export
+EXPORT_CLAIM = 'export'
+
+
+def default_worker_id() -> str:
+    """Build a worker ID that is unique across hosts and processes"""
+    return f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:6]}"
+
+
+@dataclass
+class WorkItem:
+    """A leased unit of work"""
+    task_id: str
+    kind: str
+    url: str
+    category: str
+    attempts: int
+    lease_expires: float
+
+
+class WorkQueue:
+    """SQLite work queue with leases, heartbeats, lease expiry/reclaim and idempotent result commits"""
+
+    def __init__(self, db_path: str, lease_seconds: float = 120.0, max_attempts: int = 3,
+                 use_wal: bool = False):
+        self.db_path = db_path
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        # isolation_level=None: transactions are controlled explicitly with BEGIN IMMEDIATE
+        self.conn = sqlite3.connect(db_path, timeout=30.0, isolation_level=None)
+        self.conn.row_factory = sqlite3.Row
+        # WAL needs shared memory and does not work on network filesystems such as NFS,
+        # so the rollback journal stays the default
+        self.conn.execute(f"PRAGMA journal_mode={'WAL' if use_wal else 'DELETE'}")
+        self.conn.execute("PRAGMA busy_timeout=30000")
+        self._create_schema()
+
+    def _create_schema(self):
+        """Create tables and indexes if they don't exist yet"""
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS tasks (
+                task_id TEXT PRIMARY KEY,
+                kind TEXT NOT NULL,
+                priority INTEGER NOT NULL,
+                url TEXT NOT NULL DEFAULT '',
+                category TEXT NOT NULL DEFAULT '',
+                status TEXT NOT NULL DEFAULT 'pending',
+                attempts INTEGER NOT NULL DEFAULT 0,
+                lease_owner TEXT,
+                lease_expires REAL,
+                last_error TEXT,
+                updated_at REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_tasks_status ON tasks (status, priority);
+            CREATE TABLE IF NOT EXISTS results (
+                task_id TEXT PRIMARY KEY,
+                worker_id TEXT NOT NULL,
+                committed_at REAL NOT NULL,
+                data TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS claims (
+                name TEXT PRIMARY KEY,
+                worker_id TEXT NOT NULL,
+                claimed_at REAL NOT NULL,
+                lease_expires REAL  -- NULL once the job finished
+            );
+        """)
+
+    def close(self):
+        """Close the database connection"""
+        self.conn.close()
+
+    @staticmethod
+    def make_task_id(kind: str, key: str) -> str:
+        """Stable task ID so enqueueing the same URL twice is a no-op"""
+        return f"{kind}:{key}"
+
+    def enqueue(self, kind: str, key: str, url: str = "", category: str = "") -> bool:
+        """Add a task unless it already exists. Returns True if it was new"""
+        return self.enqueue_many(kind, [(key, url, category)]) == 1
+
+    def enqueue_many(self, kind: str, entries: Sequence[tuple]) -> int:
+        """
+        Add several tasks of one kind in a single transaction
+
+        Args:
+            kind: Task kind (listing or product)
+            entries: Tuples of (key, url, category)
+
+        Returns:
+            Number of tasks that were newly added
+        """
+        now = time.time()
+        rows = [
+            (self.make_task_id(kind, key), kind, KIND_PRIORITY.get(kind, 9), url, category, now)
+            for key, url, category in entries
+        ]
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            before = self.conn.total_changes
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO tasks (task_id, kind, priority, url, category, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                rows
+            )
+            added = self.conn.total_changes - before
+            self.conn.execute("COMMIT")
+            return added
+        except Exception:
+            self.conn.execute("ROLLBACK")
+            raise
+
+    def lease(self, worker_id: str, limit: int = 1, kinds: Optional[Sequence[str]] = None) -> List[WorkItem]:
+        """
+        Atomically lease pending tasks for a worker, reclaiming expired leases first
+
+        Args:
+            worker_id: ID of the leasing worker
+            limit: Maximum number of tasks to lease
+            kinds: Restrict to these task kinds (default: all)
+
+        Returns:
+            Leased work items (empty if nothing is available)
+        """
+        now = time.time()
+        expires = now + self.lease_seconds
+        kind_filter = ""
+        params: list = []
+        if kinds:
+            kind_filter = f"AND kind IN ({','.join('?' for _ in kinds)})"
+            params.extend(kinds)
+
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            self._reclaim_expired(now)
+            rows = self.conn.execute(
+                f"SELECT task_id, kind, url, category, attempts FROM tasks "
+                f"WHERE status = ? {kind_filter} ORDER BY priority, rowid LIMIT ?",
+                [STATUS_PENDING, *params, limit]
+            ).fetchall()
+            items = []
+            for row in rows:
+                self.conn.execute(
+                    "UPDATE tasks SET status = ?, lease_owner = ?, lease_expires = ?, "
+                    "attempts = attempts + 1, updated_at = ? WHERE task_id = ?",
+                    (STATUS_LEASED, worker_id, expires, now, row['task_id'])
+                )
+                items.append(WorkItem(
+                    task_id=row['task_id'], kind=row['kind'], url=row['url'],
+                    category=row['category'], attempts=row['attempts'] + 1, lease_expires=expires
+                ))
+            self.conn.execute("COMMIT")
+            return items
+        except Exception:
+            self.conn.execute("ROLLBACK")
+            raise
+
+    def _reclaim_expired(self, now: float) -> int:
+        """Return tasks whose lease expired (dead or stuck worker) to the pending pool"""
+        cursor = self.conn.execute(
+            "UPDATE tasks SET status = CASE WHEN attempts >= ? THEN ? ELSE ? END, "
+            "lease_owner = NULL, lease_expires = NULL, last_error = 'lease expired', updated_at = ? "
+            "WHERE status = ? AND lease_expires < ?",
+            (self.max_attempts, STATUS_FAILED, STATUS_PENDING, now, STATUS_LEASED, now)
+        )
+        if cursor.rowcount:
+            logger.info(f"♻️ Reclaimed {cursor.rowcount} expired lease(s)")
+        return cursor.rowcount
+
+    def heartbeat(self, worker_id: str, task_ids: Sequence[str]) -> int:
+        """Extend the leases (tasks and running claims) a worker still holds. Returns how many task leases were extended"""
+        now = time.time()
+        self.conn.execute(
+            "UPDATE claims SET lease_expires = ? WHERE worker_id = ? AND lease_expires IS NOT NULL",
+            (now + self.lease_seconds, worker_id)
+        )
+        if not task_ids:
+            return 0
+        placeholders = ','.join('?' for _ in task_ids)
+        cursor = self.conn.execute(
+            f"UPDATE tasks SET lease_expires = ?, updated_at = ? "
+            f"WHERE status = ? AND lease_owner = ? AND task_id IN ({placeholders})",
+            (now + self.lease_seconds, now, STATUS_LEASED, worker_id, *task_ids)
+        )
+        return cursor.rowcount
+
+    def complete(self, task_id: str, worker_id: str, result: Optional[Dict] = None) -> bool:
+        """
+        Commit a task result idempotently
+
+        The first commit for a task wins; a late duplicate from a worker whose lease
+        was reclaimed is ignored.
+
+        Returns:
+            True if this call recorded the result
+        """
+        now = time.time()
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            recorded = True
+            if result is not None:
+                cursor = self.conn.execute(
+                    "INSERT OR IGNORE INTO results (task_id, worker_id, committed_at, data) VALUES (?, ?, ?, ?)",
+                    (task_id, worker_id, now, json.dumps(result, ensure_ascii=False))
+                )
+                recorded = cursor.rowcount == 1
+            cursor = self.conn.execute(
+                "UPDATE tasks SET status = ?, lease_owner = NULL, lease_expires = NULL, updated_at = ? "
+                "WHERE task_id = ? AND status != ?",
+                (STATUS_DONE, now, task_id, STATUS_DONE)
+            )
+            if result is None:
+                recorded = cursor.rowcount == 1
+            self.conn.execute("COMMIT")
+            return recorded
+        except Exception:
+            self.conn.execute("ROLLBACK")
+            raise
+
+    def fail(self, task_id: str, worker_id: str, error: str = "") -> bool:
+        """Give a task back for retry, or mark it failed once max_attempts is reached. Returns True if retried"""
+        cursor = self.conn.execute(
+            "UPDATE tasks SET status = CASE WHEN attempts >= ? THEN ? ELSE ? END, "
+            "lease_owner = NULL, lease_expires = NULL, last_error = ?, updated_at = ? "
+            "WHERE task_id = ? AND lease_owner = ? AND status = ?",
+            (self.max_attempts, STATUS_FAILED, STATUS_PENDING, error[:500], time.time(),
+             task_id, worker_id, STATUS_LEASED)
+        )
+        if not cursor.rowcount:
+            return False
+        status = self.conn.execute("SELECT status FROM tasks WHERE task_id = ?", (task_id,)).fetchone()
+        return status is not None and status['status'] == STATUS_PENDING
+
+    def release(self, worker_id: str, task_ids: Optional[Sequence[str]] = None) -> int:
+        """Hand leased tasks back without counting an attempt (clean shutdown or requeue)"""
+        now = time.time()
+        query = ("UPDATE tasks SET status = ?, lease_owner = NULL, lease_expires = NULL, "
+                 "attempts = MAX(attempts - 1, 0), updated_at = ? WHERE status = ? AND lease_owner = ?")
+        params: list = [STATUS_PENDING, now, STATUS_LEASED, worker_id]
+        if task_ids is not None:
+            if not task_ids:
+                return 0
+            query += f" AND task_id IN ({','.join('?' for _ in task_ids)})"
+            params.extend(task_ids)
+        return self.conn.execute(query, params).rowcount
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """Count tasks by kind and status"""
+        stats: Dict[str, Dict[str, int]] = {}
+        for row in self.conn.execute("SELECT kind, status, COUNT(*) AS n FROM tasks GROUP BY kind, status"):
+            stats.setdefault(row['kind'], {})[row['status']] = row['n']
+        return stats
+
+    def count(self, statuses: Sequence[str], kinds: Optional[Sequence[str]] = None) -> int:
+        """Count tasks in the given statuses"""
+        query = f"SELECT COUNT(*) FROM tasks WHERE status IN ({','.join('?' for _ in statuses)})"
+        params = list(statuses)
+        if kinds:
+            query += f" AND kind IN ({','.join('?' for _ in kinds)})"
+            params.extend(kinds)
+        return self.conn.execute(query, params).fetchone()[0]
+
+    def is_drained(self) -> bool:
+        """True when no task is pending or leased by any worker"""
+        return self.count([STATUS_PENDING, STATUS_LEASED]) == 0
+
+    def iter_results(self) -> Iterator[Dict]:
+        """Yield committed results in commit order"""
+        for row in self.conn.execute("SELECT data FROM results ORDER BY committed_at, task_id"):
+            yield json.loads(row['data'])
+
+    def results_page(self, after: Optional[Tuple[float, str]] = None,
+                     limit: int = 1000) -> Tuple[List[Dict], Optional[Tuple[float, str]]]:
+        """
+        One page of committed results in commit order
+
+        Returns:
+            The results and the key to pass as `after` for the next page (None when done)
+        """
+        if after is None:
+            rows = self.conn.execute(
+                "SELECT committed_at, task_id, data FROM results ORDER BY committed_at, task_id LIMIT ?",
+                (limit,)
+            ).fetchall()
+        else:
+            rows = self.conn.execute(
+                "SELECT committed_at, task_id, data FROM results WHERE (committed_at, task_id) > (?, ?) "
+                "ORDER BY committed_at, task_id LIMIT ?",
+                (*after, limit)
+            ).fetchall()
+        if not rows:
+            return [], None
+        last = rows[-1]
+        return [json.loads(row['data']) for row in rows], (last['committed_at'], last['task_id'])
+
+    def claim(self, name: str, worker_id: str, when_drained: bool = False) -> Optional[str]:
+        """
+        Claim a one-off job (such as the final export) so that only one worker runs it
+
+        The claim is leased like a task and renewed by heartbeat(); a claim whose holder
+        died expires and can be taken over. A finished job keeps its claim (see finish_claim).
+
+        Args:
+            name: Job name
+            worker_id: ID of the claiming worker
+            when_drained: Only claim once no task is pending or leased
+
+        Returns:
+            None if this worker won the claim, otherwise the current holder
+            ('' if the queue is not drained yet)
+        """
+        now = time.time()
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            if when_drained and not self.is_drained():
+                self.conn.execute("COMMIT")
+                return ''
+            cursor = self.conn.execute(
+                "DELETE FROM claims WHERE name = ? AND lease_expires < ?", (name, now)
+            )
+            if cursor.rowcount:
+                logger.info(f"♻️ Reclaimed expired '{name}' claim")
+            cursor = self.conn.execute(
+                "INSERT OR IGNORE INTO claims (name, worker_id, claimed_at, lease_expires) VALUES (?, ?, ?, ?)",
+                (name, worker_id, now, now + self.lease_seconds)
+            )
+            holder = None
+            if not cursor.rowcount:
+                holder = self.conn.execute("SELECT worker_id FROM claims WHERE name = ?", (name,)).fetchone()[0]
+            self.conn.execute("COMMIT")
+            return holder
+        except Exception:
+            self.conn.execute("ROLLBACK")
+            raise
+
+    def finish_claim(self, name: str, worker_id: str) -> bool:
+        """Mark a claimed job as done; the claim stays so no other worker repeats it"""
+        cursor = self.conn.execute(
+            "UPDATE claims SET lease_expires = NULL WHERE name = ? AND worker_id = ?", (name, worker_id)
+        )
+        return cursor.rowcount == 1
+
+    def unclaim(self, name: str, worker_id: str) -> bool:
+        """Give up a claim (the job failed) so another worker or a later run can take it"""
+        cursor = self.conn.execute("DELETE FROM claims WHERE name = ? AND worker_id = ?", (name, worker_id))
+        return cursor.rowcount == 1
+
+    def clear_claim(self, name: str) -> Optional[str]:
+        """
+        Drop a finished or expired claim so the job can run again
+
+        Returns:
+            None if the job can be claimed now, otherwise the worker still holding it
+        """
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            self.conn.execute(
+                "DELETE FROM claims WHERE name = ? AND (lease_expires IS NULL OR lease_expires < ?)",
+                (name, time.time())
+            )
+            row = self.conn.execute("SELECT worker_id FROM claims WHERE name = ?", (name,)).fetchone()
+            self.conn.execute("COMMIT")
+            return row[0] if row else None
+        except Exception:
+            self.conn.execute("ROLLBACK")
+            raise
+
+
+class AsyncWorkQueue:
+    """
+    WorkQueue for asyncio code
+
+    The queue lives on its own thread, so lock waits (busy_timeout) and fsyncs of the
+    SQLite database never block the event loop.
+    """
+
+    def __init__(self, queue: WorkQueue, executor: ThreadPoolExecutor):
+        self.queue = queue
+        self._executor = executor
+
+    @classmethod
+    async def open(cls, db_path: str, **kwargs) -> 'AsyncWorkQueue':
+        """Open the queue database on a dedicated thread (see WorkQueue for the arguments)"""
+        executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='work-queue')
+        try:
+            queue = await asyncio.get_running_loop().run_in_executor(
+                executor, functools.partial(WorkQueue, db_path, **kwargs)
+            )
+        except BaseException:
+            executor.shutdown(wait=False)
+            raise
+        return cls(queue, executor)
+
+    async def _call(self, method, *args, **kwargs):
+        return await asyncio.get_running_loop().run_in_executor(
+            self._executor, functools.partial(method, *args, **kwargs)
+        )
+
+    async def close(self):
+        """Close the connection and stop the queue thread"""
+        try:
+            await self._call(self.queue.close)
+        finally:
+            self._executor.shutdown(wait=False)
+
+    async def enqueue_many(self, kind: str, entries: Sequence[tuple]) -> int:
+        return await self._call(self.queue.enqueue_many, kind, entries)
+
+    async def lease(self, worker_id: str, limit: int = 1, kinds: Optional[Sequence[str]] = None) -> List[WorkItem]:
+        return await self._call(self.queue.lease, worker_id, limit, kinds)
+
+    async def heartbeat(self, worker_id: str, task_ids: Sequence[str]) -> int:
+        return await self._call(self.queue.heartbeat, worker_id, task_ids)
+
+    async def complete(self, task_id: str, worker_id: str, result: Optional[Dict] = None) -> bool:
+        return await self._call(self.queue.complete, task_id, worker_id, result)
+
+    async def fail(self, task_id: str, worker_id: str, error: str = "") -> bool:
+        return await self._call(self.queue.fail, task_id, worker_id, error)
+
+    async def release(self, worker_id: str, task_ids: Optional[Sequence[str]] = None) -> int:
+        return await self._call(self.queue.release, worker_id, task_ids)
+
+    async def stats(self) -> Dict[str, Dict[str, int]]:
+        return await self._call(self.queue.stats)
+
+    async def count(self, statuses: Sequence[str], kinds: Optional[Sequence[str]] = None) -> int:
+        return await self._call(self.queue.count, statuses, kinds)
+
+    async def is_drained(self) -> bool:
+        return await self._call(self.queue.is_drained)
+
+    async def claim(self, name: str, worker_id: str, when_drained: bool = False) -> Optional[str]:
+        return await self._call(self.queue.claim, name, worker_id, when_drained)
+
+    async def finish_claim(self, name: str, worker_id: str) -> bool:
+        return await self._call(self.queue.finish_claim, name, worker_id)
+
+    async def unclaim(self, name: str, worker_id: str) -> bool:
+        return await self._call(self.queue.unclaim, name, worker_id)
+
+    async def iter_results(self, page_size: int = 1000) -> AsyncIterator[Dict]:
+        """Yield committed results in commit order, one page per queue call"""
+        after = None
+        while True:
+            results, after = await self._call(self.queue.results_page, after, page_size)
+            for result in results:
+                yield result
+            if after is None or len(results) < page_size:
+                return